@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the OpenSpec MCP server.
+
+Drives ``handle_call_tool`` for every tool ``handle_list_tools`` reports against
+synthetic ``openspec/`` trees, with a stub ``openspec`` executable on PATH (see
+fake_openspec.py) so results do not depend on Node.js or the real CLI.
+
+Measured per tree size:
+
+- per-tool latency (first call after clearing the result cache, then p50/p95/mean)
+- throughput of N concurrent calls, for a natively served and a CLI-bound tool
+- peak Python heap (tracemalloc, in a separate pass) and process RSS
+
+plus the server's cold start (import time, and time until a spawned server
+answers ``initialize`` over stdio). Results are printed as JSON; pass
+``--baseline`` to compare against an earlier run and exit 1 on regressions.
+
+Usage:
+    python benchmarks/bench.py --sizes 10,1000,10000 --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+BENCH_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCH_DIR.parent / "src"
+FAKE_CLI = BENCH_DIR / "fake_openspec.py"
+
+REQUIREMENTS_PER_SPEC = 3
+SPECS_PER_CHANGE = 10
+
+
+# ---------------------------------------------------------------------------
+# Environment
+
+
+def install_fake_cli(bin_dir: Path) -> None:
+    """Put an ``openspec`` launcher for fake_openspec.py into bin_dir."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    if os.name == "nt":
+        shim = bin_dir / "openspec.cmd"
+        shim.write_text(f'@"{sys.executable}" "{FAKE_CLI}" %*\r\n', encoding="utf-8")
+    else:
+        shim = bin_dir / "openspec"
+        shim.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_CLI}" "$@"\n', encoding="utf-8")
+        shim.chmod(0o755)
+
+
+def make_tree(root: Path, specs: int) -> Path:
+    """Create a workspace with ``specs`` main specs and one active change per SPECS_PER_CHANGE specs.
+
+    Change ``change-N`` adds a requirement to ``spec-N`` and modifies its first
+    one, so impact lookups and delta-aware validation have something to find.
+    """
+    openspec = root / "openspec"
+    for i in range(specs):
+        spec_dir = openspec / "specs" / f"spec-{i}"
+        spec_dir.mkdir(parents=True)
+        requirements = "".join(
+            f"### Requirement: Capability {i}.{r}\n"
+            f"The system SHALL handle request type {r} for component {i} within budget.\n\n"
+            f"#### Scenario: Handles request {r}\n"
+            f"- **WHEN** a client sends request {r} to component {i}\n"
+            f"- **THEN** the response arrives within the latency budget\n\n"
+            for r in range(REQUIREMENTS_PER_SPEC)
+        )
+        (spec_dir / "spec.md").write_text(
+            f"# spec-{i} Specification\n\n## Purpose\nComponent {i} of the benchmark tree.\n\n"
+            f"## Requirements\n{requirements}",
+            encoding="utf-8",
+        )
+
+    for c in range(max(1, specs // SPECS_PER_CHANGE)):
+        change_dir = openspec / "changes" / f"change-{c}"
+        delta_dir = change_dir / "specs" / f"spec-{c}"
+        delta_dir.mkdir(parents=True)
+        (change_dir / "proposal.md").write_text(
+            f"# Change: change-{c}\n\n## Why\nBenchmark change {c}.\n\n"
+            f"## What Changes\n- Extend spec-{c}\n",
+            encoding="utf-8",
+        )
+        (change_dir / "tasks.md").write_text(
+            "## 1. Implementation\n- [x] 1.1 Write the code\n- [ ] 1.2 Write the docs\n",
+            encoding="utf-8",
+        )
+        (delta_dir / "spec.md").write_text(
+            "## ADDED Requirements\n"
+            f"### Requirement: Added by change {c}\n"
+            "The system SHALL support the new behaviour.\n\n"
+            "#### Scenario: New behaviour\n- **WHEN** it is used\n- **THEN** it works\n\n"
+            "## MODIFIED Requirements\n"
+            f"### Requirement: Capability {c}.0\n"
+            f"The system SHALL handle request type 0 for component {c} within half the budget.\n\n"
+            f"#### Scenario: Handles request 0\n"
+            f"- **WHEN** a client sends request 0 to component {c}\n"
+            "- **THEN** the response arrives within half the latency budget\n",
+            encoding="utf-8",
+        )
+    (openspec / "changes" / "archive").mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def tool_arguments(name: str, workspace: str) -> Optional[dict]:
+    """Representative arguments for a tool, or None when the benchmark does not know it."""
+    arguments = {
+        "check_openspec_status": {},
+        "openspec_init": {"directory": workspace},
+        "openspec_update": {"directory": workspace},
+        "openspec_list": {"directory": workspace},
+        "openspec_show": {"directory": workspace, "item_name": "spec-0"},
+        "openspec_change_show": {"directory": workspace, "change_name": "change-0"},
+        "openspec_change_validate": {"directory": workspace, "change_name": "change-0"},
+        "openspec_spec_show": {"directory": workspace, "spec_id": "spec-0"},
+        "openspec_spec_list": {"directory": workspace},
+        "openspec_spec_validate": {"directory": workspace, "spec_id": "spec-0"},
+        "openspec_validate": {"directory": workspace, "item_name": "spec-0"},
+        "openspec_archive": {"directory": workspace, "change_name": "change-0"},
+        "openspec_search": {"directory": workspace, "query": "latency budget request"},
+        "openspec_impact": {"directory": workspace, "spec_id": "spec-0"},
+        "openspec_batch": {
+            "operations": [
+                {"tool": "openspec_spec_show", "arguments": {"directory": workspace, "spec_id": "spec-0"}},
+                {"tool": "openspec_change_show", "arguments": {"directory": workspace, "change_name": "change-0"}},
+                {"tool": "openspec_list", "arguments": {"directory": workspace}},
+            ]
+        },
+        "openspec_metrics": {},
+        "openspec_help": {},
+    }
+    return arguments.get(name)
+
+
+# ---------------------------------------------------------------------------
+# Measurements
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+async def timed_call(server, name: str, arguments: dict) -> tuple[float, bool]:
+    started = time.perf_counter()
+    contents = await server.handle_call_tool(name, dict(arguments))
+    elapsed = time.perf_counter() - started
+    return elapsed, not contents[0].text.startswith("❌")
+
+
+async def bench_tools(server, workspace: str, iterations: int) -> dict:
+    tools = [tool.name for tool in await server.handle_list_tools()]
+    # Writes invalidate caches, so measure every read first
+    tools.sort(key=lambda name: name in server.WRITE_TOOLS)
+    results = {}
+    for name in tools:
+        arguments = tool_arguments(name, workspace)
+        if arguments is None:
+            results[name] = {"skipped": "no benchmark arguments for this tool"}
+            continue
+        server.result_cache.invalidate()
+        first, ok = await timed_call(server, name, arguments)
+        samples = []
+        for _ in range(iterations):
+            elapsed, ok = await timed_call(server, name, arguments)
+            samples.append(elapsed)
+        results[name] = {"ok": ok, "first_ms": round(first * 1000, 3), **summarize(samples)}
+    return results
+
+
+async def bench_throughput(server, workspace: str, specs: int, concurrency: int, calls: int) -> dict:
+    workloads = {
+        # Answered from the workspace index; distinct ids so the result cache does not help
+        "openspec_spec_show": lambda i: {"directory": workspace, "spec_id": f"spec-{i % specs}"},
+        # Always starts the CLI; force skips the validation cache
+        "openspec_spec_validate": lambda i: {
+            "directory": workspace,
+            "spec_id": f"spec-{i % specs}",
+            "force": True,
+        },
+    }
+    results = {}
+    for name, make_arguments in workloads.items():
+        server.result_cache.invalidate()
+        semaphore = asyncio.Semaphore(concurrency)
+        samples: list[float] = []
+
+        async def one(i: int) -> None:
+            async with semaphore:
+                elapsed, _ = await timed_call(server, name, make_arguments(i))
+                samples.append(elapsed)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(calls)))
+        wall = time.perf_counter() - started
+        results[name] = {"calls_per_second": round(calls / wall, 2), **summarize(samples)}
+    return results
+
+
+def rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def bench_memory(server, workspace: str) -> float:
+    """Peak Python heap, in MiB, of indexing a workspace and calling every read tool once.
+
+    Runs separately from the timing passes because tracemalloc slows allocation down.
+    """
+    server.index_registry.close()
+    server.result_cache.invalidate()
+    tracemalloc.start()
+    try:
+        await server.index_registry.get(workspace)
+        for tool in await server.handle_list_tools():
+            arguments = tool_arguments(tool.name, workspace)
+            if arguments is not None and tool.name not in server.WRITE_TOOLS:
+                await server.handle_call_tool(tool.name, arguments)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 2)
+
+
+async def bench_size(server, root: Path, specs: int, args) -> dict:
+    started = time.perf_counter()
+    workspace = str(make_tree(root / f"tree-{specs}", specs))
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await server.index_registry.get(workspace)
+    index_seconds = time.perf_counter() - started
+
+    tools = await bench_tools(server, workspace, args.iterations)
+    throughput = {
+        str(concurrency): await bench_throughput(
+            server, workspace, specs, concurrency, max(args.calls, concurrency)
+        )
+        for concurrency in args.concurrency
+    }
+    return {
+        "specs": specs,
+        "tree_build_s": round(build_seconds, 3),
+        "index_build_ms": round(index_seconds * 1000, 3),
+        "tools": tools,
+        "throughput": throughput,
+        "peak_heap_mb": await bench_memory(server, workspace),
+        "peak_rss_mb": rss_mb(),
+    }
+
+
+def bench_cold_start(env: dict, runs: int) -> dict:
+    """Time a fresh interpreter importing the server, and answering initialize over stdio."""
+    imports = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import openspec_mcp.server"], env=env, check=True)
+        imports.append(time.perf_counter() - started)
+
+    initialize = json.dumps({
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "openspec-mcp-bench", "version": "0"},
+        },
+    })
+    ready = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "openspec_mcp.server"],
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        process.stdin.write((initialize + "\n").encode())
+        process.stdin.flush()
+        process.stdout.readline()
+        ready.append(time.perf_counter() - started)
+        process.stdin.close()
+        process.wait(timeout=10)
+    from openspec_mcp.startup import STARTUP_TARGET_MS
+
+    initialize_stats = summarize(ready)
+    return {
+        "import": summarize(imports),
+        "initialize": initialize_stats,
+        "target_ms": STARTUP_TARGET_MS,
+        "within_target": initialize_stats["p50_ms"] <= STARTUP_TARGET_MS,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+
+
+def regressions(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Describe every p50 latency or throughput that got worse than tolerance allows."""
+    found = []
+    for size, result in current["sizes"].items():
+        base = baseline.get("sizes", {}).get(size)
+        if base is None:
+            continue
+        for tool, stats in result["tools"].items():
+            before = base["tools"].get(tool, {}).get("p50_ms")
+            after = stats.get("p50_ms")
+            if before and after and after > before * (1 + tolerance):
+                found.append(f"{size} specs: {tool} p50 {before}ms -> {after}ms")
+        for concurrency, workloads in result["throughput"].items():
+            for tool, stats in workloads.items():
+                before = base["throughput"].get(concurrency, {}).get(tool, {}).get("calls_per_second")
+                after = stats["calls_per_second"]
+                if before and after < before / (1 + tolerance):
+                    found.append(
+                        f"{size} specs: {tool} x{concurrency} {before}/s -> {after}/s"
+                    )
+    for phase in ("import", "initialize"):
+        before = baseline.get("cold_start", {}).get(phase, {}).get("p50_ms")
+        after = current["cold_start"][phase]["p50_ms"]
+        if before and after > before * (1 + tolerance):
+            found.append(f"cold start {phase} p50 {before}ms -> {after}ms")
+    return found
+
+
+def parse_ints(text: str) -> list[int]:
+    return [int(part) for part in text.split(",") if part.strip()]
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sizes", type=parse_ints, default=[10, 1000, 10000],
+                        help="Comma-separated numbers of specs per tree (default: 10,1000,10000)")
+    parser.add_argument("--iterations", type=int, default=20, help="Calls per tool after the first")
+    parser.add_argument("--concurrency", type=parse_ints, default=[1, 8, 32],
+                        help="Comma-separated concurrency levels for the throughput runs")
+    parser.add_argument("--calls", type=int, default=64, help="Calls per throughput run")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the fake CLI sleeps per run")
+    parser.add_argument("--output-bytes", type=int, default=2000, help="Bytes the fake CLI prints per run")
+    parser.add_argument("--cold-start-runs", type=int, default=5)
+    parser.add_argument("--cli-only", action="store_true",
+                        help="Disable the native reader so every read goes through the (fake) CLI")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown against the baseline, as a fraction (default: 0.25)")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace, root: Path) -> dict:
+    # The server reads its settings from the environment at import time
+    from openspec_mcp import server
+
+    sizes = {}
+    try:
+        for specs in args.sizes:
+            print(f"benchmarking {specs} specs...", file=sys.stderr)
+            sizes[str(specs)] = await bench_size(server, root, specs, args)
+    finally:
+        server.index_registry.close()
+    return {"sizes": sizes, "server_metrics": server.metrics.snapshot()}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    root = Path(tempfile.mkdtemp(prefix="openspec-mcp-bench-"))
+    try:
+        install_fake_cli(root / "bin")
+        os.environ["PATH"] = f"{root / 'bin'}{os.pathsep}{os.environ.get('PATH', '')}"
+        os.environ["FAKE_OPENSPEC_LATENCY"] = str(args.latency)
+        os.environ["FAKE_OPENSPEC_OUTPUT_BYTES"] = str(args.output_bytes)
+        os.environ["OPENSPEC_MCP_VALIDATION_CACHE"] = str(root / "validation-cache.json")
+        if args.cli_only:
+            os.environ["OPENSPEC_MCP_NATIVE_READER"] = "0"
+        os.environ["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [str(SRC_DIR), os.environ.get("PYTHONPATH")])
+        )
+        sys.path.insert(0, str(SRC_DIR))
+
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {
+                "iterations": args.iterations,
+                "calls": args.calls,
+                "fake_cli_latency_s": args.latency,
+                "fake_cli_output_bytes": args.output_bytes,
+                "native_reader": not args.cli_only,
+            },
+            "cold_start": bench_cold_start(dict(os.environ), args.cold_start_runs),
+        }
+        report.update(asyncio.run(run(args, root)))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        found = regressions(report, baseline, args.tolerance)
+        for line in found:
+            print(f"❌ Regression: {line}", file=sys.stderr)
+        if found:
+            return 1
+        print("✅ No regressions against the baseline", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the OpenSpec CLI, used by the benchmarks.
+
+Every invocation sleeps ``FAKE_OPENSPEC_LATENCY`` seconds (default 0.05, about
+what a warm Node.js start costs) and then prints roughly
+``FAKE_OPENSPEC_OUTPUT_BYTES`` bytes (default 2000). ``--json`` commands print a
+JSON object of that size. Nothing on disk is modified, so write tools can be
+benchmarked repeatedly against the same tree.
+"""
+
+import json
+import os
+import sys
+import time
+
+VERSION = "0.0.0-bench"
+
+
+def main(argv: list[str]) -> int:
+    latency = float(os.environ.get("FAKE_OPENSPEC_LATENCY", "0.05"))
+    size = int(os.environ.get("FAKE_OPENSPEC_OUTPUT_BYTES", "2000"))
+
+    if argv[:1] == ["--version"]:
+        time.sleep(latency)
+        print(VERSION)
+        return 0
+
+    time.sleep(latency)
+    command = " ".join(arg for arg in argv if not arg.startswith("-"))
+    line = f"{command}: lorem ipsum dolor sit amet consectetur adipiscing elit\n"
+    body = (line * (size // len(line) + 1))[:size]
+
+    if "--json" in argv:
+        json.dump({"command": command, "output": body}, sys.stdout)
+        sys.stdout.write("\n")
+    elif argv[:1] == ["validate"] or "validate" in argv[:2]:
+        sys.stdout.write(f"✓ {command} is valid\n{body}")
+    else:
+        sys.stdout.write(body)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
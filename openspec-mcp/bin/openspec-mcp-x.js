@@ -10,9 +10,19 @@
  * - Process spawning and stdio forwarding
  */
 
-const { spawn } = require('child_process');
+const { spawn, spawnSync } = require('child_process');
 const path = require('path');
 const fs = require('fs');
+const os = require('os');
+
+const launchTime = Date.now();
+const PACKAGE_VERSION = require('../package.json').version;
+const PYTHON_CANDIDATES = ['python3', 'python'];
+// Structured tool results (a (content, structuredContent) pair) arrived in mcp 1.10
+const MCP_REQUIREMENT = 'mcp>=1.10.0';
+const MCP_MIN_VERSION = [1, 10];
+const startupReport =
+  process.env.OPENSPEC_MCP_STARTUP_REPORT === '1' || process.argv.includes('--startup-report');
 
 // Color output helpers
 const colors = {
@@ -23,92 +33,198 @@ const colors = {
 };
 
 /**
- * Find Python executable
+ * Launch-probe cache
+ *
+ * Probing interpreters costs a Python start per candidate, and checking for
+ * the mcp package used to import it (over half a second). The result is
+ * stamped in a cache file keyed by each candidate's resolved path, mtime and
+ * size, this package's version, and the installed mcp package's location and
+ * mtime, so later launches only stat a few files.
  */
-function findPython() {
-  const candidates = ['python3', 'python'];
-  
-  for (const cmd of candidates) {
-    try {
-      const result = require('child_process').spawnSync(cmd, ['--version'], {
-        stdio: 'pipe',
-        encoding: 'utf-8',
-      });
-      
-      if (result.status === 0) {
-        const versionOutput = result.stdout || result.stderr;
-        const match = versionOutput.match(/Python (\d+)\.(\d+)/);
-        
-        if (match) {
-          const major = parseInt(match[1]);
-          const minor = parseInt(match[2]);
-          
-          // Require Python 3.10+
-          if (major === 3 && minor >= 10) {
-            return cmd;
-          } else if (major > 3) {
-            return cmd;
-          } else {
-            console.error(colors.yellow(`⚠️  Found ${cmd} (${versionOutput.trim()}), but Python 3.10+ is required`));
-          }
+const PROBE_CACHE_VERSION = 1;
+
+function probeCachePath() {
+  const base =
+    process.env.XDG_CACHE_HOME ||
+    (process.platform === 'win32' && process.env.LOCALAPPDATA) ||
+    path.join(os.homedir(), '.cache');
+  return path.join(base, 'openspec-mcp-x', 'launch-probe.json');
+}
+
+/**
+ * Resolve a command on PATH the way the shell would, without spawning it
+ */
+function resolveCommand(cmd) {
+  const extensions =
+    process.platform === 'win32'
+      ? (process.env.PATHEXT || '.EXE;.CMD;.BAT;.COM').split(';')
+      : [''];
+  for (const dir of (process.env.PATH || '').split(path.delimiter)) {
+    if (!dir) {
+      continue;
+    }
+    for (const ext of extensions) {
+      const candidate = path.join(dir, cmd + ext);
+      try {
+        fs.accessSync(candidate, fs.constants.X_OK);
+        if (fs.statSync(candidate).isFile()) {
+          return candidate;
         }
+      } catch (e) {
+        // Not here; keep looking
       }
-    } catch (e) {
-      // Continue to next candidate
     }
   }
-  
   return null;
 }
 
-/**
- * Check if Python package 'mcp' is installed
- */
-function checkMcpInstalled(pythonCmd) {
+function statStamp(file) {
   try {
-    const result = require('child_process').spawnSync(
-      pythonCmd,
-      ['-c', 'import mcp; print(mcp.__version__)'],
-      {
-        stdio: 'pipe',
-        encoding: 'utf-8',
-      }
-    );
-    
-    return result.status === 0;
+    const stat = fs.statSync(file);
+    return { path: file, mtimeMs: stat.mtimeMs, size: stat.size };
   } catch (e) {
-    return false;
+    return null;
   }
 }
 
+function interpreterStamps() {
+  return PYTHON_CANDIDATES.map((cmd) => {
+    const resolved = resolveCommand(cmd);
+    if (!resolved) {
+      return { cmd, missing: true };
+    }
+    let real = resolved;
+    try {
+      real = fs.realpathSync(resolved);
+    } catch (e) {
+      // Keep the unresolved path
+    }
+    return { cmd, resolved, binary: statStamp(real) };
+  });
+}
+
+function readProbeCache(key) {
+  try {
+    const cached = JSON.parse(fs.readFileSync(probeCachePath(), 'utf-8'));
+    if (cached.key !== key) {
+      return null;
+    }
+    // A pip upgrade or uninstall of mcp replaces its package directory
+    const mcp = statStamp(cached.result.mcpPath);
+    if (!mcp || mcp.mtimeMs !== cached.result.mcpMtimeMs) {
+      return null;
+    }
+    return cached.result;
+  } catch (e) {
+    return null;
+  }
+}
+
+function writeProbeCache(key, result) {
+  const file = probeCachePath();
+  try {
+    fs.mkdirSync(path.dirname(file), { recursive: true });
+    const tmp = `${file}.${process.pid}.tmp`;
+    fs.writeFileSync(tmp, JSON.stringify({ key, result }));
+    fs.renameSync(tmp, file);
+  } catch (e) {
+    // Caching is an optimisation only
+  }
+}
+
+function clearProbeCache() {
+  try {
+    fs.unlinkSync(probeCachePath());
+  } catch (e) {
+    // Nothing cached
+  }
+}
+
+// Everything the launcher needs to know about an interpreter, in one spawn.
+// mcp is located, not imported, which would cost more than the rest combined.
+const PROBE_SCRIPT = [
+  'import json, sys',
+  'import importlib.util',
+  'info = {"version": list(sys.version_info[:2]), "mcpPath": None, "mcpVersion": None}',
+  'spec = importlib.util.find_spec("mcp")',
+  'if spec is not None and spec.submodule_search_locations:',
+  '    info["mcpPath"] = list(spec.submodule_search_locations)[0]',
+  '    try:',
+  '        from importlib.metadata import version',
+  '        info["mcpVersion"] = version("mcp")',
+  '    except Exception:',
+  '        pass',
+  'print(json.dumps(info))',
+].join('\n');
+
 /**
- * Check if requests library is installed
+ * Run the probe script with one interpreter
  */
-function checkRequestsInstalled(pythonCmd) {
+function probeInterpreter(cmd) {
   try {
-    const result = require('child_process').spawnSync(
-      pythonCmd,
-      ['-c', 'import requests'],
-      {
-        stdio: 'pipe',
-        encoding: 'utf-8',
-      }
-    );
-    
-    return result.status === 0;
+    const result = spawnSync(cmd, ['-c', PROBE_SCRIPT], {
+      stdio: 'pipe',
+      encoding: 'utf-8',
+    });
+    if (result.status !== 0) {
+      return null;
+    }
+    return JSON.parse(result.stdout.trim().split('\n').pop());
   } catch (e) {
-    return false;
+    return null;
+  }
+}
+
+/**
+ * True when the installed mcp is older than MCP_MIN_VERSION (or its version is unknown)
+ */
+function mcpTooOld(version) {
+  if (!version) {
+    return true;
   }
+  const [major, minor] = version.split('.').map((part) => parseInt(part, 10) || 0);
+  return major < MCP_MIN_VERSION[0] || (major === MCP_MIN_VERSION[0] && minor < MCP_MIN_VERSION[1]);
+}
+
+/**
+ * Find Python 3.10+ and report whether mcp is installed for it
+ */
+function findPython() {
+  for (const cmd of PYTHON_CANDIDATES) {
+    const info = probeInterpreter(cmd);
+    if (!info) {
+      continue;
+    }
+    const [major, minor] = info.version;
+
+    // Require Python 3.10+
+    if (major > 3 || (major === 3 && minor >= 10)) {
+      return { python: cmd, ...info };
+    }
+    console.error(colors.yellow(`⚠️  Found ${cmd} (Python ${major}.${minor}), but Python 3.10+ is required`));
+  }
+
+  return null;
 }
 
 /**
  * Main entry point
  */
 async function main() {
-  // Find Python
-  const pythonCmd = findPython();
-  
-  if (!pythonCmd) {
+  const probeStarted = Date.now();
+  const key = JSON.stringify({
+    version: PROBE_CACHE_VERSION,
+    package: PACKAGE_VERSION,
+    interpreters: interpreterStamps(),
+  });
+  let probe = readProbeCache(key);
+  const cacheHit = probe !== null;
+
+  if (!probe) {
+    probe = findPython();
+  }
+
+  if (!probe) {
     console.error(colors.red('❌ Error: Python 3.10+ not found'));
     console.error('');
     console.error('OpenSpec MCP requires Python 3.10 or higher.');
@@ -120,59 +236,43 @@ async function main() {
     console.error('');
     process.exit(1);
   }
-  
+  const pythonCmd = probe.python;
+
   // Check and install dependencies
-  let needsWait = false;
-  
-  if (!checkMcpInstalled(pythonCmd)) {
-    // Install mcp package silently
-    const installResult = require('child_process').spawnSync(
+  if (!probe.mcpPath || mcpTooOld(probe.mcpVersion)) {
+    // Install or upgrade the mcp package silently
+    const installResult = spawnSync(
       pythonCmd,
-      ['-m', 'pip', 'install', '-q', 'mcp>=0.9.0'],
+      ['-m', 'pip', 'install', '-q', MCP_REQUIREMENT],
       {
         stdio: ['ignore', 'ignore', 'ignore'],
       }
     );
-    
+
     if (installResult.status !== 0) {
       console.error('');
       console.error(colors.red('❌ Failed to install Python package "mcp"'));
       console.error('');
       console.error('Please install manually:');
-      console.error(`  ${pythonCmd} -m pip install mcp>=0.9.0`);
+      console.error(`  ${pythonCmd} -m pip install ${MCP_REQUIREMENT}`);
       console.error('');
       process.exit(1);
     }
-    needsWait = true;
+    // Re-probe so the cache records where mcp was installed
+    probe = { python: pythonCmd, ...(probeInterpreter(pythonCmd) || {}) };
   }
-  
-  if (!checkRequestsInstalled(pythonCmd)) {
-    // Install requests package silently
-    const installResult = require('child_process').spawnSync(
-      pythonCmd,
-      ['-m', 'pip', 'install', '-q', 'requests>=2.31.0'],
-      {
-        stdio: ['ignore', 'ignore', 'ignore'],
-      }
-    );
-    
-    if (installResult.status !== 0) {
-      console.error('');
-      console.error(colors.red('❌ Failed to install Python package "requests"'));
-      console.error('');
-      console.error('Please install manually:');
-      console.error(`  ${pythonCmd} -m pip install requests>=2.31.0`);
-      console.error('');
-      process.exit(1);
+
+  if (!cacheHit && probe.mcpPath) {
+    const mcp = statStamp(probe.mcpPath);
+    if (mcp) {
+      writeProbeCache(key, { ...probe, mcpMtimeMs: mcp.mtimeMs });
     }
-    needsWait = true;
   }
-  
-  // Wait a bit if we installed packages
-  if (needsWait) {
-    await new Promise(resolve => setTimeout(resolve, 100));
+  if (startupReport) {
+    const source = cacheHit ? 'cache hit' : 'probed';
+    console.error(`⏱️  Launcher: ${pythonCmd} ${source} in ${Date.now() - probeStarted}ms`);
   }
-  
+
   // Determine the path to the Python server module
   const packageRoot = path.resolve(__dirname, '..');
   const srcPath = path.join(packageRoot, 'src');
@@ -189,7 +289,19 @@ async function main() {
   const env = {
     ...process.env,
     PYTHONPATH: srcPath,
+    OPENSPEC_MCP_LAUNCH_TIME: String(launchTime),
   };
+  if (startupReport) {
+    env.OPENSPEC_MCP_STARTUP_REPORT = '1';
+  }
+  // --http [--port N]: one shared server for many clients instead of stdio
+  if (process.argv.includes('--http')) {
+    env.OPENSPEC_MCP_TRANSPORT = 'http';
+  }
+  const portIndex = process.argv.indexOf('--port');
+  if (portIndex !== -1 && process.argv[portIndex + 1]) {
+    env.OPENSPEC_MCP_HTTP_PORT = process.argv[portIndex + 1];
+  }
   
   // Spawn Python process
   const pythonProcess = spawn(
@@ -203,6 +315,10 @@ async function main() {
   
   // Handle process exit
   pythonProcess.on('exit', (code, signal) => {
+    if (code) {
+      // The cached probe may be stale (e.g. a broken mcp install); probe again next time
+      clearProbeCache();
+    }
     if (signal) {
       process.exit(1);
     } else {
@@ -1,6 +1,10 @@
 """OpenSpec MCP Server - A Model Context Protocol server for OpenSpec operations."""
 
+import time
+
 __version__ = "1.0.0"
 
+# Wall-clock time the package started loading, the fallback origin for startup timing
+LOADED_AT = time.time()
 
 
@@ -0,0 +1,84 @@
+"""
+Bulk archiving of several changes.
+
+Releasing a batch of changes used to mean one ``openspec_archive`` call per
+change, each rewriting the main specs on its own. Bulk mode checks the whole
+batch before touching anything:
+
+1. every name must be an active change;
+2. no two changes in the batch may modify the same requirement (found through
+   the impact index, see impact.py), since whichever was archived second
+   would silently rewrite the first one's result;
+3. every change is validated, in parallel and through the validation cache.
+
+Only then are the changes archived, one after another in the order given,
+under a single workspace write lock. The first failure stops the pass; the
+report says what was archived, what failed and what was left untouched.
+"""
+
+from dataclasses import dataclass
+
+from .impact import ImpactIndex
+
+ARCHIVED = "archived"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+@dataclass
+class ArchiveStep:
+    """Outcome of archiving one change of a batch."""
+
+    name: str
+    status: str
+    output: str = ""
+    duration: float = 0.0
+
+
+def find_conflicts(impact: ImpactIndex, names: list[str]) -> list[tuple[str, str, list[str]]]:
+    """Requirements modified by more than one change of the batch, as (spec, requirement, changes)."""
+    batch = set(names)
+    conflicts = []
+    for by_change in impact.conflicts().values():
+        involved = [name for name in by_change if name in batch]
+        if len(involved) > 1:
+            first = next(iter(by_change.values()))[0]
+            conflicts.append((first.spec, first.requirement, involved))
+    return conflicts
+
+
+def format_conflicts(conflicts: list[tuple[str, str, list[str]]]) -> str:
+    lines = [
+        f"❌ Nothing archived: {len(conflicts)} requirement{'s' if len(conflicts) != 1 else ''} "
+        "modified by more than one change in the batch",
+        "",
+    ]
+    lines.extend(f"  - {spec}: {requirement} <- {', '.join(changes)}" for spec, requirement, changes in conflicts)
+    lines.append("")
+    lines.append("Archive these changes in separate calls once their deltas agree.")
+    return "\n".join(lines) + "\n"
+
+
+def format_step(step: ArchiveStep) -> str:
+    icon = {ARCHIVED: "✅", FAILED: "❌", SKIPPED: "⏭️ "}[step.status]
+    timing = f" ({step.duration:.2f}s)" if step.status != SKIPPED else ""
+    return f"{icon} {step.name}: {step.status}{timing}"
+
+
+def format_archive_report(steps: list[ArchiveStep], elapsed: float) -> str:
+    """One report for the whole pass, in archive order."""
+    archived = sum(1 for s in steps if s.status == ARCHIVED)
+    failed = next((s for s in steps if s.status == FAILED), None)
+    if failed is None:
+        header = f"✅ Archived {archived} change{'s' if archived != 1 else ''} ({elapsed:.2f}s)"
+    else:
+        header = (
+            f"❌ Archive stopped at {failed.name}: {archived} of {len(steps)} "
+            f"change{'s' if len(steps) != 1 else ''} archived ({elapsed:.2f}s)"
+        )
+    lines = [header, ""]
+    for step in steps:
+        lines.append(format_step(step))
+        if step.status == FAILED:
+            lines.extend(f"   {line}" for line in step.output.splitlines())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,132 @@
+"""
+In-memory result cache for read-only OpenSpec tools.
+
+Entries are keyed on (tool, normalized directory, arguments) and validated
+against a cheap fingerprint of the workspace's ``openspec/`` tree, so a cached
+answer is only served while nothing under ``openspec/`` has changed.
+"""
+
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+_SIZE_CHUNK = 64 * 1024
+
+
+def text_size(text: str) -> int:
+    """UTF-8 length of a text, without encoding a full copy of it."""
+    if text.isascii():
+        return len(text)
+    return sum(len(text[i : i + _SIZE_CHUNK].encode("utf-8")) for i in range(0, len(text), _SIZE_CHUNK))
+
+
+def normalize_directory(directory: str) -> str:
+    """Return the canonical form of a workspace directory."""
+    return os.path.realpath(os.path.abspath(os.path.expanduser(directory)))
+
+
+def workspace_fingerprint(directory: str) -> Hashable:
+    """Fingerprint the ``openspec/`` tree under a directory from file names, sizes and mtimes."""
+    root = os.path.join(directory, "openspec")
+    entries: list[tuple[str, int, int]] = []
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        except OSError:
+            # Missing or unreadable directories still contribute to the fingerprint
+            entries.append((current, -1, -1))
+    entries.sort()
+    return hash(tuple(entries))
+
+
+@dataclass
+class _Entry:
+    fingerprint: Hashable
+    value: Any
+    size: int
+
+
+class ResultCache:
+    """LRU cache of tool output bounded by a byte budget."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def make_key(tool: str, directory: Optional[str], args: dict) -> tuple:
+        """Build a cache key from a tool name, its workspace and its remaining arguments."""
+        extra = {k: v for k, v in args.items() if k != "directory" and v is not None}
+        return (tool, directory, json.dumps(extra, sort_keys=True, default=str))
+
+    def get(self, key: tuple, fingerprint: Hashable) -> Optional[Any]:
+        """Return the cached value for a key if it was stored under the same fingerprint."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.fingerprint != fingerprint:
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def put(self, key: tuple, fingerprint: Hashable, value: Any, size: Optional[int] = None) -> None:
+        """Store a value for a key, evicting least recently used entries to stay within budget.
+
+        Text is sized by its UTF-8 length; other values (e.g. parsed JSON) must pass their size.
+        """
+        if size is None:
+            size = text_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(fingerprint=fingerprint, value=value, size=size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def invalidate(self, directory: Optional[str] = None) -> None:
+        """Drop every entry for a workspace directory, or everything when no directory is given."""
+        if directory is None:
+            self._entries.clear()
+            self._bytes = 0
+            return
+        for key in [k for k in self._entries if k[1] == directory]:
+            self._remove(key)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+result_cache = ResultCache(
+    int(os.environ.get("OPENSPEC_MCP_CACHE_BYTES", DEFAULT_MAX_BYTES))
+)
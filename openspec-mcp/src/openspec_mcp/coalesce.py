@@ -0,0 +1,95 @@
+"""
+Single-flight coalescing of identical concurrent tool calls.
+
+Several agents in one IDE often ask for the same thing at the same moment:
+the same ``openspec_spec_show``, the same ``openspec_validate``. A read-only
+call whose (tool, workspace, arguments) matches one already in flight joins it
+instead of running again, and every caller gets the same result.
+
+The shared execution runs as its own task. A caller that is cancelled stops
+waiting for it, but the execution keeps going while anyone else still waits,
+and is cancelled (killing its CLI process, see runner.py) only when the last
+caller gives up. Output the execution streams goes to every caller still
+waiting (see progress.FanOutReporter); one that joined late misses the lines
+sent before it joined.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from .metrics import metrics
+from .progress import FanOutReporter, ProgressReporter, shared_reporter
+
+
+class _Flight:
+    """One shared execution and the callers waiting for it."""
+
+    __slots__ = ("task", "waiters", "spawns", "progress")
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+        self.spawns = 0
+        self.progress = FanOutReporter()
+
+
+class SingleFlight:
+    """Runs at most one execution per key at a time and shares its result."""
+
+    def __init__(self):
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def run(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[Any]],
+        reporter: Optional[ProgressReporter] = None,
+    ) -> tuple[Any, Optional[int]]:
+        """Run call(), or join an identical call in flight.
+
+        ``reporter`` receives the output the execution streams while this
+        caller waits. Returns the result and, for a caller that joined, the
+        number of CLI runs the shared execution made (the runs that caller
+        saved); None for the caller that started it.
+        """
+        flight = self._flights.get(key)
+        joined = flight is not None
+        if flight is None:
+            flight = self._flights[key] = _Flight()
+            flight.task = asyncio.create_task(self._execute(flight, call))
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+
+        flight.waiters += 1
+        if reporter is not None:
+            flight.progress.reporters.append(reporter)
+        try:
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            flight.waiters -= 1
+            if not flight.waiters:
+                flight.task.cancel()
+            raise
+        finally:
+            if reporter is not None:
+                flight.progress.reporters.remove(reporter)
+        flight.waiters -= 1
+        return result, flight.spawns if joined else None
+
+    async def _execute(self, flight: _Flight, call: Callable[[], Awaitable[Any]]) -> Any:
+        # Runs in its own task, so this only affects the shared execution
+        shared_reporter.set(flight.progress)
+        with metrics.counting_spawns() as spawns:
+            try:
+                return await call()
+            finally:
+                flight.spawns = spawns.count
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+single_flight = SingleFlight()
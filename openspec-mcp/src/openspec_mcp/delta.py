@@ -0,0 +1,190 @@
+"""
+Delta responses for the show tools.
+
+Agents re-read the same spec after every small edit. Every text response of a
+show tool ends with an ETag, a hash of the response (on its first page when it
+is paged). When the client sends it back:
+
+- ``if_none_match``: the server answers "unchanged" while the item is the same
+  and sends it in full once it changed;
+- ``since``: the server answers "unchanged", or only the sections that were
+  added, removed or modified since that version.
+
+Sections are split at markdown headings of level 1-3, so each
+``### Requirement:`` block (with its scenarios) is one section and is hashed
+on its own. A JSON view (``format: "json"``) is split by its top-level keys
+instead, with every object of a top-level list (each requirement, each delta)
+a section of its own, labelled by its id, name, description or text. Responses the client was given are remembered by ETag in a small
+LRU store, so a delta can be computed against them after the files changed.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Any, Callable, Optional
+
+from .cache import ResultCache
+
+VERSION_PROPERTIES = {
+    "if_none_match": {
+        "type": "string",
+        "description": "ETag from an earlier response: answer 'unchanged' if the item still matches it",
+    },
+    "since": {
+        "type": "string",
+        "description": (
+            "ETag from an earlier response: return only the sections (markdown headings, or "
+            "requirement/delta objects of a JSON view) added, removed or modified since then. "
+            "Structured results do not carry an ETag; narrow them with 'fields' instead"
+        ),
+    },
+}
+
+# Responses remembered for later 'since' requests, by UTF-8 size
+VERSION_STORE_BYTES = int(os.environ.get("OPENSPEC_MCP_VERSION_STORE_BYTES", 8 * 1024 * 1024))
+
+_HEADING_RE = re.compile(r"^#{1,3}\s")
+_JSON_START_RE = re.compile(r"^[\[{]", re.MULTILINE)
+# Keys that name a JSON list element, in order of preference
+_LABEL_KEYS = ("id", "name", "title", "description", "text")
+_LABEL_CHARS = 80
+
+version_store = ResultCache(VERSION_STORE_BYTES)
+
+
+_HASH_CHUNK = 64 * 1024
+
+
+def etag(text: str) -> str:
+    # Hash in slices so a large response is never encoded as a whole
+    digest = hashlib.sha256()
+    for start in range(0, len(text), _HASH_CHUNK):
+        digest.update(text[start : start + _HASH_CHUNK].encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _add_section(sections: dict[str, str], heading: str, body: str) -> None:
+    key, n = heading, 2
+    while key in sections:
+        key, n = f"{heading} ({n})", n + 1
+    sections[key] = body
+
+
+def _element_label(element: Any, position: int) -> str:
+    if isinstance(element, dict):
+        for key in _LABEL_KEYS:
+            value = element.get(key)
+            if isinstance(value, str) and value.strip():
+                label = " ".join(value.split())
+                return label if len(label) <= _LABEL_CHARS else label[: _LABEL_CHARS - 1] + "…"
+    return f"[{position}]"
+
+
+def split_json_sections(text: str) -> Optional[dict[str, str]]:
+    """Sections of a response ending in a JSON view, or None if it does not end in one."""
+    match = _JSON_START_RE.search(text)
+    if match is None:
+        return None
+    try:
+        data, end = json.JSONDecoder().raw_decode(text, match.start())
+    except ValueError:
+        return None
+    if text[end:].strip():
+        return None
+    sections: dict[str, str] = {}
+    preamble = text[: match.start()].strip("\n")
+    if preamble:
+        sections[""] = preamble
+    fields = data.items() if isinstance(data, dict) else [("", data)]
+    for key, value in fields:
+        if isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+            for position, element in enumerate(value):
+                heading = f"{key}: {_element_label(element, position)}" if key else _element_label(element, position)
+                _add_section(sections, heading, json.dumps(element, indent=2, ensure_ascii=False))
+        else:
+            _add_section(sections, key, json.dumps({key: value} if key else value, indent=2, ensure_ascii=False))
+    return sections
+
+
+def split_sections(text: str) -> dict[str, str]:
+    """Sections of a response keyed by their heading line ("" for text before the first heading)."""
+    json_sections = split_json_sections(text)
+    if json_sections is not None:
+        return json_sections
+    sections: dict[str, str] = {}
+    heading, lines = "", []
+    in_fence = False
+
+    def close() -> None:
+        body = "\n".join(lines).strip("\n")
+        if body:
+            _add_section(sections, heading, body)
+
+    for line in text.split("\n"):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        elif not in_fence and _HEADING_RE.match(line):
+            close()
+            heading, lines = line.strip(), []
+        lines.append(line)
+    close()
+    return sections
+
+
+def remember(text: str) -> str:
+    """Store a response under its ETag and return the ETag."""
+    tag = etag(text)
+    version_store.put(("version", None, tag), "", text)
+    return tag
+
+
+def with_etag(text: str, tag: str) -> str:
+    separator = "\n" if text.endswith("\n") else "\n\n"
+    return f"{text}{separator}🔖 ETag: {tag}"
+
+
+def versioned_response(
+    text: str,
+    if_none_match: Optional[str],
+    since: Optional[str],
+    page: Optional[Callable[[str], str]] = None,
+) -> str:
+    """The response to send for a show result, given the ETag the client already has.
+
+    ``page`` cuts the body to its first page before the ETag is appended, so a
+    large result is never copied whole just to carry its ETag.
+    """
+    page = page or (lambda body: body)
+    tag = remember(text)
+    known = since or if_none_match
+    if known == tag:
+        return f"✅ Unchanged since ETag {tag}"
+    if not since:
+        return with_etag(page(text), tag)
+
+    previous = version_store.get(("version", None, since), "")
+    if previous is None:
+        return with_etag(page(f"⚠️  ETag {since} is unknown or expired, full content follows\n\n{text}"), tag)
+    return with_etag(page(delta_response(previous, text, since)), tag)
+
+
+def delta_response(previous: str, current: str, since: str) -> str:
+    """Only the sections that differ between two versions of a response."""
+    old = split_sections(previous)
+    new = split_sections(current)
+    old_hashes = {key: etag(body) for key, body in old.items()}
+    added = [key for key in new if key not in old]
+    removed = [key for key in old if key not in new]
+    modified = [key for key in new if key in old and etag(new[key]) != old_hashes[key]]
+
+    lines = [
+        f"🔄 Changed since ETag {since}: {len(modified)} modified, {len(added)} added, "
+        f"{len(removed)} removed of {len(new)} sections",
+    ]
+    for label, keys in (("✏️  Modified", modified), ("➕ Added", added)):
+        for key in keys:
+            lines.append(f"\n{label}:\n{new[key]}")
+    for key in removed:
+        lines.append(f"\n➖ Removed: {key or '(preamble)'}")
+    return "\n".join(lines)
@@ -0,0 +1,116 @@
+"""
+Cached detection of the OpenSpec CLI.
+
+Probing ``openspec --version`` costs a full Node.js startup, so the result is
+kept in memory and only re-probed when ``PATH`` changes, the resolved binary's
+mtime changes, or the entry expires.
+"""
+
+import asyncio
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from .runner import run_command
+
+# Seconds a successful detection stays valid
+DETECTION_TTL = 300.0
+# Seconds a failed detection stays valid, kept short so a fresh install is noticed quickly
+MISSING_TTL = 10.0
+
+
+@dataclass(frozen=True)
+class OpenSpecInstallation:
+    """A resolved OpenSpec CLI binary."""
+
+    path: str
+    version: str
+
+
+@dataclass
+class _Entry:
+    installation: Optional[OpenSpecInstallation]
+    path_env: str
+    mtime_ns: Optional[int]
+    expires_at: float
+
+
+class DetectionCache:
+    """Remembers where the OpenSpec CLI lives and which version it reports."""
+
+    def __init__(self, ttl: float = DETECTION_TTL, missing_ttl: float = MISSING_TTL):
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self._entry: Optional[_Entry] = None
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self) -> Optional[OpenSpecInstallation]:
+        """Return the cached installation, probing the CLI only when the cache is stale."""
+        entry = self._entry
+        if entry is not None and self._is_fresh(entry):
+            self.hits += 1
+            return entry.installation
+
+        async with self._lock:
+            # Another caller may have refreshed the entry while we waited
+            entry = self._entry
+            if entry is not None and self._is_fresh(entry):
+                self.hits += 1
+                return entry.installation
+            self.misses += 1
+            self._entry = await self._probe()
+            return self._entry.installation
+
+    def invalidate(self) -> None:
+        """Forget the cached detection result."""
+        self._entry = None
+
+    def _is_fresh(self, entry: _Entry) -> bool:
+        if time.monotonic() >= entry.expires_at:
+            return False
+        if os.environ.get("PATH", "") != entry.path_env:
+            return False
+        if entry.installation is not None:
+            return _mtime_ns(entry.installation.path) == entry.mtime_ns
+        return True
+
+    async def _probe(self) -> _Entry:
+        path_env = os.environ.get("PATH", "")
+        binary = shutil.which("openspec")
+        installation = None
+        mtime_ns = None
+
+        if binary:
+            mtime_ns = _mtime_ns(binary)
+            success, stdout, _ = await run_command([binary, "--version"])
+            if success:
+                installation = OpenSpecInstallation(
+                    path=binary, version=stdout.strip() or "Unknown"
+                )
+
+        ttl = self.ttl if installation is not None else self.missing_ttl
+        return _Entry(
+            installation=installation,
+            path_env=path_env,
+            mtime_ns=mtime_ns,
+            expires_at=time.monotonic() + ttl,
+        )
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+detection_cache = DetectionCache()
+
+
+async def detect_openspec() -> Optional[OpenSpecInstallation]:
+    """Return the installed OpenSpec CLI, or None when it is not available."""
+    return await detection_cache.get()
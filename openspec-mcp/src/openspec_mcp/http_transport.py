@@ -0,0 +1,113 @@
+"""
+Shared HTTP transport for the OpenSpec MCP server.
+
+By default every MCP client (each Cursor window, each agent) starts its own
+server over stdio, with its own interpreter, caches and workspace indexes.
+With ``OPENSPEC_MCP_TRANSPORT=http`` (or the launcher's ``--http``) one
+long-lived process instead serves all of them over MCP streamable HTTP at
+``http://127.0.0.1:<port>/mcp``; streamed responses and notifications are
+sent as server-sent events. Clients share OpenSpec detection, the result
+cache, workspace indexes, the worker pool and in-flight calls.
+
+Each client still gets its own MCP session. A cancellation or a disconnect
+only cancels that client's calls; an execution shared with other clients
+(see coalesce.py) keeps running for them. At most
+``OPENSPEC_MCP_MAX_CLIENTS`` sessions are open at once; further clients get
+HTTP 503 until one closes or goes idle.
+"""
+
+import ipaddress
+import logging
+import os
+from typing import Callable, Optional
+
+from mcp.server import Server
+
+logger = logging.getLogger(__name__)
+
+HOST = os.environ.get("OPENSPEC_MCP_HTTP_HOST", "127.0.0.1")
+PORT = int(os.environ.get("OPENSPEC_MCP_HTTP_PORT", "8765"))
+MAX_CLIENTS = int(os.environ.get("OPENSPEC_MCP_MAX_CLIENTS", "32"))
+# Sessions with no requests for this long are closed and free their slot
+IDLE_TIMEOUT = float(os.environ.get("OPENSPEC_MCP_SESSION_IDLE_TIMEOUT", "1800"))
+ENDPOINT = "/mcp"
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _session_manager(app: Server, host: str, port: int, max_clients: int):
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from mcp.server.transport_security import TransportSecuritySettings
+
+    # Only accept Host/Origin headers naming this server, so web pages cannot
+    # reach it through DNS rebinding
+    hosts = {host, "127.0.0.1", "localhost", "[::1]"} if _is_loopback(host) else {host}
+    security = TransportSecuritySettings(
+        allowed_hosts=[f"{name}:{port}" for name in sorted(hosts)],
+        allowed_origins=[f"http://{name}:{port}" for name in sorted(hosts)],
+    )
+    try:
+        return StreamableHTTPSessionManager(
+            app=app,
+            security_settings=security,
+            max_sessions=max_clients,
+            session_idle_timeout=IDLE_TIMEOUT,
+        )
+    except TypeError:  # SDKs before 1.28 cannot limit or expire sessions
+        logger.warning("This mcp version does not support a client limit; OPENSPEC_MCP_MAX_CLIENTS is ignored")
+        return StreamableHTTPSessionManager(app=app, security_settings=security)
+
+
+async def serve_http(
+    app: Server,
+    host: str = HOST,
+    port: int = PORT,
+    max_clients: int = MAX_CLIENTS,
+    on_ready: Optional[Callable[[], None]] = None,
+) -> None:
+    """Serve the MCP server to many clients over streamable HTTP until shut down."""
+    try:
+        import uvicorn
+        from starlette.applications import Starlette
+        from starlette.routing import Route
+    except ImportError as e:
+        raise RuntimeError(
+            f"The HTTP transport needs mcp>=1.8 with its HTTP dependencies (uvicorn, starlette): {e}"
+        ) from e
+    from contextlib import asynccontextmanager
+
+    if not _is_loopback(host):
+        logger.warning("Serving MCP on %s: the server is reachable from other machines", host)
+
+    manager = _session_manager(app, host, port, max_clients)
+
+    class Endpoint:
+        # A class, so Starlette passes the raw ASGI call through
+        async def __call__(self, scope, receive, send) -> None:
+            await manager.handle_request(scope, receive, send)
+
+    @asynccontextmanager
+    async def lifespan(_):
+        async with manager.run():
+            logger.info("Serving MCP on http://%s:%d%s (up to %d clients)", host, port, ENDPOINT, max_clients)
+            if on_ready is not None:
+                on_ready()
+            yield
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            Starlette(routes=[Route(ENDPOINT, endpoint=Endpoint())], lifespan=lifespan),
+            host=host,
+            port=port,
+            log_level=logging.getLevelName(logging.getLogger().getEffectiveLevel()).lower(),
+            lifespan="on",
+        )
+    )
+    await server.serve()
@@ -0,0 +1,259 @@
+"""
+Change-to-spec dependency index.
+
+Answers "which active changes touch spec X", "which specs and requirements
+does change Y modify" and "who else is changing this requirement" from the
+spec deltas under ``openspec/changes/*/specs/``. The maps are built on top of
+a ``WorkspaceIndex`` and kept in step with it the same way the search index
+is: parsed changes are reused by identity across refreshes, so only changes
+that were re-parsed get re-indexed, and every lookup is a dict access.
+"""
+
+import json
+import threading
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from .index import WorkspaceIndex
+from .reader import Change
+
+
+@dataclass(frozen=True)
+class Touch:
+    """One requirement-level delta of an active change."""
+
+    change: str
+    spec: str
+    requirement: str
+    operation: str
+    renamed_to: Optional[str] = None
+
+
+def change_touches(change: Change) -> list[Touch]:
+    touches = []
+    for delta in change.deltas:
+        if delta.rename is not None:
+            touches.append(Touch(change.name, delta.spec, delta.rename["from"], delta.operation, delta.rename["to"]))
+        elif delta.requirement is not None:
+            touches.append(Touch(change.name, delta.spec, delta.requirement.name, delta.operation))
+    return touches
+
+
+def requirement_key(spec: str, requirement: str) -> tuple[str, str]:
+    """Requirement headers match the way OpenSpec matches them: trimmed, case-insensitive."""
+    return spec, requirement.strip().lower()
+
+
+class ImpactIndex:
+    """Bidirectional change <-> spec <-> requirement maps for one workspace."""
+
+    def __init__(self, workspace: WorkspaceIndex):
+        self.workspace = workspace
+        self.generation = -1
+        self._lock = threading.Lock()
+        # change name -> (parsed change it was built from, its touches)
+        self._changes: dict[str, tuple[Change, list[Touch]]] = {}
+        # spec id -> change name -> touches
+        self._specs: dict[str, dict[str, list[Touch]]] = {}
+        # (spec id, requirement key) -> change name -> touches
+        self._requirements: dict[tuple[str, str], dict[str, list[Touch]]] = {}
+
+    @classmethod
+    def for_workspace(cls, workspace: WorkspaceIndex) -> "ImpactIndex":
+        if workspace.impact_index is None:
+            workspace.impact_index = cls(workspace)
+        return workspace.impact_index
+
+    def sync(self) -> None:
+        """Re-index changes whose parsed object changed since the last sync."""
+        if self.generation == self.workspace.generation:
+            return
+        with self._lock:
+            generation = self.workspace.generation
+            changes = self.workspace.changes
+            for name in [n for n in self._changes if n not in changes]:
+                self._remove_change(name)
+            for name, change in changes.items():
+                existing = self._changes.get(name)
+                if existing is not None and existing[0] is change:
+                    continue
+                if existing is not None:
+                    self._remove_change(name)
+                self._add_change(change)
+            self.generation = generation
+
+    # -- queries --------------------------------------------------------------
+
+    def by_change(self, change: str) -> Optional[list[Touch]]:
+        """Everything one active change modifies; None if there is no such change."""
+        self.sync()
+        entry = self._changes.get(change)
+        return None if entry is None else list(entry[1])
+
+    def by_spec(self, spec: str) -> dict[str, list[Touch]]:
+        """Active changes touching a spec, with their deltas to it."""
+        self.sync()
+        return {name: list(touches) for name, touches in sorted(self._specs.get(spec, {}).items())}
+
+    def by_requirement(self, spec: str, requirement: str) -> dict[str, list[Touch]]:
+        """Active changes touching one requirement of a spec (by its current or renamed name)."""
+        self.sync()
+        found = self._requirements.get(requirement_key(spec, requirement), {})
+        return {name: list(touches) for name, touches in sorted(found.items())}
+
+    def conflicts(self, spec: Optional[str] = None) -> dict[tuple[str, str], dict[str, list[Touch]]]:
+        """Requirements that more than one active change modifies."""
+        self.sync()
+        return {
+            key: {name: list(touches) for name, touches in sorted(by_change.items())}
+            for key, by_change in sorted(self._requirements.items())
+            if len(by_change) > 1 and (spec is None or key[0] == spec)
+        }
+
+    def specs(self) -> dict[str, list[str]]:
+        """Every spec that active changes touch, with the changes touching it."""
+        self.sync()
+        return {spec: sorted(by_change) for spec, by_change in sorted(self._specs.items())}
+
+    # -- maintenance ----------------------------------------------------------
+
+    def _add_change(self, change: Change) -> None:
+        touches = change_touches(change)
+        self._changes[change.name] = (change, touches)
+        for touch in touches:
+            self._specs.setdefault(touch.spec, {}).setdefault(change.name, []).append(touch)
+            names = {touch.requirement, touch.renamed_to} - {None}
+            for key in {requirement_key(touch.spec, name) for name in names}:
+                self._requirements.setdefault(key, {}).setdefault(change.name, []).append(touch)
+
+    def _remove_change(self, name: str) -> None:
+        _, touches = self._changes.pop(name)
+        for touch in touches:
+            _discard(self._specs, touch.spec, name)
+            names = {touch.requirement, touch.renamed_to} - {None}
+            for key in {requirement_key(touch.spec, n) for n in names}:
+                _discard(self._requirements, key, name)
+
+
+def _discard(mapping: dict, key, change: str) -> None:
+    by_change = mapping.get(key)
+    if by_change is None:
+        return
+    by_change.pop(change, None)
+    if not by_change:
+        del mapping[key]
+
+
+# ---------------------------------------------------------------------------
+# Formatting
+# ---------------------------------------------------------------------------
+
+
+def _touch_line(touch: Touch) -> str:
+    renamed = f" -> {touch.renamed_to}" if touch.renamed_to else ""
+    return f"  - {touch.operation} {touch.requirement}{renamed}"
+
+
+def _conflict_lines(conflicts: dict[tuple[str, str], dict[str, list[Touch]]]) -> list[str]:
+    lines = []
+    for by_change in conflicts.values():
+        first = next(iter(by_change.values()))[0]
+        changes = ", ".join(
+            f"{name} ({'/'.join(sorted({t.operation for t in touches}))})" for name, touches in by_change.items()
+        )
+        lines.append(f"  - {first.spec}: {first.requirement} <- {changes}")
+    return lines
+
+
+def impact_report(
+    impact: ImpactIndex,
+    change: Optional[str] = None,
+    spec: Optional[str] = None,
+    requirement: Optional[str] = None,
+) -> Optional[str]:
+    """Text answer to an impact query; None when the named change does not exist."""
+    if change:
+        touches = impact.by_change(change)
+        if touches is None:
+            return None
+        if spec:
+            touches = [t for t in touches if t.spec == spec]
+        if not touches:
+            return f"📭 Change '{change}' has no spec deltas" + (f" for spec '{spec}'" if spec else "")
+        specs = sorted({t.spec for t in touches})
+        lines = [f"🎯 Change '{change}' modifies {len(touches)} requirement(s) in {len(specs)} spec(s):"]
+        for spec_id in specs:
+            lines.append(f"\n{spec_id}")
+            lines.extend(_touch_line(t) for t in touches if t.spec == spec_id)
+        return "\n".join(lines)
+
+    if spec and requirement:
+        by_change = impact.by_requirement(spec, requirement)
+        if not by_change:
+            return f"📭 No active change touches requirement '{requirement}' in spec '{spec}'"
+        lines = [f"🎯 {len(by_change)} active change(s) touch '{spec}: {requirement}':"]
+        for name, touches in by_change.items():
+            lines.append(f"\n{name}")
+            lines.extend(_touch_line(t) for t in touches)
+        if len(by_change) > 1:
+            lines.append("\n⚠️  More than one change modifies this requirement")
+        return "\n".join(lines)
+
+    if spec:
+        by_change = impact.by_spec(spec)
+        if not by_change:
+            return f"📭 No active change touches spec '{spec}'"
+        lines = [f"🎯 {len(by_change)} active change(s) touch spec '{spec}':"]
+        for name, touches in by_change.items():
+            lines.append(f"\n{name}")
+            lines.extend(_touch_line(t) for t in touches)
+        conflicts = impact.conflicts(spec)
+        if conflicts:
+            lines.append("\n⚠️  Requirements modified by more than one change:")
+            lines.extend(_conflict_lines(conflicts))
+        return "\n".join(lines)
+
+    specs = impact.specs()
+    if not specs:
+        return "📭 No active change has spec deltas"
+    lines = [f"🎯 Active changes touch {len(specs)} spec(s):"]
+    lines.extend(f"  - {spec_id}: {', '.join(changes)}" for spec_id, changes in specs.items())
+    conflicts = impact.conflicts()
+    if conflicts:
+        lines.append("\n⚠️  Requirements modified by more than one change:")
+        lines.extend(_conflict_lines(conflicts))
+    return "\n".join(lines)
+
+
+def impact_json(
+    impact: ImpactIndex,
+    change: Optional[str] = None,
+    spec: Optional[str] = None,
+    requirement: Optional[str] = None,
+) -> Optional[str]:
+    """JSON answer to an impact query; None when the named change does not exist."""
+    if change:
+        touches = impact.by_change(change)
+        if touches is None:
+            return None
+        data: dict = {"change": change, "touches": [asdict(t) for t in touches if not spec or t.spec == spec]}
+    elif spec and requirement:
+        by_change = impact.by_requirement(spec, requirement)
+        data = {
+            "spec": spec,
+            "requirement": requirement,
+            "changes": {name: [asdict(t) for t in touches] for name, touches in by_change.items()},
+        }
+    elif spec:
+        data = {
+            "spec": spec,
+            "changes": {name: [asdict(t) for t in touches] for name, touches in impact.by_spec(spec).items()},
+        }
+    else:
+        data = {"specs": impact.specs()}
+    data["conflicts"] = [
+        {"spec": key[0], "requirement": next(iter(by_change.values()))[0].requirement, "changes": sorted(by_change)}
+        for key, by_change in impact.conflicts(spec).items()
+        if not change or change in by_change
+    ]
+    return json.dumps(data, indent=2, ensure_ascii=False)
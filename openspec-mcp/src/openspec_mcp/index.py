@@ -0,0 +1,410 @@
+"""
+Live in-memory index of OpenSpec workspaces.
+
+Each workspace the server is asked about gets a ``WorkspaceIndex`` holding its
+parsed specs and active/archived changes. A watcher thread keeps it current:
+``watchdog`` (inotify/FSEvents/ReadDirectoryChangesW) when it is installed,
+otherwise a stat poll. Only items whose files changed are re-parsed, and
+workspaces that have not been used recently are evicted.
+
+The watcher only keeps the index warm. A watcher event or poll can lag
+behind an edit, so every read first re-checks the items it is about to
+serve against the disk (``WorkspaceIndex.check``). That lets the poll stay
+cheap: each tick only stats the directories that list specs and changes,
+and the full stat pass over every item runs when a listing changed or every
+``RESCAN_INTERVAL`` seconds.
+
+Reads of named items always stat those items. Reads of every item of a kind
+(listings, search, impact) repeat the full stat pass only when a listing
+directory changed, a file event arrived, or ``FULL_CHECK_INTERVAL`` passed
+since the last one, so an edit inside an existing item can take up to that
+long to show up there when watchdog is not installed.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Union
+
+from .cache import normalize_directory
+from .reader import (
+    ARCHIVE_DIR,
+    NATIVE_READER_ENABLED,
+    Change,
+    OpenSpecReader,
+    Spec,
+    _is_plain_name,
+    _subdirectories,
+)
+from .scheduler import scheduler
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - optional dependency
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds between listing polls when watchdog is not available
+POLL_INTERVAL = float(os.environ.get("OPENSPEC_MCP_POLL_INTERVAL", "1.0"))
+# Seconds between full rescans of every item
+RESCAN_INTERVAL = 60.0
+# Seconds a full check of every item stays good for reads while the listings are unchanged
+FULL_CHECK_INTERVAL = 1.0
+# Delay that coalesces a burst of file events into one refresh
+DEBOUNCE = 0.05
+MAX_WORKSPACES = int(os.environ.get("OPENSPEC_MCP_MAX_WORKSPACES", "8"))
+IDLE_TIMEOUT = float(os.environ.get("OPENSPEC_MCP_WORKSPACE_IDLE_TIMEOUT", "1800"))
+
+Signature = tuple
+# Items a read depends on: True for every item of a kind, or the names it reads
+Items = Union[bool, Iterable[str]]
+# Index attribute holding each kind of item
+_COLLECTIONS = {"spec": "specs", "change": "changes", "archived": "archived"}
+# Generations are unique across every index of the process, so cached results
+# keyed on one never match an index rebuilt after its workspace was evicted
+_generations = itertools.count(1)
+
+
+def _file_signature(path: str) -> Optional[Signature]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def _tree_signature(path: str) -> Optional[Signature]:
+    """Signature of every file below a directory (names, sizes, mtimes); None if it is missing."""
+    entries = []
+    stack = [(path, "")]
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, f"{prefix}{entry.name}/"))
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((prefix + entry.name, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            if current == path:
+                return None
+    entries.sort()
+    return tuple(entries)
+
+
+class WorkspaceIndex:
+    """Parsed specs and changes of one workspace, refreshed incrementally."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.generation = next(_generations)
+        self.last_used = time.monotonic()
+        self.specs: dict[str, Spec] = {}
+        self.changes: dict[str, Change] = {}
+        self.archived: dict[str, Change] = {}
+        self._reader = OpenSpecReader(directory)
+        self._signatures: dict[tuple[str, str], Signature] = {}
+        # kind -> (listing signature, monotonic time) of its last full stat pass
+        self._full_checks: dict[str, tuple[Signature, float]] = {}
+        self._refresh_lock = threading.Lock()
+        self._watcher: Optional[_Watcher] = None
+        # Built lazily by search.SearchIndex.for_workspace and impact.ImpactIndex.for_workspace
+        self.search_index = None
+        self.impact_index = None
+
+    # -- reader interface used by reader.render_* ---------------------------
+
+    def spec_ids(self) -> list[str]:
+        return sorted(self.specs)
+
+    def change_names(self, archived: bool = False) -> list[str]:
+        return sorted(self.archived if archived else self.changes)
+
+    def read_spec(self, spec_id: str) -> Optional[Spec]:
+        return self.specs.get(spec_id)
+
+    def read_change(self, name: str, archived: bool = False) -> Optional[Change]:
+        return (self.archived if archived else self.changes).get(name)
+
+    def spec_path(self, spec_id: str) -> str:
+        return self._reader.spec_path(spec_id)
+
+    def change_path(self, name: str, archived: bool = False) -> str:
+        return self._reader.change_path(name, archived)
+
+    def all_specs(self) -> list[Spec]:
+        specs = self.specs
+        return [specs[i] for i in sorted(specs)]
+
+    def all_changes(self) -> list[Change]:
+        changes = self.changes
+        return [changes[n] for n in sorted(changes)]
+
+    # -- maintenance --------------------------------------------------------
+
+    def is_supported(self) -> bool:
+        return self._reader.is_supported()
+
+    def refresh(self) -> bool:
+        """Re-read only the specs and changes whose files changed; return True if anything did."""
+        return self._update(True, True, True, self.listing_signature())
+
+    def check(self, specs: Items = (), changes: Items = ()) -> bool:
+        """Re-read the given items if their files changed since they were indexed.
+
+        Reads call this before serving from the index, so they never depend on
+        the watcher having caught up. ``True`` checks every item of that kind,
+        including ones added or removed on disk; that pass is skipped while the
+        last one is still current (see ``FULL_CHECK_INTERVAL``). Returns True
+        if anything changed.
+        """
+        listing = self.listing_signature()
+        if specs is True and self._fully_checked("spec", listing):
+            specs = ()
+        if changes is True and self._fully_checked("change", listing):
+            changes = ()
+        return self._update(specs, changes, (), listing)
+
+    def _fully_checked(self, kind: str, listing: Signature) -> bool:
+        last = self._full_checks.get(kind)
+        return last is not None and last[0] == listing and time.monotonic() - last[1] < FULL_CHECK_INTERVAL
+
+    def _update(self, specs: Items, changes: Items, archived: Items, listing: Signature) -> bool:
+        with self._refresh_lock:
+            changed = False
+            for kind, names in (("spec", specs), ("change", changes), ("archived", archived)):
+                if names is True:
+                    # Taken before the stat pass, so an edit during it still counts as new
+                    self._full_checks[kind] = (listing, time.monotonic())
+                changed = self._update_kind(kind, names) or changed
+            if changed:
+                self.generation = next(_generations)
+            return changed
+
+    def _update_kind(self, kind: str, names: Items) -> bool:
+        if not names:
+            return False
+        current = getattr(self, _COLLECTIONS[kind])
+        full = names is True
+        if full:
+            names = self._listing(kind)
+            items: dict = {}
+        else:
+            # "archive" holds archived changes; it is never an active change itself
+            names = [n for n in names if _is_plain_name(n) and not (kind == "change" and n == ARCHIVE_DIR)]
+            if not names:
+                return False
+            items = dict(current)
+
+        changed = False
+        for name in names:
+            key = (kind, name)
+            signature = self._signature(kind, name)
+            if signature is None:
+                self._signatures.pop(key, None)
+                changed = items.pop(name, None) is not None or changed
+                continue
+            item = current.get(name)
+            if self._signatures.get(key) != signature:
+                # Unreadable items keep their signature, so they are only re-read once they change
+                item = self._read(kind, name)
+                self._signatures[key] = signature
+                changed = True
+            if item is not None:
+                items[name] = item
+            else:
+                items.pop(name, None)
+
+        if full:
+            seen = set(names)
+            for key in [k for k in self._signatures if k[0] == kind and k[1] not in seen]:
+                del self._signatures[key]
+            changed = changed or current.keys() != items.keys()
+
+        # Swap whole dicts so readers on the event loop never see a half-built index
+        setattr(self, _COLLECTIONS[kind], items)
+        return changed
+
+    def _listing(self, kind: str) -> list[str]:
+        if kind == "spec":
+            return _subdirectories(self._reader.specs_dir)
+        return self._reader.change_names(archived=kind == "archived")
+
+    def _signature(self, kind: str, name: str) -> Optional[Signature]:
+        if kind == "spec":
+            return _file_signature(self._reader.spec_path(name))
+        return _tree_signature(self._reader.change_path(name, archived=kind == "archived"))
+
+    def _read(self, kind: str, name: str):
+        if kind == "spec":
+            return self._reader.read_spec(name)
+        return self._reader.read_change(name, archived=kind == "archived")
+
+    def start_watching(self) -> None:
+        if self._watcher is None:
+            self._watcher = _Watcher(self)
+            self._watcher.start()
+
+    def listing_signature(self) -> Signature:
+        """Modification times of the directories listing specs, changes and archived changes."""
+        reader = self._reader
+        paths = (reader.root, reader.specs_dir, reader.changes_dir, os.path.join(reader.changes_dir, ARCHIVE_DIR))
+        return tuple(_file_signature(path) for path in paths)
+
+    def notify_changed(self) -> None:
+        """Have the watcher refresh soon, e.g. after a write tool modified the workspace."""
+        # The next read of every item stats them all again
+        self._full_checks.clear()
+        if self._watcher is not None:
+            self._watcher.wake()
+
+    def close(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, index: WorkspaceIndex):
+        super().__init__()
+        self._index = index
+
+    def on_any_event(self, event) -> None:
+        self._index.notify_changed()
+
+
+class _Watcher(threading.Thread):
+    """Refreshes a WorkspaceIndex on file events, or by polling when watchdog is missing."""
+
+    def __init__(self, index: WorkspaceIndex):
+        super().__init__(name=f"openspec-index-{index.directory}", daemon=True)
+        self.index = index
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._observer = None
+        self.interval = POLL_INTERVAL
+
+        if Observer is not None:
+            try:
+                observer = Observer()
+                observer.schedule(_EventHandler(index), index._reader.root, recursive=True)
+                observer.daemon = True
+                observer.start()
+                self._observer = observer
+                self.interval = RESCAN_INTERVAL
+            except Exception as e:
+                logger.debug("watchdog unavailable for %s, polling instead: %s", index.directory, e)
+
+    def run(self) -> None:
+        listing = self.index.listing_signature()
+        rescan_at = time.monotonic() + RESCAN_INTERVAL
+        while not self._stopped.is_set():
+            woken = self._wake.wait(self.interval)
+            if woken:
+                time.sleep(DEBOUNCE)
+                self._wake.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                # A poll tick with no listing change skips the stat pass over every item
+                previous, listing = listing, self.index.listing_signature()
+                if woken or listing != previous or time.monotonic() >= rescan_at:
+                    self.index.refresh()
+                    rescan_at = time.monotonic() + RESCAN_INTERVAL
+            except Exception as e:
+                logger.warning("Failed to refresh index for %s: %s", self.index.directory, e)
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+
+
+class IndexRegistry:
+    """Keeps a bounded set of workspace indexes, evicting the least recently used."""
+
+    def __init__(self, max_workspaces: int = MAX_WORKSPACES, idle_timeout: float = IDLE_TIMEOUT):
+        self.max_workspaces = max_workspaces
+        self.idle_timeout = idle_timeout
+        self._indexes: OrderedDict[str, WorkspaceIndex] = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    def peek(self, directory: str) -> Optional[WorkspaceIndex]:
+        """Return an already built index without creating one."""
+        index = self._indexes.get(normalize_directory(directory))
+        if index is not None and not index.is_supported():
+            self._drop(index.directory)
+            return None
+        return index
+
+    async def get(self, directory: str, specs: Items = (), changes: Items = ()) -> Optional[WorkspaceIndex]:
+        """Return the index for a workspace, building it off the event loop on first use.
+
+        ``specs`` and ``changes`` name the items the caller is about to read
+        (``True`` for all of a kind); they are checked against the disk first.
+        """
+        if not NATIVE_READER_ENABLED:
+            return None
+        workspace = normalize_directory(directory)
+        index = self.peek(workspace)
+        if index is None:
+            async with self._lock:
+                index = self.peek(workspace)
+                if index is None:
+                    index = WorkspaceIndex(workspace)
+                    if not index.is_supported():
+                        return None
+                    await asyncio.to_thread(index.refresh)
+                    index.start_watching()
+                    self._indexes[workspace] = index
+                    specs = changes = ()
+        if specs or changes:
+            await asyncio.to_thread(index.check, specs, changes)
+        index.last_used = time.monotonic()
+        self._indexes.move_to_end(workspace)
+        self._evict()
+        return index
+
+    def notify_changed(self, directory: str) -> None:
+        """Bring an index up to date immediately after the server itself wrote to the workspace."""
+        index = self._indexes.get(normalize_directory(directory))
+        if index is not None:
+            index.notify_changed()
+
+    def close(self) -> None:
+        for workspace in list(self._indexes):
+            self._drop(workspace)
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for workspace, index in list(self._indexes.items()):
+            if len(self._indexes) > self.max_workspaces or now - index.last_used > self.idle_timeout:
+                self._drop(workspace)
+
+    def _drop(self, workspace: str) -> None:
+        index = self._indexes.pop(workspace, None)
+        if index is not None:
+            index.close()
+            scheduler.forget(workspace)
+
+
+index_registry = IndexRegistry()
@@ -0,0 +1,319 @@
+"""
+Built-in metrics for the OpenSpec MCP server.
+
+Every tool call records its latency, whether it failed and how many bytes it
+returned; every OpenSpec CLI run records how long it took and which tool
+caused it; every workspace records how long calls queued for its read/write
+lock (see scheduler.py). The numbers are served by the ``openspec_metrics``
+tool and, when ``OPENSPEC_MCP_METRICS_FILE`` is set, written periodically in
+the Prometheus text format (e.g. for node_exporter's textfile collector).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+METRICS_FILE = os.environ.get("OPENSPEC_MCP_METRICS_FILE", "")
+EXPORT_INTERVAL = float(os.environ.get("OPENSPEC_MCP_METRICS_INTERVAL", "15"))
+
+# Prometheus histogram bucket bounds, in seconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+# Percentiles are computed over this many of the most recent samples
+SAMPLE_SIZE = 1024
+
+# Tool whose call is currently running, so CLI runs can be attributed to it
+_current_tool: ContextVar[str] = ContextVar("openspec_mcp_tool", default="")
+# Counter for CLI runs made by a shared (coalesced) execution, see coalesce.py
+_spawn_counter: ContextVar[Optional["SpawnCount"]] = ContextVar("openspec_mcp_spawn_counter", default=None)
+
+
+class SpawnCount:
+    """CLI runs made inside a ``Metrics.counting_spawns`` block."""
+
+    def __init__(self):
+        self.count = 0
+
+
+class Histogram:
+    """Cumulative bucket counts plus a window of recent samples for percentiles."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._samples: deque[float] = deque(maxlen=SAMPLE_SIZE)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self._samples.append(value)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        total = 0
+        result = []
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": _ms(self.sum / self.count) if self.count else None,
+            "p50_ms": _ms(self.percentile(0.50)),
+            "p95_ms": _ms(self.percentile(0.95)),
+            "p99_ms": _ms(self.percentile(0.99)),
+        }
+
+
+class ToolStats:
+    """Counters for one tool."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.bytes_returned = 0
+        self.latency = Histogram()
+        # mode ("process" | "worker") -> number of CLI runs started by this tool
+        self.spawns: dict[str, int] = {}
+        self.spawn_latency = Histogram()
+        # Calls that shared another identical call's execution, and the CLI runs that saved
+        self.coalesced = 0
+        self.spawns_saved = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "bytes_returned": self.bytes_returned,
+            "latency": self.latency.summary(),
+            "spawns": dict(self.spawns),
+            "spawn_latency": self.spawn_latency.summary(),
+            "coalesced": self.coalesced,
+            "spawns_saved": self.spawns_saved,
+        }
+
+
+class Metrics:
+    """Process-wide registry of tool and CLI metrics."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.tools: dict[str, ToolStats] = {}
+
+    def _tool(self, name: str) -> ToolStats:
+        stats = self.tools.get(name)
+        if stats is None:
+            stats = self.tools[name] = ToolStats()
+        return stats
+
+    @contextmanager
+    def tool_call(self, name: str) -> Iterator[None]:
+        """Attribute CLI runs inside the block to a tool call."""
+        token = _current_tool.set(name)
+        try:
+            yield
+        finally:
+            _current_tool.reset(token)
+
+    def record_call(self, name: str, duration: float, error: bool, bytes_returned: int) -> None:
+        stats = self._tool(name)
+        stats.calls += 1
+        stats.errors += int(error)
+        stats.bytes_returned += bytes_returned
+        stats.latency.observe(duration)
+
+    def record_spawn(self, mode: str, duration: float) -> None:
+        """Record one OpenSpec CLI run, either a spawned process or a worker request."""
+        stats = self._tool(_current_tool.get() or "internal")
+        stats.spawns[mode] = stats.spawns.get(mode, 0) + 1
+        stats.spawn_latency.observe(duration)
+        counter = _spawn_counter.get()
+        if counter is not None:
+            counter.count += 1
+
+    @contextmanager
+    def counting_spawns(self) -> Iterator[SpawnCount]:
+        """Count the CLI runs made inside the block, including in tasks it starts."""
+        counter = SpawnCount()
+        token = _spawn_counter.set(counter)
+        try:
+            yield counter
+        finally:
+            _spawn_counter.reset(token)
+
+    def record_coalesced(self, name: str, spawns_saved: int) -> None:
+        """Record a call that was answered by another identical call's execution."""
+        stats = self._tool(name)
+        stats.coalesced += 1
+        stats.spawns_saved += spawns_saved
+
+    def reset(self) -> None:
+        from .scheduler import scheduler
+
+        self.tools.clear()
+        scheduler.reset_stats()
+
+    def snapshot(self) -> dict:
+        """All metrics as a JSON-serialisable dict."""
+        from .startup import startup_timer
+
+        return {
+            "uptime_seconds": round(time.monotonic() - self.started, 3),
+            "startup": startup_timer.report(),
+            "tools": {name: stats.to_dict() for name, stats in sorted(self.tools.items())},
+            "caches": _cache_stats(),
+            "workspaces": {name: stats.to_dict() for name, stats in sorted(_wait_stats().items())},
+        }
+
+    def prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        family("openspec_mcp_uptime_seconds", "gauge", "Seconds since the server started")
+        lines.append(f"openspec_mcp_uptime_seconds {time.monotonic() - self.started:.3f}")
+
+        tools = sorted(self.tools.items())
+        family("openspec_mcp_tool_calls_total", "counter", "Tool calls handled")
+        for name, stats in tools:
+            lines.append(f'openspec_mcp_tool_calls_total{{tool="{name}"}} {stats.calls}')
+        family("openspec_mcp_tool_errors_total", "counter", "Tool calls that returned an error")
+        for name, stats in tools:
+            lines.append(f'openspec_mcp_tool_errors_total{{tool="{name}"}} {stats.errors}')
+        family("openspec_mcp_tool_bytes_returned_total", "counter", "UTF-8 bytes of tool output returned")
+        for name, stats in tools:
+            lines.append(f'openspec_mcp_tool_bytes_returned_total{{tool="{name}"}} {stats.bytes_returned}')
+        family("openspec_mcp_tool_latency_seconds", "histogram", "Tool call latency")
+        for name, stats in tools:
+            _histogram_lines(lines, "openspec_mcp_tool_latency_seconds", f'tool="{name}"', stats.latency)
+        family("openspec_mcp_cli_runs_total", "counter", "OpenSpec CLI runs by calling tool and mode")
+        for name, stats in tools:
+            for mode, count in sorted(stats.spawns.items()):
+                lines.append(f'openspec_mcp_cli_runs_total{{tool="{name}",mode="{mode}"}} {count}')
+        family("openspec_mcp_cli_run_seconds", "histogram", "OpenSpec CLI run duration")
+        for name, stats in tools:
+            if stats.spawn_latency.count:
+                _histogram_lines(lines, "openspec_mcp_cli_run_seconds", f'tool="{name}"', stats.spawn_latency)
+        family("openspec_mcp_tool_coalesced_total", "counter", "Tool calls that shared an identical in-flight call")
+        for name, stats in tools:
+            lines.append(f'openspec_mcp_tool_coalesced_total{{tool="{name}"}} {stats.coalesced}')
+        family("openspec_mcp_cli_runs_saved_total", "counter", "OpenSpec CLI runs avoided by coalescing")
+        for name, stats in tools:
+            lines.append(f'openspec_mcp_cli_runs_saved_total{{tool="{name}"}} {stats.spawns_saved}')
+
+        caches = _cache_stats()
+        family("openspec_mcp_cache_hits_total", "counter", "Cache hits")
+        for cache, stats in caches.items():
+            lines.append(f'openspec_mcp_cache_hits_total{{cache="{cache}"}} {stats["hits"]}')
+        family("openspec_mcp_cache_misses_total", "counter", "Cache misses")
+        for cache, stats in caches.items():
+            lines.append(f'openspec_mcp_cache_misses_total{{cache="{cache}"}} {stats["misses"]}')
+
+        workspaces = [(_label_value(name), stats) for name, stats in sorted(_wait_stats().items())]
+        family("openspec_mcp_workspace_lock_acquisitions_total", "counter", "Workspace lock acquisitions")
+        for name, stats in workspaces:
+            lines.append(f'openspec_mcp_workspace_lock_acquisitions_total{{workspace="{name}"}} {stats.acquisitions}')
+        family("openspec_mcp_workspace_lock_contended_total", "counter", "Workspace lock acquisitions that had to wait")
+        for name, stats in workspaces:
+            lines.append(f'openspec_mcp_workspace_lock_contended_total{{workspace="{name}"}} {stats.contended}')
+        family("openspec_mcp_workspace_lock_wait_seconds_total", "counter", "Time spent waiting for workspace locks")
+        for name, stats in workspaces:
+            lines.append(f'openspec_mcp_workspace_lock_wait_seconds_total{{workspace="{name}"}} {stats.total_wait:.6f}')
+        family("openspec_mcp_workspace_lock_wait_seconds_max", "gauge", "Longest wait for a workspace lock")
+        for name, stats in workspaces:
+            lines.append(f'openspec_mcp_workspace_lock_wait_seconds_max{{workspace="{name}"}} {stats.max_wait:.6f}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the Prometheus text atomically so a scraper never sees half a file."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(tmp_path, path)
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def _histogram_lines(lines: list[str], name: str, labels: str, histogram: Histogram) -> None:
+    for bound, count in histogram.cumulative():
+        lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {count}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+def _label_value(value: str) -> str:
+    """Escape a Prometheus label value (workspace paths may contain quotes or backslashes)."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _wait_stats() -> dict:
+    from .scheduler import scheduler
+
+    return dict(scheduler.stats)
+
+
+def _cache_stats() -> dict[str, dict]:
+    from .cache import result_cache
+    from .detection import detection_cache
+    from .validation import validation_cache
+
+    stats = {}
+    for name, cache in (
+        ("result", result_cache),
+        ("detection", detection_cache),
+        ("validation", validation_cache),
+    ):
+        lookups = cache.hits + cache.misses
+        stats[name] = {
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "hit_rate": round(cache.hits / lookups, 4) if lookups else None,
+        }
+    stats["result"]["entries"] = len(result_cache)
+    stats["result"]["size_bytes"] = result_cache.size_bytes
+    return stats
+
+
+async def export_periodically(path: str, interval: float = EXPORT_INTERVAL) -> None:
+    """Rewrite the Prometheus file every ``interval`` seconds until cancelled."""
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                metrics.write_prometheus(path)
+            except OSError as e:
+                logger.warning("Could not write metrics file %s: %s", path, e)
+    finally:
+        # One last write so the file reflects the final counters
+        try:
+            metrics.write_prometheus(path)
+        except OSError:
+            pass
+
+
+metrics = Metrics()
@@ -0,0 +1,181 @@
+#!/usr/bin/env node
+
+/**
+ * OpenSpec MCP - persistent CLI worker
+ *
+ * Loads the OpenSpec CLI once and then runs commands received on stdin as
+ * JSON lines, answering on stdout (see worker.py for the protocol).
+ *
+ * The CLI entry module is re-evaluated for every command by importing it with
+ * a unique query string. Its dependencies stay in Node's module cache, so
+ * only the thin command-line layer runs again, not the module loading.
+ * One command runs at a time, because commands change the working directory.
+ *
+ * Node never evicts module records, so every command leaves one behind. Each
+ * response reports the resident size (`rss`) and the server retires the
+ * worker after a number of commands or past a memory limit.
+ */
+
+import fs from 'node:fs';
+import path from 'node:path';
+import readline from 'node:readline';
+import { pathToFileURL } from 'node:url';
+
+const protocolWrite = process.stdout.write.bind(process.stdout);
+const send = (message) => protocolWrite(JSON.stringify(message) + '\n');
+
+class ExitSignal extends Error {
+  constructor(code) {
+    super(`exit ${code}`);
+    this.code = code ?? 0;
+  }
+}
+
+/**
+ * Find the module that actually defines the CLI. The published bin script is
+ * usually a one-line `import '../dist/cli/index.js'`, which would be cached.
+ */
+function resolveCliEntry() {
+  const bin = process.env.OPENSPEC_BIN;
+  if (!bin) {
+    throw new Error('OPENSPEC_BIN is not set');
+  }
+  const binPath = fs.realpathSync(bin);
+  const source = fs.readFileSync(binPath, 'utf-8');
+  const match = source.match(/import\s+['"](\.{1,2}\/[^'"]+)['"]/);
+  return match ? path.resolve(path.dirname(binPath), match[1]) : binPath;
+}
+
+const entryUrl = pathToFileURL(resolveCliEntry()).href;
+let runCounter = 0;
+let current = null;
+
+process.on('uncaughtException', (error) => settle(error));
+process.on('unhandledRejection', (error) => settle(error));
+
+function settle(error) {
+  if (!current) {
+    return;
+  }
+  if (error instanceof ExitSignal) {
+    current.finish(error.code);
+  } else {
+    current.stderr.push(String(error && error.stack ? error.stack : error) + '\n');
+    current.finish(1);
+  }
+}
+
+const activeResources = () =>
+  typeof process.getActiveResourcesInfo === 'function'
+    ? process.getActiveResourcesInfo().length
+    : 0;
+
+/**
+ * Run one CLI invocation in-process and capture what it prints.
+ */
+async function runCli(argv, cwd) {
+  const stdout = [];
+  const stderr = [];
+  const originalCwd = process.cwd();
+  const originalArgv = process.argv;
+  const originalExit = process.exit;
+  const originalOut = process.stdout.write;
+  const originalErr = process.stderr.write;
+
+  let finished = null;
+  const done = new Promise((resolve) => {
+    current = {
+      stdout,
+      stderr,
+      finish: (code) => {
+        if (!finished) {
+          finished = { code };
+          resolve();
+        }
+      },
+    };
+  });
+
+  process.stdout.write = (chunk, ...rest) => {
+    stdout.push(String(chunk));
+    const callback = rest.find((arg) => typeof arg === 'function');
+    if (callback) callback();
+    return true;
+  };
+  process.stderr.write = (chunk, ...rest) => {
+    stderr.push(String(chunk));
+    const callback = rest.find((arg) => typeof arg === 'function');
+    if (callback) callback();
+    return true;
+  };
+  process.exit = (code) => {
+    throw new ExitSignal(code ?? process.exitCode);
+  };
+  process.exitCode = undefined;
+
+  const baseline = activeResources();
+  try {
+    process.chdir(cwd);
+    process.argv = [originalArgv[0], 'openspec', ...argv];
+    runCounter += 1;
+    await import(`${entryUrl}?run=${runCounter}`);
+
+    // Commands run asynchronously after parse(); wait until they exit or go idle
+    let idleTicks = 0;
+    while (!finished && idleTicks < 3) {
+      await Promise.race([done, new Promise((resolve) => setImmediate(resolve))]);
+      idleTicks = activeResources() <= baseline ? idleTicks + 1 : 0;
+    }
+    current.finish(process.exitCode ?? 0);
+  } catch (error) {
+    settle(error);
+  } finally {
+    await done;
+    process.stdout.write = originalOut;
+    process.stderr.write = originalErr;
+    process.exit = originalExit;
+    process.argv = originalArgv;
+    process.exitCode = undefined;
+    try {
+      process.chdir(originalCwd);
+    } catch (e) {
+      // The original directory may have been removed
+    }
+    current = null;
+  }
+
+  return { code: finished.code, stdout: stdout.join(''), stderr: stderr.join('') };
+}
+
+async function main() {
+  // Warm the module cache so the first real command does not pay for it
+  await runCli(['--version'], process.cwd());
+  send({ ready: true });
+
+  const lines = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  for await (const line of lines) {
+    if (!line.trim()) {
+      continue;
+    }
+    let request;
+    try {
+      request = JSON.parse(line);
+    } catch (error) {
+      send({ id: null, error: `Malformed request: ${error.message}` });
+      continue;
+    }
+    if (request.op === 'ping') {
+      send({ id: request.id, ok: true, rss: process.memoryUsage().rss });
+    } else if (request.op === 'run') {
+      const result = await runCli(request.argv || [], request.cwd || process.cwd());
+      send({ id: request.id, ...result, rss: process.memoryUsage().rss });
+    } else {
+      send({ id: request.id, error: `Unknown op: ${request.op}` });
+    }
+  }
+}
+
+main().catch((error) => {
+  process.stderr.write(`❌ Worker failed: ${error.message}\n`);
+  process.exit(1);
+});
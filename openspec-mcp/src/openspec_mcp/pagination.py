@@ -0,0 +1,107 @@
+"""
+Size-bounded, cursor-paginated tool responses.
+
+Large ``show``/``list`` output is cut into pages at line boundaries. The full
+text is retained in memory for a while so later pages are served from it
+instead of re-running the CLI; each page ends with the cursor for the next one.
+"""
+
+import os
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+MAX_RESPONSE_CHARS = int(os.environ.get("OPENSPEC_MCP_MAX_RESPONSE_CHARS", "50000"))
+MIN_PAGE_SIZE = 1000
+RETAIN_SECONDS = 600.0
+MAX_RETAINED = 32
+MAX_RETAINED_CHARS = 64 * 1024 * 1024
+
+
+class CursorError(Exception):
+    """The cursor is malformed, unknown, or its result has expired."""
+
+
+@dataclass
+class _Retained:
+    text: str
+    expires_at: float
+
+
+def page_size_for(requested: Optional[int]) -> int:
+    """Clamp a requested page size to the configured maximum response size."""
+    if not requested:
+        return MAX_RESPONSE_CHARS
+    return max(MIN_PAGE_SIZE, min(int(requested), MAX_RESPONSE_CHARS))
+
+
+def _page_end(text: str, offset: int, page_size: int) -> int:
+    end = offset + page_size
+    if end >= len(text):
+        return len(text)
+    # Prefer to break after a newline in the second half of the page
+    newline = text.rfind("\n", offset + page_size // 2, end)
+    return newline + 1 if newline != -1 else end
+
+
+class ResultPages:
+    """Retains full results so their later pages can be served without re-running anything."""
+
+    def __init__(self):
+        self._results: OrderedDict[str, _Retained] = OrderedDict()
+        self._chars = 0
+
+    def first_page(self, text: str, page_size: int) -> str:
+        """Return text unchanged if it fits, otherwise its first page plus a continuation cursor."""
+        if len(text) <= page_size:
+            return text
+        token = secrets.token_urlsafe(9)
+        self._retain(token, text)
+        return self._render(token, text, 0, page_size)
+
+    def page(self, cursor: str, page_size: int) -> str:
+        """Return the page a cursor points at."""
+        token, _, offset_text = cursor.rpartition(":")
+        self._expire()
+        retained = self._results.get(token)
+        if retained is None or not offset_text.isdigit():
+            raise CursorError(f"Unknown or expired cursor: {cursor}")
+        self._results.move_to_end(token)
+        offset = int(offset_text)
+        if offset >= len(retained.text):
+            raise CursorError(f"Cursor is past the end of the result: {cursor}")
+        return self._render(token, retained.text, offset, page_size)
+
+    def _render(self, token: str, text: str, offset: int, page_size: int) -> str:
+        end = _page_end(text, offset, page_size)
+        body = text[offset:end]
+        if end >= len(text):
+            return f"{body}\n\n📄 Characters {offset}–{end} of {len(text)} (last page)"
+        return (
+            f"{body}\n\n📄 Characters {offset}–{end} of {len(text)}. "
+            f"More available: call again with cursor=\"{token}:{end}\""
+        )
+
+    def _retain(self, token: str, text: str) -> None:
+        self._expire()
+        self._results[token] = _Retained(text, time.monotonic() + RETAIN_SECONDS)
+        self._chars += len(text)
+        while self._results and (
+            len(self._results) > MAX_RETAINED or self._chars > MAX_RETAINED_CHARS
+        ):
+            self._drop(next(iter(self._results)))
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for token in [t for t, r in self._results.items() if r.expires_at <= now]:
+            self._drop(token)
+
+    def _drop(self, token: str) -> None:
+        retained = self._results.pop(token, None)
+        if retained is not None:
+            self._chars -= len(retained.text)
+
+
+result_pages = ResultPages()
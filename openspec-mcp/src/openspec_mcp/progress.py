@@ -0,0 +1,134 @@
+"""
+Forward command output to the MCP client while a tool call is still running.
+
+If the client sent a progress token with the request, output lines become
+``notifications/progress`` messages for it; otherwise they are sent as
+``notifications/message`` log entries tied to the request. Lines are batched
+so a chatty command does not flood the transport.
+
+When identical calls share one execution (see coalesce.py), the execution
+streams through a ``FanOutReporter`` that hands each line to the reporter of
+every caller still waiting, so callers that joined see the output from the
+moment they joined.
+"""
+
+import logging
+import time
+import weakref
+from contextvars import ContextVar
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between two notifications for the same request
+FLUSH_INTERVAL = 0.2
+LOGGER_NAME = "openspec"
+
+_LEVELS = ["debug", "info", "notice", "warning", "error", "critical", "alert", "emergency"]
+
+DEFAULT_LOG_LEVEL = "info"
+
+# Lowest log level each client session asked for through logging/setLevel.
+# Keyed on the session so clients sharing one HTTP server stay independent.
+_client_log_levels: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+
+def set_client_log_level(session: Any, level: str) -> None:
+    _client_log_levels[session] = level
+
+
+def client_log_level(session: Any) -> str:
+    return _client_log_levels.get(session, DEFAULT_LOG_LEVEL)
+
+
+def _enabled(session: Any, level: str) -> bool:
+    return _LEVELS.index(level) >= _LEVELS.index(client_log_level(session))
+
+
+class ProgressReporter:
+    """Streams output lines of one tool call to the client that made it."""
+
+    def __init__(self, context: Any, interval: float = FLUSH_INTERVAL):
+        self.session = context.session
+        self.request_id = context.request_id
+        meta = context.meta
+        self.progress_token = getattr(meta, "progressToken", None) if meta is not None else None
+        self.interval = interval
+        self.sent = 0
+        self._lines: list[tuple[str, str]] = []
+        self._last_flush = 0.0
+
+    async def __call__(self, stream: str, line: str) -> None:
+        """OutputCallback for run_command."""
+        self._lines.append((stream, line))
+        if time.monotonic() - self._last_flush >= self.interval:
+            await self.flush()
+
+    async def message(self, text: str) -> None:
+        """Report a status line that did not come from a child process."""
+        await self("stdout", text)
+
+    async def flush(self) -> None:
+        """Send whatever lines are buffered."""
+        if not self._lines:
+            return
+        lines, self._lines = self._lines, []
+        self._last_flush = time.monotonic()
+        try:
+            if self.progress_token is not None:
+                self.sent += len(lines)
+                await self.session.send_progress_notification(
+                    self.progress_token,
+                    self.sent,
+                    message="\n".join(line for _, line in lines),
+                    related_request_id=self.request_id,
+                )
+                return
+            for level in ("info", "warning"):
+                stream = "stdout" if level == "info" else "stderr"
+                text = "\n".join(line for s, line in lines if s == stream)
+                if text and _enabled(self.session, level):
+                    self.sent += 1
+                    await self.session.send_log_message(
+                        level=level,
+                        data=text,
+                        logger=LOGGER_NAME,
+                        related_request_id=self.request_id,
+                    )
+        except Exception as e:
+            # The client may have gone away; the final result is still returned normally
+            logger.debug("Could not send progress notification: %s", e)
+
+
+class FanOutReporter:
+    """Streams the output of one shared execution to every caller waiting for it."""
+
+    def __init__(self):
+        self.reporters: list[ProgressReporter] = []
+
+    async def __call__(self, stream: str, line: str) -> None:
+        for reporter in list(self.reporters):
+            await reporter(stream, line)
+
+    async def message(self, text: str) -> None:
+        await self("stdout", text)
+
+    async def flush(self) -> None:
+        for reporter in list(self.reporters):
+            await reporter.flush()
+
+
+# Set while a shared execution runs, so its output reaches every caller
+shared_reporter: ContextVar[Optional[FanOutReporter]] = ContextVar("openspec_mcp_shared_reporter", default=None)
+
+
+def current_reporter(app) -> Optional[ProgressReporter]:
+    """Reporter for the request being handled, or None outside of a request."""
+    shared = shared_reporter.get()
+    if shared is not None:
+        return shared
+    try:
+        context = app.request_context
+    except LookupError:
+        return None
+    return ProgressReporter(context)
@@ -0,0 +1,524 @@
+"""
+Native reader for the OpenSpec workspace layout.
+
+Listing and showing specs and changes only reads markdown under ``openspec/``,
+so it is done in-process instead of paying for a Node.js startup:
+
+    openspec/specs/<id>/spec.md
+    openspec/changes/<name>/proposal.md
+    openspec/changes/<name>/tasks.md
+    openspec/changes/<name>/specs/<capability>/spec.md
+    openspec/changes/archive/<date>-<name>/...
+
+The ``render_*`` helpers take any source with the ``OpenSpecReader`` interface
+(usually a ``WorkspaceIndex``) and return the same text the CLI prints, or None
+when the item is not known natively, in which case callers fall back to the CLI.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Set OPENSPEC_MCP_NATIVE_READER=0 to always go through the CLI
+NATIVE_READER_ENABLED = os.environ.get("OPENSPEC_MCP_NATIVE_READER", "1") != "0"
+
+OPENSPEC_DIR = "openspec"
+ARCHIVE_DIR = "archive"
+
+_HEADER_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_TASK_RE = re.compile(r"^\s*[-*]\s+\[([ xX])\]")
+_RENAME_RE = re.compile(r"^\s*-\s*(FROM|TO):\s*`?(?:###\s*Requirement:\s*)?(.*?)`?\s*$", re.IGNORECASE)
+
+DELTA_OPERATIONS = ("ADDED", "MODIFIED", "REMOVED", "RENAMED")
+_DELTA_VERBS = {"ADDED": "Add", "MODIFIED": "Modify", "REMOVED": "Remove"}
+
+
+@dataclass
+class Scenario:
+    """A ``#### Scenario:`` block."""
+
+    name: str
+    raw_text: str
+
+
+@dataclass
+class Requirement:
+    """A ``### Requirement:`` block and its scenarios."""
+
+    name: str
+    text: str
+    scenarios: list[Scenario] = field(default_factory=list)
+
+
+@dataclass
+class Spec:
+    """A parsed ``openspec/specs/<id>/spec.md``."""
+
+    id: str
+    title: str
+    overview: str
+    requirements: list[Requirement]
+    content: str
+
+
+@dataclass
+class Delta:
+    """One requirement-level change from a change's spec delta file."""
+
+    spec: str
+    operation: str
+    description: str
+    requirement: Optional[Requirement] = None
+    rename: Optional[dict] = None
+
+
+@dataclass
+class Change:
+    """A parsed change directory under ``openspec/changes/``."""
+
+    name: str
+    title: str
+    why: str
+    what_changes: str
+    deltas: list[Delta]
+    total_tasks: int
+    completed_tasks: int
+    content: str
+    archived: bool = False
+
+
+# ---------------------------------------------------------------------------
+# Markdown parsing
+# ---------------------------------------------------------------------------
+
+
+def _sections(text: str) -> list[tuple[int, str, list[str]]]:
+    """Split markdown into (level, title, body lines) sections, ignoring fenced code."""
+    sections: list[tuple[int, str, list[str]]] = [(0, "", [])]
+    in_fence = False
+    for line in text.splitlines():
+        if line.lstrip().startswith(("```", "~~~")):
+            in_fence = not in_fence
+        match = None if in_fence else _HEADER_RE.match(line)
+        if match:
+            sections.append((len(match.group(1)), match.group(2).strip(), []))
+        else:
+            sections[-1][2].append(line)
+    return sections
+
+
+def _body(lines: list[str]) -> str:
+    return "\n".join(lines).strip()
+
+
+def _strip_prefix(title: str, prefix: str) -> Optional[str]:
+    if title.lower().startswith(prefix.lower()):
+        return title[len(prefix):].strip()
+    return None
+
+
+def parse_requirements(sections: list[tuple[int, str, list[str]]]) -> list[Requirement]:
+    """Collect ``### Requirement:`` blocks (with ``#### Scenario:`` children) from sections."""
+    requirements: list[Requirement] = []
+    current: Optional[Requirement] = None
+    for level, title, lines in sections:
+        if level <= 2:
+            current = None
+            continue
+        if level == 3:
+            name = _strip_prefix(title, "Requirement:")
+            if name is None:
+                current = None
+                continue
+            body = _body(lines)
+            current = Requirement(name=name, text=body or name)
+            requirements.append(current)
+        elif level == 4 and current is not None:
+            name = _strip_prefix(title, "Scenario:")
+            if name is not None:
+                current.scenarios.append(Scenario(name=name, raw_text=_body(lines)))
+    return requirements
+
+
+def parse_spec(spec_id: str, content: str) -> Spec:
+    """Parse the contents of a main spec file."""
+    sections = _sections(content)
+    title = spec_id
+    overview = ""
+    requirement_sections: list[tuple[int, str, list[str]]] = []
+    in_requirements = False
+    for section in sections:
+        level, heading, lines = section
+        if level == 1 and title == spec_id:
+            title = heading
+        elif level == 2:
+            in_requirements = heading.lower() == "requirements"
+            if heading.lower() == "purpose":
+                overview = _body(lines)
+        if in_requirements:
+            requirement_sections.append(section)
+    return Spec(
+        id=spec_id,
+        title=title,
+        overview=overview,
+        requirements=parse_requirements(requirement_sections),
+        content=content,
+    )
+
+
+def parse_delta_spec(spec: str, content: str) -> list[Delta]:
+    """Parse a change's spec delta file into per-requirement deltas."""
+    deltas: list[Delta] = []
+    operation: Optional[str] = None
+    operation_sections: list[tuple[int, str, list[str]]] = []
+
+    def flush() -> None:
+        if operation is None:
+            return
+        if operation == "RENAMED":
+            deltas.extend(_parse_renames(spec, operation_sections))
+            return
+        for requirement in parse_requirements(operation_sections):
+            deltas.append(Delta(
+                spec=spec,
+                operation=operation,
+                description=f"{_DELTA_VERBS[operation]} requirement: {requirement.name}",
+                requirement=requirement,
+            ))
+
+    for section in _sections(content):
+        level, heading, _ = section
+        if level <= 2:
+            flush()
+            operation_sections = []
+            operation = None
+            if level == 2:
+                words = heading.split()
+                if len(words) >= 2 and words[0].upper() in DELTA_OPERATIONS and words[1].lower() == "requirements":
+                    operation = words[0].upper()
+                    operation_sections = [section]
+        elif operation is not None:
+            operation_sections.append(section)
+    flush()
+    return deltas
+
+
+def _parse_renames(spec: str, sections: list[tuple[int, str, list[str]]]) -> list[Delta]:
+    deltas: list[Delta] = []
+    rename_from: Optional[str] = None
+    for _, _, lines in sections:
+        for line in lines:
+            match = _RENAME_RE.match(line)
+            if not match:
+                continue
+            if match.group(1).upper() == "FROM":
+                rename_from = match.group(2).strip()
+            elif rename_from is not None:
+                rename_to = match.group(2).strip()
+                deltas.append(Delta(
+                    spec=spec,
+                    operation="RENAMED",
+                    description=f"Rename requirement from '{rename_from}' to '{rename_to}'",
+                    rename={"from": rename_from, "to": rename_to},
+                ))
+                rename_from = None
+    return deltas
+
+
+def count_tasks(content: str) -> tuple[int, int]:
+    """Return (total, completed) checkbox tasks in a tasks.md file."""
+    total = completed = 0
+    for line in content.splitlines():
+        match = _TASK_RE.match(line)
+        if match:
+            total += 1
+            if match.group(1) in "xX":
+                completed += 1
+    return total, completed
+
+
+def parse_change(name: str, proposal: str, tasks: str, delta_files: dict[str, str]) -> Change:
+    """Parse a change from its proposal, tasks and per-capability delta files."""
+    title = name
+    why = what_changes = ""
+    for level, heading, lines in _sections(proposal):
+        if level == 1 and title == name:
+            title = _strip_prefix(heading, "Change:") or heading
+        elif level == 2 and heading.lower() == "why":
+            why = _body(lines)
+        elif level == 2 and heading.lower() == "what changes":
+            what_changes = _body(lines)
+
+    deltas: list[Delta] = []
+    for spec in sorted(delta_files):
+        deltas.extend(parse_delta_spec(spec, delta_files[spec]))
+
+    total, completed = count_tasks(tasks)
+    return Change(
+        name=name,
+        title=title,
+        why=why,
+        what_changes=what_changes,
+        deltas=deltas,
+        total_tasks=total,
+        completed_tasks=completed,
+        content=proposal,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Workspace access
+# ---------------------------------------------------------------------------
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _subdirectories(path: str) -> list[str]:
+    try:
+        with os.scandir(path) as it:
+            return sorted(e.name for e in it if e.is_dir() and not e.name.startswith("."))
+    except OSError:
+        return []
+
+
+class OpenSpecReader:
+    """Reads specs and changes straight from a workspace's ``openspec/`` directory."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.root = os.path.join(directory, OPENSPEC_DIR)
+        self.specs_dir = os.path.join(self.root, "specs")
+        self.changes_dir = os.path.join(self.root, "changes")
+
+    def is_supported(self) -> bool:
+        """Return True when the workspace uses the layout this reader understands."""
+        return os.path.isdir(self.root) and (
+            os.path.isdir(self.specs_dir) or os.path.isdir(self.changes_dir)
+        )
+
+    def spec_ids(self) -> list[str]:
+        return [
+            d for d in _subdirectories(self.specs_dir)
+            if os.path.isfile(os.path.join(self.specs_dir, d, "spec.md"))
+        ]
+
+    def change_names(self, archived: bool = False) -> list[str]:
+        if archived:
+            return _subdirectories(os.path.join(self.changes_dir, ARCHIVE_DIR))
+        return [d for d in _subdirectories(self.changes_dir) if d != ARCHIVE_DIR]
+
+    def spec_path(self, spec_id: str) -> str:
+        return os.path.join(self.specs_dir, spec_id, "spec.md")
+
+    def change_path(self, name: str, archived: bool = False) -> str:
+        if archived:
+            return os.path.join(self.changes_dir, ARCHIVE_DIR, name)
+        return os.path.join(self.changes_dir, name)
+
+    def read_spec(self, spec_id: str) -> Optional[Spec]:
+        if not _is_plain_name(spec_id):
+            return None
+        content = _read_text(self.spec_path(spec_id))
+        if content is None:
+            return None
+        return parse_spec(spec_id, content)
+
+    def read_change(self, name: str, archived: bool = False) -> Optional[Change]:
+        if not _is_plain_name(name):
+            return None
+        path = self.change_path(name, archived)
+        proposal = _read_text(os.path.join(path, "proposal.md"))
+        if proposal is None:
+            return None
+        tasks = _read_text(os.path.join(path, "tasks.md")) or ""
+        delta_files: dict[str, str] = {}
+        specs_dir = os.path.join(path, "specs")
+        for spec in _subdirectories(specs_dir):
+            content = _read_text(os.path.join(specs_dir, spec, "spec.md"))
+            if content is not None:
+                delta_files[spec] = content
+        change = parse_change(name, proposal, tasks, delta_files)
+        change.archived = archived
+        return change
+
+    def all_specs(self) -> list[Spec]:
+        return [s for s in (self.read_spec(i) for i in self.spec_ids()) if s is not None]
+
+    def all_changes(self) -> list[Change]:
+        return [c for c in (self.read_change(n) for n in self.change_names()) if c is not None]
+
+
+def _is_plain_name(name: Optional[str]) -> bool:
+    """Reject names that could escape the openspec/ tree."""
+    return bool(name) and name not in (".", "..") and "/" not in name and "\\" not in name
+
+
+# ---------------------------------------------------------------------------
+# CLI-compatible views
+# ---------------------------------------------------------------------------
+
+
+def format_task_status(total: int, completed: int) -> str:
+    if total == 0:
+        return "No tasks"
+    if completed == total:
+        return "✓ Complete"
+    return f"{completed}/{total} tasks"
+
+
+def format_change_list(changes: list[Change]) -> str:
+    """Render ``openspec list --changes``."""
+    if not changes:
+        return "No active changes found.\n"
+    width = max(len(c.name) for c in changes)
+    lines = ["Changes:"]
+    for change in changes:
+        status = format_task_status(change.total_tasks, change.completed_tasks)
+        lines.append(f"  {change.name.ljust(width)}     {status}")
+    return "\n".join(lines) + "\n"
+
+
+def format_spec_summary(specs: list[Spec]) -> str:
+    """Render ``openspec list --specs``."""
+    if not specs:
+        return "No specs found.\n"
+    width = max(len(s.id) for s in specs)
+    lines = ["Specs:"]
+    for spec in specs:
+        lines.append(f"  {spec.id.ljust(width)}     requirements {len(spec.requirements)}")
+    return "\n".join(lines) + "\n"
+
+
+def format_spec_ids(spec_ids: list[str]) -> str:
+    """Render ``openspec spec list``."""
+    if not spec_ids:
+        return "No items found\n"
+    return "\n".join(spec_ids) + "\n"
+
+
+def requirement_to_dict(requirement: Requirement) -> dict:
+    return {
+        "text": requirement.text,
+        "scenarios": [{"rawText": s.raw_text} for s in requirement.scenarios],
+    }
+
+
+def spec_to_dict(spec: Spec) -> dict:
+    """JSON view of a spec, matching ``openspec spec show --json``."""
+    return {
+        "id": spec.id,
+        "title": spec.title,
+        "overview": spec.overview,
+        "requirementCount": len(spec.requirements),
+        "requirements": [requirement_to_dict(r) for r in spec.requirements],
+        "metadata": {"version": "1.0.0", "format": "openspec"},
+    }
+
+
+def delta_to_dict(delta: Delta) -> dict:
+    data: dict = {
+        "spec": delta.spec,
+        "operation": delta.operation,
+        "description": delta.description,
+    }
+    if delta.requirement is not None:
+        data["requirement"] = requirement_to_dict(delta.requirement)
+    if delta.rename is not None:
+        data["rename"] = delta.rename
+    return data
+
+
+def change_to_dict(change: Change) -> dict:
+    """JSON view of a change, matching ``openspec change show --json``."""
+    return {
+        "id": change.name,
+        "title": change.title,
+        "deltaCount": len(change.deltas),
+        "deltas": [delta_to_dict(d) for d in change.deltas],
+    }
+
+
+def _dump(data) -> str:
+    return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+
+def _show_spec(spec: Spec, format_type: Optional[str]) -> str:
+    return _dump(spec_to_dict(spec)) if format_type == "json" else spec.content
+
+
+def _show_change(change: Change, format_type: Optional[str]) -> str:
+    return _dump(change_to_dict(change)) if format_type == "json" else change.content
+
+
+def render_list(source, list_type: str) -> Optional[str]:
+    """Native ``openspec list``; None means fall back to the CLI."""
+    if source is None:
+        return None
+    if list_type == "specs":
+        return format_spec_summary(source.all_specs())
+    return format_change_list(source.all_changes())
+
+
+def render_spec_list(source) -> Optional[str]:
+    """Native ``openspec spec list``; None means fall back to the CLI."""
+    if source is None:
+        return None
+    return format_spec_ids(source.spec_ids())
+
+
+def render_spec(source, spec_id: str, format_type: Optional[str]) -> Optional[str]:
+    """Native ``openspec spec show``; None means fall back to the CLI."""
+    spec = source.read_spec(spec_id) if source is not None else None
+    return _show_spec(spec, format_type) if spec is not None else None
+
+
+def render_change(source, change_name: str, format_type: Optional[str]) -> Optional[str]:
+    """Native ``openspec change show``; None means fall back to the CLI."""
+    change = source.read_change(change_name) if source is not None else None
+    return _show_change(change, format_type) if change is not None else None
+
+
+def render_item(source, item_name: str, format_type: Optional[str]) -> Optional[str]:
+    """Native ``openspec show``; ambiguous or unknown items fall back to the CLI."""
+    if source is None:
+        return None
+    spec = source.read_spec(item_name)
+    change = source.read_change(item_name)
+    if spec is not None and change is None:
+        return _show_spec(spec, format_type)
+    if change is not None and spec is None:
+        return _show_change(change, format_type)
+    return None
+
+
+def spec_object(source, spec_id: str) -> Optional[dict]:
+    """Native ``openspec spec show --json`` as a dict; None means fall back to the CLI."""
+    spec = source.read_spec(spec_id) if source is not None else None
+    return spec_to_dict(spec) if spec is not None else None
+
+
+def change_object(source, change_name: str) -> Optional[dict]:
+    """Native ``openspec change show --json`` as a dict; None means fall back to the CLI."""
+    change = source.read_change(change_name) if source is not None else None
+    return change_to_dict(change) if change is not None else None
+
+
+def item_object(source, item_name: str) -> Optional[dict]:
+    """Native ``openspec show --json`` as a dict; ambiguous or unknown items fall back to the CLI."""
+    if source is None:
+        return None
+    spec = source.read_spec(item_name)
+    change = source.read_change(item_name)
+    if spec is not None and change is None:
+        return spec_to_dict(spec)
+    if change is not None and spec is None:
+        return change_to_dict(change)
+    return None
@@ -0,0 +1,247 @@
+"""
+Declarative tool registry.
+
+Each MCP tool is declared once as a ``ToolSpec``: its name, description and
+argument schema, how it is scheduled, and either the OpenSpec CLI argv it runs
+plus the messages its output is wrapped in, or a custom handler. Everything
+derived from a declaration (the MCP ``Tool`` object, the argument validator,
+the argv builder, the default argument values) is built once when the spec is
+created, so listing, validating and dispatching a tool is a dict lookup.
+
+Argv templates are tuples of:
+
+- a plain string, passed through;
+- ``"{arg}"``, replaced by the argument's value and left out when it is empty;
+- ``{"arg": {"value": "--flag"}}``, adding ``--flag`` when the argument has that value.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from mcp.types import TextContent, Tool
+
+from .delta import VERSION_PROPERTIES
+from .structured import FIELDS_PROPERTIES
+
+# How a tool is scheduled on its workspace (see scheduler.py)
+READ = "read"
+WRITE = "write"
+UNSCHEDULED = "unscheduled"
+
+Handler = Callable[[dict], Awaitable[list[TextContent]]]
+# Renders a tool's output from the workspace index, or returns None to use the CLI
+NativeRenderer = Callable[[Any, dict], Optional[str]]
+# Same, for the JSON view of an item in structured mode
+NativeObject = Callable[[Any, dict], Optional[dict]]
+# The workspace index items a native read depends on, as index_registry.get() keywords
+IndexReads = Callable[[dict], dict]
+Validator = Callable[[dict], Optional[str]]
+
+_JSON_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list, tuple),
+    "object": (dict,),
+}
+
+
+def directory_property(description: str = "Working directory (default: current directory)") -> dict:
+    return {"directory": {"type": "string", "description": description, "default": "."}}
+
+
+PAGE_PROPERTIES = {
+    "page_size": {
+        "type": "integer",
+        "description": "Maximum characters per response page (default and upper bound: server limit)",
+    },
+    "cursor": {
+        "type": "string",
+        "description": "Continuation cursor from a previous page of the same result",
+    },
+}
+
+
+def timeout_property(seconds: float) -> dict:
+    return {
+        "timeout": {
+            "type": "number",
+            "exclusiveMinimum": 0,
+            "description": f"Seconds before the OpenSpec command is killed (default: {seconds:g})",
+        }
+    }
+
+
+def validate_all_properties(items: str) -> dict:
+    return {
+        "all": {
+            "type": "boolean",
+            "description": f"Validate every {items} in parallel and report pass/fail per item",
+            "default": False,
+        },
+        "max_workers": {
+            "type": "integer",
+            "description": "Maximum parallel validations when 'all' is set (default: number of CPU cores)",
+        },
+        "force": {
+            "type": "boolean",
+            "description": "Re-validate items even if they are unchanged since their last successful validation",
+            "default": False,
+        },
+    }
+
+
+def compile_validator(schema: dict) -> Validator:
+    """Build a checker for the subset of JSON Schema the tool declarations use.
+
+    Returns a function that gives an error message for invalid arguments, or None.
+    """
+    required = tuple(schema.get("required", ()))
+    checks = []
+    for name, prop in schema.get("properties", {}).items():
+        types = _JSON_TYPES.get(prop.get("type", ""))
+        enum = frozenset(prop["enum"]) if "enum" in prop else None
+        checks.append((name, prop.get("type"), types, enum, prop.get("exclusiveMinimum")))
+
+    def validate(arguments: dict) -> Optional[str]:
+        for name in required:
+            if arguments.get(name) is None:
+                return f"'{name}' is a required property"
+        for name, type_name, types, enum, minimum in checks:
+            value = arguments.get(name)
+            if value is None:
+                continue
+            # bool is an int subclass, but true is not a valid integer argument
+            if types is not None and (
+                not isinstance(value, types) or (isinstance(value, bool) and type_name != "boolean")
+            ):
+                return f"'{name}' must be of type {type_name}"
+            if enum is not None and value not in enum:
+                return f"'{name}' must be one of: {', '.join(sorted(map(str, enum)))}"
+            if minimum is not None and value <= minimum:
+                return f"'{name}' must be greater than {minimum}"
+        return None
+
+    return validate
+
+
+def compile_argv(template: tuple) -> Callable[[dict], list[str]]:
+    """Turn an argv template into a function of the (defaulted) arguments."""
+    parts: list[Callable[[dict], Optional[str]]] = []
+    for item in template:
+        if isinstance(item, dict):
+            ((arg, flags),) = item.items()
+            parts.append(lambda values, arg=arg, flags=flags: flags.get(values.get(arg)))
+        elif item.startswith("{") and item.endswith("}"):
+            arg = item[1:-1]
+            parts.append(lambda values, arg=arg: str(values[arg]) if values.get(arg) else None)
+        else:
+            parts.append(lambda values, item=item: item)
+
+    def build(values: dict) -> list[str]:
+        argv = []
+        for part in parts:
+            value = part(values)
+            if value is not None:
+                argv.append(value)
+        return argv
+
+    return build
+
+
+class _Values(dict):
+    """Arguments for message templates; unknown names render as empty text."""
+
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """Everything the server needs to know about one tool."""
+
+    name: str
+    description: str
+    properties: dict = field(default_factory=dict)
+    required: tuple[str, ...] = ()
+    access: str = READ
+    # Custom tools: the coroutine that handles the call
+    handler: Optional[Handler] = None
+    # CLI tools: argv after "openspec", and the messages around the output
+    argv: tuple = ()
+    ok: str = "{output}"
+    failed: str = "❌ {output}"
+    native: Optional[NativeRenderer] = None
+    reads: Optional[IndexReads] = None
+    # Supports structured mode (--json parsed once, field projection); see structured.py
+    structured: Optional[NativeObject] = None
+    cached: bool = False
+    paginated: bool = False
+    # Text responses carry an ETag and support if_none_match/since; see delta.py
+    versioned: bool = False
+    # Default limit in seconds for the OpenSpec commands the tool runs; None if it runs none
+    timeout: Optional[float] = None
+    # Forward output lines to the client while the command runs
+    streams: bool = False
+    # Validate tools: the item kinds they cover and the argument naming the item
+    validates: tuple[str, ...] = ()
+    item_arg: Optional[str] = None
+
+    tool: Tool = field(init=False, repr=False, compare=False)
+    validate: Validator = field(init=False, repr=False, compare=False)
+    defaults: dict = field(init=False, repr=False, compare=False)
+    command: Callable[[dict], list[str]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        properties = dict(self.properties)
+        if self.structured is not None:
+            properties.update(FIELDS_PROPERTIES)
+        if self.versioned:
+            properties.update(VERSION_PROPERTIES)
+        if self.paginated:
+            properties.update(PAGE_PROPERTIES)
+        if self.timeout is not None:
+            properties.update(timeout_property(self.timeout))
+        schema = {"type": "object", "properties": properties, "required": list(self.required)}
+        object.__setattr__(self, "tool", Tool(name=self.name, description=self.description, inputSchema=schema))
+        object.__setattr__(self, "validate", compile_validator(schema))
+        object.__setattr__(
+            self, "defaults", {name: p["default"] for name, p in properties.items() if "default" in p}
+        )
+        object.__setattr__(self, "command", compile_argv(self.argv))
+
+    def values(self, arguments: dict, **extra: Any) -> dict:
+        """Arguments with schema defaults filled in, for argv and message templates."""
+        values = _Values(self.defaults)
+        values.update((k, v) for k, v in arguments.items() if v is not None)
+        values.update(extra)
+        return values
+
+    def message(self, template: str, arguments: dict, output: str) -> str:
+        """A result message, built with a single copy of the output (none for a bare "{output}")."""
+        before, marker, after = template.partition("{output}")
+        if not marker:
+            return template.format_map(self.values(arguments))
+        if not before and not after:
+            return output
+        values = self.values(arguments)
+        return "".join((before.format_map(values), output, after.format_map(values)))
+
+
+class ToolRegistry:
+    """Tool declarations by name, with the derived lists the server hands out."""
+
+    def __init__(self, specs: list[ToolSpec]):
+        self.specs = {spec.name: spec for spec in specs}
+        self.tools = [spec.tool for spec in specs]
+        self.write_tools = frozenset(s.name for s in specs if s.access == WRITE)
+
+    def get(self, name: str) -> Optional[ToolSpec]:
+        return self.specs.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.specs
+
+    def __iter__(self):
+        return iter(self.specs.values())
@@ -0,0 +1,260 @@
+"""
+Asynchronous command execution for the OpenSpec MCP server.
+
+All OpenSpec CLI invocations go through ``run_command`` so that a slow
+``openspec archive`` or ``openspec validate`` never blocks the event loop.
+When worker mode is enabled (see worker.py) ``openspec`` commands are sent to a
+persistent sidecar first and only spawned directly if no worker can take them.
+
+Each child runs in its own process group (a new session on POSIX, a new
+process group on Windows). When a command times out, or the tool call running
+it is cancelled because the client sent a cancellation or disconnected, the
+whole group is killed, including anything the CLI started itself. Children
+still running when the server shuts down are killed by ``kill_all``.
+
+Output is captured in a ``_Spool``: in memory up to ``SPOOL_BYTES`` per
+stream, in an anonymous temporary file beyond that. The captured bytes are
+decoded once, straight from the buffer or a memory map of the file, so a
+command printing many megabytes costs the decoded text and nothing more.
+Lines handed to an ``on_output`` callback are cut at ``LINE_BYTES``.
+
+Commands answered by a worker (``WorkerPool.run``) bypass both: the worker
+returns the whole output in one message, held in memory, and nothing is
+streamed while the command runs.
+"""
+
+import asyncio
+import logging
+import mmap
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, Optional
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Read-only commands (show, list, help) should answer quickly; archive, init,
+# update and validate may legitimately take minutes
+SHORT_TIMEOUT = float(os.environ.get("OPENSPEC_MCP_SHORT_TIMEOUT", "60"))
+LONG_TIMEOUT = float(os.environ.get("OPENSPEC_MCP_LONG_TIMEOUT", "300"))
+DEFAULT_TIMEOUT = LONG_TIMEOUT
+CHUNK_SIZE = 64 * 1024
+# Output of one stream beyond this many bytes is kept in a temporary file
+SPOOL_BYTES = int(os.environ.get("OPENSPEC_MCP_SPOOL_BYTES", 1024 * 1024))
+# A streamed line longer than this is handed to on_output in pieces
+LINE_BYTES = 64 * 1024
+
+# Spawn options that put a child in a process group of its own
+if sys.platform == "win32":
+    PROCESS_GROUP_OPTIONS: dict = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    PROCESS_GROUP_OPTIONS = {"start_new_session": True}
+
+# Timeout for commands run by the current tool call, when it did not pass one
+_command_timeout: ContextVar[Optional[float]] = ContextVar("openspec_mcp_timeout", default=None)
+_running: set = set()
+
+# Called with ("stdout" | "stderr", line) for every line a command prints
+OutputCallback = Callable[[str, str], Awaitable[None]]
+
+
+async def run_command(
+    cmd: list[str],
+    cwd: Optional[str] = None,
+    timeout: Optional[float] = None,
+    on_output: Optional[OutputCallback] = None,
+) -> tuple[bool, str, str]:
+    """Run a command without blocking the event loop and return (success, stdout, stderr).
+
+    When ``on_output`` is given it receives each output line while the command runs.
+    Without a ``timeout`` the current tool call's limit applies (see ``time_limit``).
+    """
+    timeout = timeout or _command_timeout.get() or DEFAULT_TIMEOUT
+    started = time.perf_counter()
+    if cmd and cmd[0] == "openspec":
+        from .worker import get_worker_pool
+
+        pool = get_worker_pool()
+        if pool is not None:
+            result = await pool.run(cmd[1:], cwd, timeout)
+            if result is not None:
+                metrics.record_spawn("worker", time.perf_counter() - started)
+                return result
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=cwd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            **PROCESS_GROUP_OPTIONS,
+        )
+    except Exception as e:
+        return False, "", str(e)
+    track_child(process)
+
+    stdout, stderr = _Spool(), _Spool()
+    gathered = asyncio.gather(
+        _pump(process.stdout, "stdout", stdout, on_output),
+        _pump(process.stderr, "stderr", stderr, on_output),
+        process.wait(),
+    )
+    # On cancellation the gather can end with a CancelledError nobody awaits; mark it seen
+    gathered.add_done_callback(lambda future: future.cancelled() or future.exception())
+    try:
+        await asyncio.wait_for(gathered, timeout=timeout)
+        return process.returncode == 0, stdout.decode(), stderr.decode()
+    except asyncio.TimeoutError:
+        await _kill(process)
+        return False, "", f"Command timed out after {_format_timeout(timeout)}"
+    except asyncio.CancelledError:
+        logger.info("Tool call cancelled, killing %s (pid %d)", cmd[0], process.pid)
+        await _kill(process)
+        raise
+    finally:
+        stdout.close()
+        stderr.close()
+        untrack_child(process)
+        metrics.record_spawn("process", time.perf_counter() - started)
+
+
+class _Spool:
+    """Captured output of one stream, moved to a temporary file once it passes SPOOL_BYTES."""
+
+    def __init__(self, limit: int = SPOOL_BYTES):
+        self.limit = limit
+        self.buffer = bytearray()
+        self.file = None
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.file is None and self.size > self.limit:
+            self.file = tempfile.TemporaryFile()
+            self.file.write(self.buffer)
+            self.buffer = bytearray()
+        if self.file is not None:
+            self.file.write(chunk)
+        else:
+            self.buffer += chunk
+
+    def decode(self) -> str:
+        """The captured text, decoded in one pass without another copy of the bytes."""
+        if self.file is None:
+            return self.buffer.decode("utf-8", errors="replace")
+        self.file.flush()
+        with mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return str(mapped, "utf-8", errors="replace")
+
+    def close(self) -> None:
+        self.buffer = bytearray()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+async def _pump(stream: asyncio.StreamReader, name: str, sink: _Spool, on_output: Optional[OutputCallback]) -> None:
+    """Capture a child's output stream, handing complete lines to on_output as they arrive."""
+    # Only the unfinished line is kept here, and only up to LINE_BYTES; the spool has the rest
+    pending = bytearray()
+    while True:
+        chunk = await stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        sink.write(chunk)
+        if on_output is None:
+            continue
+        view = memoryview(chunk)
+        start = 0
+        while (end := chunk.find(b"\n", start)) >= 0:
+            pending += view[start:end]
+            await _emit(on_output, name, pending)
+            pending.clear()
+            start = end + 1
+        pending += view[start:]
+        while len(pending) >= LINE_BYTES:
+            await _emit(on_output, name, pending[:LINE_BYTES])
+            del pending[:LINE_BYTES]
+    if on_output is not None and pending:
+        await _emit(on_output, name, pending)
+
+
+async def _emit(on_output: OutputCallback, name: str, line: bytearray) -> None:
+    try:
+        await on_output(name, line.decode("utf-8", errors="replace").rstrip("\r"))
+    except Exception as e:
+        # Losing a progress line must never fail the command itself
+        logger.debug("Output callback failed: %s", e)
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """Apply a timeout to every command run inside the block that does not set its own."""
+    token = _command_timeout.set(seconds)
+    try:
+        yield
+    finally:
+        _command_timeout.reset(token)
+
+
+def kill_process_group(process) -> None:
+    """Kill a child started with PROCESS_GROUP_OPTIONS together with everything it started."""
+    if process.returncode is not None:
+        return
+    try:
+        if sys.platform == "win32":
+            # taskkill walks the tree from the still-running parent
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=10,
+            )
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        pass
+    try:
+        process.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def _kill(process: asyncio.subprocess.Process) -> None:
+    """Kill a child's process group and reap it."""
+    kill_process_group(process)
+    await process.wait()
+
+
+def track_child(process) -> None:
+    """Remember a child so that kill_all reaches it."""
+    _running.add(process)
+
+
+def untrack_child(process) -> None:
+    _running.discard(process)
+
+
+def kill_all() -> int:
+    """Kill every tracked child still running, e.g. on shutdown; returns how many there were."""
+    processes = [p for p in _running if p.returncode is None]
+    for process in processes:
+        kill_process_group(process)
+    _running.clear()
+    return len(processes)
+
+
+def _format_timeout(timeout: float) -> str:
+    """Render a timeout the way the CLI error messages always have."""
+    if timeout >= 60 and timeout % 60 == 0:
+        minutes = int(timeout // 60)
+        return f"{minutes} minute{'s' if minutes != 1 else ''}"
+    return f"{timeout:g} seconds"
@@ -0,0 +1,165 @@
+"""
+Per-workspace reader/writer scheduling of tool calls.
+
+Write tools (``init``, ``update``, ``archive``) rewrite files under
+``openspec/`` while ``show``/``list`` calls read them. Each resolved workspace
+directory gets its own read/write lock: reads run in parallel, a write runs
+alone, and unrelated workspaces never wait on each other. Time spent queueing
+is recorded per workspace and reported by ``openspec_metrics``.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from .cache import normalize_directory
+
+logger = logging.getLogger(__name__)
+
+# Waits longer than this are logged
+SLOW_WAIT = 0.5
+# Workspaces whose wait statistics are kept; the least recently used are dropped
+MAX_TRACKED_WORKSPACES = 64
+
+
+class ReadWriteLock:
+    """Writer-preferring asyncio read/write lock."""
+
+    def __init__(self):
+        self._condition = asyncio.Condition()
+        self.readers = 0
+        self.writer = False
+        self.writers_waiting = 0
+        self.readers_waiting = 0
+
+    async def acquire_read(self) -> None:
+        async with self._condition:
+            self.readers_waiting += 1
+            try:
+                # Waiting writers go first so a stream of reads cannot starve them
+                await self._condition.wait_for(lambda: not self.writer and not self.writers_waiting)
+            finally:
+                self.readers_waiting -= 1
+            self.readers += 1
+
+    async def release_read(self) -> None:
+        async with self._condition:
+            self.readers -= 1
+            if self.readers == 0:
+                self._condition.notify_all()
+
+    async def acquire_write(self) -> None:
+        async with self._condition:
+            self.writers_waiting += 1
+            try:
+                await self._condition.wait_for(lambda: not self.writer and not self.readers)
+            finally:
+                self.writers_waiting -= 1
+                if not self.writers_waiting:
+                    # Wake readers that were held back for a writer that gave up
+                    self._condition.notify_all()
+            self.writer = True
+
+    async def release_write(self) -> None:
+        async with self._condition:
+            self.writer = False
+            self._condition.notify_all()
+
+
+@dataclass
+class WaitStats:
+    """Queue-wait statistics for one workspace."""
+
+    acquisitions: int = 0
+    contended: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def record(self, wait: float) -> None:
+        self.acquisitions += 1
+        if wait > 0.001:
+            self.contended += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def to_dict(self) -> dict:
+        return {
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "total_wait_ms": round(self.total_wait * 1000, 3),
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class WorkspaceScheduler:
+    """Hands out per-workspace read/write access to tool calls."""
+
+    def __init__(self):
+        # workspace -> (lock, number of calls holding or waiting for it)
+        self._locks: dict[str, list] = {}
+        self.stats: OrderedDict[str, WaitStats] = OrderedDict()
+
+    @asynccontextmanager
+    async def reading(self, directory: str) -> AsyncIterator[float]:
+        """Hold shared access to a workspace; yields the time spent waiting."""
+        async with self._hold(directory, write=False) as wait:
+            yield wait
+
+    @asynccontextmanager
+    async def writing(self, directory: str) -> AsyncIterator[float]:
+        """Hold exclusive access to a workspace; yields the time spent waiting."""
+        async with self._hold(directory, write=True) as wait:
+            yield wait
+
+    def forget(self, directory: str) -> None:
+        """Drop the wait statistics of a workspace, e.g. once its index was evicted."""
+        self.stats.pop(normalize_directory(directory), None)
+
+    def reset_stats(self) -> None:
+        self.stats.clear()
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def _hold(self, directory: str, write: bool) -> AsyncIterator[float]:
+        workspace = normalize_directory(directory)
+        entry = self._locks.get(workspace)
+        if entry is None:
+            entry = self._locks[workspace] = [ReadWriteLock(), 0]
+        # Counted before the first await so the lock is never dropped while someone needs it
+        entry[1] += 1
+        lock: ReadWriteLock = entry[0]
+        try:
+            started = time.perf_counter()
+            await (lock.acquire_write() if write else lock.acquire_read())
+            wait = time.perf_counter() - started
+            self._record(workspace, wait)
+            if wait >= SLOW_WAIT:
+                mode = "write" if write else "read"
+                logger.info("Waited %.2fs for %s access to %s", wait, mode, workspace)
+            try:
+                yield wait
+            finally:
+                await (lock.release_write() if write else lock.release_read())
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and self._locks.get(workspace) is entry:
+                del self._locks[workspace]
+
+    def _record(self, workspace: str, wait: float) -> None:
+        stats = self.stats.get(workspace)
+        if stats is None:
+            stats = self.stats[workspace] = WaitStats()
+            while len(self.stats) > MAX_TRACKED_WORKSPACES:
+                self.stats.popitem(last=False)
+        else:
+            self.stats.move_to_end(workspace)
+        stats.record(wait)
+
+
+scheduler = WorkspaceScheduler()
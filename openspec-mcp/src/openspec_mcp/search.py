@@ -0,0 +1,233 @@
+"""
+Full-text search over a workspace's specs and changes.
+
+The inverted index works at requirement/scenario granularity and is built on
+top of a ``WorkspaceIndex``. Parsed items are reused by identity across index
+refreshes, so after a file change only the items that were re-parsed get
+re-tokenized. Hits are ranked with BM25.
+"""
+
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+from .index import WorkspaceIndex
+from .reader import Change, Requirement, Spec
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have if in is it its of on or that the "
+    "then this to was were when will with".split()
+)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+SNIPPET_CHARS = 160
+DEFAULT_LIMIT = 10
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens without stopwords."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+@dataclass(frozen=True)
+class Document:
+    """One searchable unit: a requirement, a scenario, or a change proposal."""
+
+    kind: str  # "spec" or "change"
+    item: str  # spec id or change name
+    spec: Optional[str]
+    requirement: Optional[str]
+    scenario: Optional[str]
+    operation: Optional[str]
+    text: str
+
+    @property
+    def location(self) -> str:
+        parts = [f"[{self.kind}] {self.item}"]
+        if self.kind == "change" and self.spec:
+            parts.append(self.spec)
+        if self.requirement:
+            prefix = f"{self.operation} " if self.operation else ""
+            parts.append(f"{prefix}Requirement: {self.requirement}")
+        if self.scenario:
+            parts.append(f"Scenario: {self.scenario}")
+        if self.kind == "change" and not self.requirement:
+            parts.append("Proposal")
+        return " › ".join(parts)
+
+
+@dataclass
+class SearchHit:
+    document: Document
+    score: float
+    snippet: str
+
+
+def _requirement_documents(
+    kind: str, item: str, spec: Optional[str], requirement: Requirement, operation: Optional[str] = None
+) -> list[Document]:
+    docs = [Document(kind, item, spec, requirement.name, None, operation,
+                     f"{requirement.name}\n{requirement.text}")]
+    for scenario in requirement.scenarios:
+        docs.append(Document(kind, item, spec, requirement.name, scenario.name, operation,
+                             f"{scenario.name}\n{scenario.raw_text}"))
+    return docs
+
+
+def spec_documents(spec: Spec) -> list[Document]:
+    docs: list[Document] = []
+    for requirement in spec.requirements:
+        docs.extend(_requirement_documents("spec", spec.id, spec.id, requirement))
+    return docs
+
+
+def change_documents(change: Change) -> list[Document]:
+    docs = [Document("change", change.name, None, None, None, None,
+                     f"{change.title}\n{change.why}\n{change.what_changes}")]
+    for delta in change.deltas:
+        if delta.requirement is not None:
+            docs.extend(_requirement_documents(
+                "change", change.name, delta.spec, delta.requirement, delta.operation
+            ))
+        elif delta.rename is not None:
+            docs.append(Document("change", change.name, delta.spec, delta.rename["to"], None,
+                                 delta.operation, delta.description))
+    return docs
+
+
+class SearchIndex:
+    """Inverted index for one workspace, synchronised lazily with its WorkspaceIndex."""
+
+    def __init__(self, workspace: WorkspaceIndex):
+        self.workspace = workspace
+        self.generation = -1
+        self._lock = threading.Lock()
+        # item key -> (parsed object it was built from, doc ids)
+        self._items: dict[tuple[str, str], tuple[object, list[int]]] = {}
+        self._documents: dict[int, Document] = {}
+        self._terms: dict[int, Counter] = {}
+        self._lengths: dict[int, int] = {}
+        self._postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self._total_length = 0
+        self._next_id = 0
+
+    @classmethod
+    def for_workspace(cls, workspace: WorkspaceIndex) -> "SearchIndex":
+        if workspace.search_index is None:
+            workspace.search_index = cls(workspace)
+        return workspace.search_index
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def sync(self) -> None:
+        """Re-index items whose parsed object changed since the last sync."""
+        if self.generation == self.workspace.generation:
+            return
+        with self._lock:
+            generation = self.workspace.generation
+            specs, changes = self.workspace.specs, self.workspace.changes
+            current: dict[tuple[str, str], object] = {}
+            current.update((("spec", k), v) for k, v in specs.items())
+            current.update((("change", k), v) for k, v in changes.items())
+
+            for key in [k for k in self._items if k not in current]:
+                self._remove_item(key)
+            for key, item in current.items():
+                existing = self._items.get(key)
+                if existing is not None and existing[0] is item:
+                    continue
+                if existing is not None:
+                    self._remove_item(key)
+                docs = spec_documents(item) if key[0] == "spec" else change_documents(item)
+                self._items[key] = (item, [self._add_document(d) for d in docs])
+            self.generation = generation
+
+    def search(self, query: str, scope: str = "all", limit: int = DEFAULT_LIMIT) -> list[SearchHit]:
+        """Return the best matching documents for a free-text query."""
+        self.sync()
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            n = len(self._documents)
+            if n == 0:
+                return []
+            average = self._total_length / n
+            scores: dict[int, float] = defaultdict(float)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    length = self._lengths[doc_id]
+                    scores[doc_id] += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / average))
+
+            ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+            hits: list[SearchHit] = []
+            for doc_id, score in ranked:
+                document = self._documents[doc_id]
+                if scope == "specs" and document.kind != "spec":
+                    continue
+                if scope == "changes" and document.kind != "change":
+                    continue
+                hits.append(SearchHit(document, score, make_snippet(document.text, terms)))
+                if len(hits) >= limit:
+                    break
+            return hits
+
+    def _add_document(self, document: Document) -> int:
+        doc_id = self._next_id
+        self._next_id += 1
+        terms = Counter(tokenize(document.text))
+        self._documents[doc_id] = document
+        self._terms[doc_id] = terms
+        for term, tf in terms.items():
+            self._postings[term][doc_id] = tf
+        self._lengths[doc_id] = sum(terms.values())
+        self._total_length += self._lengths[doc_id]
+        return doc_id
+
+    def _remove_item(self, key: tuple[str, str]) -> None:
+        _, doc_ids = self._items.pop(key)
+        for doc_id in doc_ids:
+            terms = self._terms.pop(doc_id)
+            del self._documents[doc_id]
+            self._total_length -= self._lengths.pop(doc_id)
+            for term in terms:
+                postings = self._postings[term]
+                del postings[doc_id]
+                if not postings:
+                    del self._postings[term]
+
+
+def make_snippet(text: str, terms: list[str], width: int = SNIPPET_CHARS) -> str:
+    """Cut a window of text around the first matching term."""
+    flat = " ".join(text.split())
+    lowered = flat.lower()
+    positions = [m.start() for t in terms for m in [re.search(rf"\b{re.escape(t)}", lowered)] if m]
+    start = max(0, min(positions) - width // 4) if positions else 0
+    snippet = flat[start:start + width]
+    if start > 0:
+        snippet = "…" + snippet
+    if start + width < len(flat):
+        snippet += "…"
+    return snippet
+
+
+def format_hits(query: str, hits: list[SearchHit]) -> str:
+    if not hits:
+        return f"🔍 No results for \"{query}\"\n"
+    lines = [f"🔍 {len(hits)} result{'s' if len(hits) != 1 else ''} for \"{query}\":", ""]
+    for rank, hit in enumerate(hits, 1):
+        lines.append(f"{rank}. {hit.document.location} (score {hit.score:.2f})")
+        lines.append(f"   {hit.snippet}")
+    return "\n".join(lines) + "\n"
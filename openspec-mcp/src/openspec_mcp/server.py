@@ -5,686 +5,641 @@ A Model Context Protocol server for OpenSpec - AI-powered API specification tool
 """
 
 import asyncio
+import atexit
 import json
+import logging
 import os
-import subprocess
+import signal
+import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, Hashable, Optional, Union
 
 from mcp.server import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
+from .archive import (
+    ARCHIVED,
+    FAILED,
+    SKIPPED,
+    ArchiveStep,
+    find_conflicts,
+    format_archive_report,
+    format_conflicts,
+    format_step,
+)
+from .cache import normalize_directory, result_cache, text_size, workspace_fingerprint
+from .coalesce import single_flight
+from .delta import versioned_response
+from .detection import detect_openspec
+from .impact import ImpactIndex, impact_json, impact_report
+from .index import index_registry
+from .metrics import METRICS_FILE, export_periodically, metrics
+from .pagination import CursorError, page_size_for, result_pages
+from .progress import current_reporter, set_client_log_level
+from .reader import (
+    change_object,
+    item_object,
+    render_change,
+    render_item,
+    render_list,
+    render_spec,
+    render_spec_list,
+    spec_object,
+)
+from .registry import (
+    READ,
+    UNSCHEDULED,
+    WRITE,
+    ToolRegistry,
+    ToolSpec,
+    directory_property,
+    validate_all_properties,
+)
+from .runner import LONG_TIMEOUT, SHORT_TIMEOUT, kill_all, run_command, time_limit
+from .scheduler import scheduler
+from .search import DEFAULT_LIMIT, SearchIndex, format_hits
+from .startup import startup_timer
+from .structured import dumps, parse_cli_json, structured_result
+
+startup_timer.mark("imports")
+
+logger = logging.getLogger(__name__)
+
 # Initialize MCP server
 app = Server("openspec-mcp-x")
 
+NOT_INSTALLED = "❌ OpenSpec is not installed. Please install it manually: npm install -g @fission-ai/openspec"
+
+# "stdio" (one client per process) or "http" (one shared process, see http_transport.py)
+TRANSPORT = os.environ.get("OPENSPEC_MCP_TRANSPORT", "stdio").lower()
+
+BATCH_DEFAULT_CONCURRENCY = 4
+BATCH_MAX_CONCURRENCY = 16
+
+# Text content, or text content plus the structured content it renders
+ToolResult = Union[list[TextContent], tuple[list[TextContent], dict]]
 
-def run_command(cmd: list[str], cwd: Optional[str] = None) -> tuple[bool, str, str]:
-    """Run a shell command and return (success, stdout, stderr)."""
-    try:
-        result = subprocess.run(
-            cmd, cwd=cwd, capture_output=True, text=True, timeout=300
-        )
-        return result.returncode == 0, result.stdout, result.stderr
-    except subprocess.TimeoutExpired:
-        return False, "", "Command timed out after 5 minutes"
-    except Exception as e:
-        return False, "", str(e)
 
+def result_contents(result: ToolResult) -> list[TextContent]:
+    """The text content of a tool result, structured or not."""
+    return result[0] if isinstance(result, tuple) else result
 
-def check_openspec_installed() -> bool:
-    """Check if OpenSpec CLI is installed."""
+
+async def check_openspec_installed() -> bool:
+    """Check if OpenSpec CLI is installed (cached, see detection.py)."""
+    return await detect_openspec() is not None
+
+
+async def run_streaming(cmd: list[str], cwd: Optional[str] = None) -> tuple[bool, str, str]:
+    """run_command that forwards output lines to the client while the command runs."""
+    reporter = current_reporter(app)
     try:
-        result = subprocess.run(
-            ["openspec", "--version"],
-            capture_output=True,
-            text=True,
-        )
-        return result.returncode == 0
-    except Exception:
-        return False
+        return await run_command(cmd, cwd=cwd, on_output=reporter)
+    finally:
+        if reporter is not None:
+            await reporter.flush()
+
+
+async def lookup_cached(
+    tool: str,
+    directory: Optional[str],
+    args: dict,
+    fingerprint: Optional[Hashable] = None,
+    index: Optional[Any] = None,
+) -> tuple[tuple, Hashable, Optional[Any]]:
+    """Look up a read-only tool result, returning (key, fingerprint, cached value or None).
+
+    Pass the workspace ``index`` only once the items the tool reads were checked
+    against the disk (see ``index_registry.get``); its generation then stands
+    for them. Otherwise the whole ``openspec/`` tree is fingerprinted.
+    """
+    workspace = normalize_directory(directory) if directory is not None else None
+    if fingerprint is None and workspace is not None:
+        if index is not None:
+            fingerprint = ("index", index.generation)
+        else:
+            # Walking a large openspec/ tree takes a while; keep it off the event loop
+            fingerprint = await asyncio.to_thread(workspace_fingerprint, workspace)
+    key = result_cache.make_key(tool, workspace, args)
+    return key, fingerprint or "", result_cache.get(key, fingerprint or "")
+
+
+def invalidate_cached(directory: str) -> None:
+    """Drop cached read results for a workspace after a write tool touched it."""
+    result_cache.invalidate(normalize_directory(directory))
+    index_registry.notify_changed(directory)
+
+
+@app.set_logging_level()
+async def handle_set_logging_level(level) -> None:
+    """Remember the lowest log level the client wants streamed output at."""
+    set_client_log_level(app.request_context.session, level)
 
 
 @app.list_tools()
 async def handle_list_tools() -> list[Tool]:
-    """List available tools."""
-    return [
-        Tool(
-            name="check_openspec_status",
-            description=(
-                "Check if OpenSpec is installed and get version information. "
-                "⚠️ Only call this once at the beginning or when user explicitly asks."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": [],
-            },
-        ),
-        Tool(
-            name="openspec_init",
-            description=(
-                "Initialize OpenSpec in a directory. "
-                "This runs: openspec init . --tools cursor"
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "directory": {
-                        "type": "string",
-                        "description": "Directory to initialize OpenSpec (default: current directory)",
-                        "default": ".",
-                    },
-                },
-                "required": [],
-            },
-        ),
-        Tool(
-            name="openspec_update",
-            description=(
-                "Update OpenSpec instruction files. "
-                "This runs: openspec update [path]"
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "directory": {
-                        "type": "string",
-                        "description": "Directory to update (default: current directory)",
-                        "default": ".",
-                    },
-                },
-                "required": [],
-            },
-        ),
-        Tool(
-            name="openspec_list",
-            description=(
-                "List changes or specs. "
-                "This runs: openspec list [--specs|--changes]"
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "directory": {
-                        "type": "string",
-                        "description": "Working directory (default: current directory)",
-                        "default": ".",
-                    },
-                    "type": {
-                        "type": "string",
-                        "enum": ["changes", "specs"],
-                        "description": "List changes or specs (default: changes)",
-                        "default": "changes",
-                    },
-                },
-                "required": [],
-            },
-        ),
-        Tool(
-            name="openspec_show",
-            description=(
-                "Show a change or spec. "
-                "This runs: openspec show [item-name]"
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "directory": {
-                        "type": "string",
-                        "description": "Working directory (default: current directory)",
-                        "default": ".",
-                    },
-                    "item_name": {
-                        "type": "string",
-                        "description": "Name of the change or spec to show",
-                    },
-                    "format": {
-                        "type": "string",
-                        "enum": ["json", "markdown"],
-                        "description": "Output format (optional)",
-                    },
-                },
-                "required": ["item_name"],
-            },
-        ),
-        Tool(
-            name="openspec_change_show",
-            description=(
-                "Show a change proposal in JSON or markdown format. "
-                "This runs: openspec change show [change-name]"
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "directory": {
-                        "type": "string",
-                        "description": "Working directory (default: current directory)",
-                        "default": ".",
-                    },
-                    "change_name": {
-                        "type": "string",
-                        "description": "Name of the change proposal to show",
-                    },
-                    "format": {
-                        "type": "string",
-                        "enum": ["json", "markdown"],
-                        "description": "Output format (optional)",
-                    },
-                },
-                "required": ["change_name"],
-            },
-        ),
-        Tool(
-            name="openspec_change_validate",
-            description=(
-                "Validate a change proposal. "
-                "This runs: openspec change validate [change-name]"
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "directory": {
-                        "type": "string",
-                        "description": "Working directory (default: current directory)",
-                        "default": ".",
-                    },
-                    "change_name": {
-                        "type": "string",
-                        "description": "Name of the change proposal to validate (optional)",
-                    },
-                },
-                "required": [],
-            },
-        ),
-        Tool(
-            name="openspec_spec_show",
-            description=(
-                "Display a specific specification. "
-                "This runs: openspec spec show [spec-id]"
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "directory": {
-                        "type": "string",
-                        "description": "Working directory (default: current directory)",
-                        "default": ".",
-                    },
-                    "spec_id": {
-                        "type": "string",
-                        "description": "ID of the specification to show",
-                    },
-                    "format": {
-                        "type": "string",
-                        "enum": ["json", "markdown"],
-                        "description": "Output format (optional)",
-                    },
-                },
-                "required": ["spec_id"],
-            },
-        ),
-        Tool(
-            name="openspec_spec_list",
-            description=(
-                "List all available specifications. "
-                "This runs: openspec spec list"
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "directory": {
-                        "type": "string",
-                        "description": "Working directory (default: current directory)",
-                        "default": ".",
-                    },
-                },
-                "required": [],
-            },
-        ),
-        Tool(
-            name="openspec_spec_validate",
-            description=(
-                "Validate a specification structure. "
-                "This runs: openspec spec validate [spec-id]"
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "directory": {
-                        "type": "string",
-                        "description": "Working directory (default: current directory)",
-                        "default": ".",
-                    },
-                    "spec_id": {
-                        "type": "string",
-                        "description": "ID of the specification to validate (optional)",
-                    },
-                },
-                "required": [],
-            },
-        ),
-        Tool(
-            name="openspec_validate",
-            description=(
-                "Validate changes and specs. "
-                "This runs: openspec validate [item-name]"
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "directory": {
-                        "type": "string",
-                        "description": "Working directory (default: current directory)",
-                        "default": ".",
-                    },
-                    "item_name": {
-                        "type": "string",
-                        "description": "Name of the item to validate (optional)",
-                    },
-                },
-                "required": [],
-            },
-        ),
-        Tool(
-            name="openspec_archive",
-            description=(
-                "Archive a completed change and update main specs. "
-                "This runs: openspec archive [change-name]"
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "directory": {
-                        "type": "string",
-                        "description": "Working directory (default: current directory)",
-                        "default": ".",
-                    },
-                    "change_name": {
-                        "type": "string",
-                        "description": "Name of the change to archive",
-                    },
-                },
-                "required": ["change_name"],
-            },
-        ),
-        Tool(
-            name="openspec_help",
-            description="Get help information about OpenSpec commands",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "command": {
-                        "type": "string",
-                        "description": "Specific command to get help for (optional)",
-                    },
-                },
-                "required": [],
-            },
-        ),
-    ]
+    """List available tools (built once from the registry)."""
+    return registry.tools
+
+
+try:
+    # The registry's precompiled validators replace the SDK's per-call jsonschema check
+    register_call_tool = app.call_tool(validate_input=False)
+except TypeError:  # older SDKs do not validate input at all
+    register_call_tool = app.call_tool()
 
 
-@app.call_tool()
-async def handle_call_tool(name: str, arguments: dict) -> list[TextContent]:
+@register_call_tool
+async def handle_call_tool(name: str, arguments: dict) -> ToolResult:
     """Handle tool execution requests."""
-    try:
-        if name == "check_openspec_status":
-            return await check_openspec_status(arguments)
-        elif name == "openspec_init":
-            return await openspec_init(arguments)
-        elif name == "openspec_update":
-            return await openspec_update(arguments)
-        elif name == "openspec_list":
-            return await openspec_list(arguments)
-        elif name == "openspec_show":
-            return await openspec_show(arguments)
-        elif name == "openspec_change_show":
-            return await openspec_change_show(arguments)
-        elif name == "openspec_change_validate":
-            return await openspec_change_validate(arguments)
-        elif name == "openspec_spec_show":
-            return await openspec_spec_show(arguments)
-        elif name == "openspec_spec_list":
-            return await openspec_spec_list(arguments)
-        elif name == "openspec_spec_validate":
-            return await openspec_spec_validate(arguments)
-        elif name == "openspec_validate":
-            return await openspec_validate(arguments)
-        elif name == "openspec_archive":
-            return await openspec_archive(arguments)
-        elif name == "openspec_help":
-            return await openspec_help(arguments)
+    started = time.perf_counter()
+    spec = registry.get(name)
+    with metrics.tool_call(name):
+        if spec is not None and spec.access == READ:
+            # Identical read-only calls in flight at the same time share one execution
+            directory = os.path.expanduser(str(arguments.get("directory") or "."))
+            key = result_cache.make_key(name, normalize_directory(directory), arguments)
+            result, spawns_saved = await single_flight.run(
+                key, lambda: call_tool(name, arguments), reporter=current_reporter(app)
+            )
+            if spawns_saved is not None:
+                metrics.record_coalesced(name, spawns_saved)
         else:
-            return [TextContent(type="text", text=f"❌ Unknown tool: {name}")]
-    except Exception as e:
-        return [TextContent(type="text", text=f"❌ Error: {str(e)}")]
+            result = await call_tool(name, arguments)
+    text = "".join(c.text for c in result_contents(result) if isinstance(c, TextContent))
+    metrics.record_call(
+        name,
+        time.perf_counter() - started,
+        error=text.startswith("❌"),
+        bytes_returned=text_size(text),
+    )
+    return result
 
 
-async def check_openspec_status(args: dict) -> list[TextContent]:
-    """Check OpenSpec installation status."""
-    is_installed = check_openspec_installed()
+async def call_tool(name: str, arguments: dict) -> ToolResult:
+    """Run one tool call: validate, serve later pages, schedule on the workspace, dispatch."""
+    spec = registry.get(name)
+    if spec is None:
+        return [TextContent(type="text", text=f"❌ Unknown tool: {name}")]
+    error = spec.validate(arguments)
+    if error is not None:
+        return [TextContent(type="text", text=f"❌ Invalid arguments for {name}: {error}")]
     
-    if is_installed:
-        success, stdout, stderr = run_command(["openspec", "--version"])
-        version_info = stdout.strip() if success else "Unknown"
+    try:
+        arguments = dict(arguments)
+        # Commands the call runs are killed after its timeout (see runner.time_limit)
+        timeout = arguments.pop("timeout", None) or spec.timeout
+        # The client's known version only shapes the response, never what is run or cached
+        if_none_match = arguments.pop("if_none_match", None)
+        since = arguments.pop("since", None)
+        if spec.paginated:
+            page_size = page_size_for(arguments.pop("page_size", None))
+            cursor = arguments.pop("cursor", None)
+            if cursor:
+                # Later pages come from the retained result, not from another CLI run
+                try:
+                    return [TextContent(type="text", text=result_pages.page(cursor, page_size))]
+                except CursorError as e:
+                    return [TextContent(type="text", text=f"❌ {e}. Call the tool again without a cursor.")]
         
-        result = "✅ OpenSpec is installed!\n\n"
-        result += f"📦 Version: {version_info}\n\n"
-        result += "You can now use OpenSpec commands through this MCP server."
-    else:
-        result = "❌ OpenSpec is not installed.\n\n"
-        result += "Please install OpenSpec manually:\n"
-        result += "```bash\n"
-        result += "npm install -g @fission-ai/openspec\n"
-        result += "```\n\n"
-        result += "📝 Note: Node.js and npm are required. Visit https://nodejs.org/ to install.\n"
-    
-    return [TextContent(type="text", text=result)]
+        if spec.access == UNSCHEDULED:
+            with time_limit(timeout):
+                return await dispatch_tool(spec, arguments)
+        
+        # Reads of a workspace share it; writes get it to themselves
+        directory = os.path.expanduser(arguments.get("directory", "."))
+        access = scheduler.writing if spec.access == WRITE else scheduler.reading
+        async with access(directory):
+            with time_limit(timeout):
+                contents = await dispatch_tool(spec, arguments)
+        
+        # Structured results are narrowed with 'fields' rather than paged
+        if not isinstance(contents, list) or len(contents) != 1:
+            return contents
+        text = contents[0].text
+        page = (lambda body: result_pages.first_page(body, page_size)) if spec.paginated else None
+        if spec.versioned and not text.startswith("❌"):
+            # The ETag goes on the first page, after paging, so the full text is not copied for it
+            return [TextContent(type="text", text=versioned_response(text, if_none_match, since, page))]
+        if page is not None:
+            return [TextContent(type="text", text=page(text))]
+        return contents
+    except Exception as e:
+        return [TextContent(type="text", text=f"❌ Error: {str(e)}")]
 
 
-async def openspec_init(args: dict) -> list[TextContent]:
-    """Initialize OpenSpec in a directory."""
-    directory = os.path.expanduser(args.get("directory", "."))
-    
-    if not check_openspec_installed():
-        return [TextContent(
-            type="text",
-            text="❌ OpenSpec is not installed. Please install it manually: npm install -g @fission-ai/openspec"
-        )]
-    
-    if not os.path.exists(directory):
-        return [TextContent(type="text", text=f"❌ Directory not found: {directory}")]
-    
-    # Use --tools cursor to configure for cursor non-interactively
-    cmd = ["openspec", "init", ".", "--tools", "cursor"]
-    success, stdout, stderr = run_command(cmd, cwd=directory)
-    
-    if success:
-        result = f"✅ OpenSpec initialized in: {directory}\n\n{stdout}"
-        result += "\n\n📋 Next steps:\n"
-        result += "1. Use 'openspec_list' to list changes and specs\n"
-        result += "2. Use 'openspec_change_show' to view change proposals\n"
-        result += "3. Use 'openspec_validate' to validate your work\n"
-    else:
-        result = f"❌ Initialization failed:\n\n{stderr}"
-    
-    return [TextContent(type="text", text=result)]
+async def dispatch_tool(spec: ToolSpec, arguments: dict) -> ToolResult:
+    """Route a tool call to its custom handler, or run it as a declared CLI command."""
+    if spec.handler is not None:
+        return await spec.handler(arguments)
+    return await run_cli_tool(spec, arguments)
 
 
-async def openspec_update(args: dict) -> list[TextContent]:
-    """Update OpenSpec instruction files."""
+async def run_cli_tool(spec: ToolSpec, args: dict) -> ToolResult:
+    """Run a tool declared by its CLI argv: result cache, native reader, then the CLI."""
+    if spec.structured is not None and (args.get("structured") or args.get("fields")):
+        return await run_structured(spec, args)
     directory = os.path.expanduser(args.get("directory", "."))
+    values = spec.values(args, directory=directory)
     
-    if not check_openspec_installed():
-        return [TextContent(
-            type="text",
-            text="❌ OpenSpec is not installed. Please install it manually: npm install -g @fission-ai/openspec"
-        )]
-    
-    if not os.path.exists(directory):
-        return [TextContent(type="text", text=f"❌ Directory not found: {directory}")]
-    
-    cmd = ["openspec", "update", "."]
-    success, stdout, stderr = run_command(cmd, cwd=directory)
-    
-    if success:
-        result = f"✅ OpenSpec instruction files updated!\n\n{stdout}"
-    else:
-        result = f"❌ Update failed:\n\n{stderr}"
-    
-    return [TextContent(type="text", text=result)]
-
-
-async def openspec_list(args: dict) -> list[TextContent]:
-    """List changes or specs."""
-    directory = os.path.expanduser(args.get("directory", "."))
-    list_type = args.get("type", "changes")
+    if spec.cached:
+        index = await index_registry.get(directory, **spec.reads(values)) if spec.reads is not None else None
+        cache_key, fingerprint, cached = await lookup_cached(spec.name, directory, args, index=index)
+        if cached is not None:
+            return [TextContent(type="text", text=cached)]
+        
+        if spec.native is not None:
+            native = spec.native(index, values)
+            if native is not None:
+                result = spec.message(spec.ok, values, native)
+                result_cache.put(cache_key, fingerprint, result)
+                return [TextContent(type="text", text=result)]
     
-    if not check_openspec_installed():
-        return [TextContent(
-            type="text",
-            text="❌ OpenSpec is not installed. Please install it manually: npm install -g @fission-ai/openspec"
-        )]
+    if not await check_openspec_installed():
+        return [TextContent(type="text", text=NOT_INSTALLED)]
     
     if not os.path.exists(directory):
         return [TextContent(type="text", text=f"❌ Directory not found: {directory}")]
     
-    cmd = ["openspec", "list"]
-    if list_type == "specs":
-        cmd.append("--specs")
-    elif list_type == "changes":
-        cmd.append("--changes")
+    if spec.validates and args.get("all"):
+        return await validate_workspace(directory, spec.validates, args)
     
-    success, stdout, stderr = run_command(cmd, cwd=directory)
+    cmd = ["openspec", *spec.command(values)]
+    if spec.validates:
+        kind = spec.validates[0] if len(spec.validates) == 1 else None
+        success, stdout, stderr = await run_validation(directory, kind, values.get(spec.item_arg), cmd, args)
+    elif spec.streams:
+        success, stdout, stderr = await run_streaming(cmd, cwd=directory)
+    else:
+        success, stdout, stderr = await run_command(cmd, cwd=directory)
+    if spec.access == WRITE:
+        invalidate_cached(directory)
     
     if success:
-        result = f"✅ List of {list_type}:\n\n{stdout}"
+        result = spec.message(spec.ok, values, stdout)
+        if spec.cached:
+            result_cache.put(cache_key, fingerprint, result)
     else:
-        result = f"❌ Failed to list {list_type}:\n\n{stderr}"
+        result = spec.message(spec.failed, values, stderr)
     
     return [TextContent(type="text", text=result)]
 
 
-async def openspec_show(args: dict) -> list[TextContent]:
-    """Show a change or spec."""
+async def run_structured(spec: ToolSpec, args: dict) -> ToolResult:
+    """Structured mode: the item's JSON view, parsed once and cached, then projected to 'fields'."""
     directory = os.path.expanduser(args.get("directory", "."))
-    item_name = args.get("item_name")
-    format_type = args.get("format")
-    
-    if not check_openspec_installed():
-        return [TextContent(
-            type="text",
-            text="❌ OpenSpec is not installed. Please install it manually: npm install -g @fission-ai/openspec"
-        )]
-    
-    if not os.path.exists(directory):
-        return [TextContent(type="text", text=f"❌ Directory not found: {directory}")]
-    
-    cmd = ["openspec", "show", item_name, "--no-interactive"]
-    if format_type == "json":
-        cmd.append("--json")
-    
-    success, stdout, stderr = run_command(cmd, cwd=directory)
-    
-    if success:
-        result = f"✅ Item: {item_name}\n\n{stdout}"
-    else:
-        result = f"❌ Failed to show item:\n\n{stderr}"
-    
-    return [TextContent(type="text", text=result)]
+    values = spec.values(args, directory=directory, format="json")
+    
+    # Every projection of the same item shares one cached object
+    item_args = {k: v for k, v in args.items() if k not in ("structured", "fields", "format")}
+    index = await index_registry.get(directory, **spec.reads(values)) if spec.reads is not None else None
+    cache_key, fingerprint, data = await lookup_cached(spec.name + ":json", directory, item_args, index=index)
+    
+    if data is None:
+        data = spec.structured(index, values)
+        size = None
+        if data is None:
+            if not await check_openspec_installed():
+                return [TextContent(type="text", text=NOT_INSTALLED)]
+            if not os.path.exists(directory):
+                return [TextContent(type="text", text=f"❌ Directory not found: {directory}")]
+            success, stdout, stderr = await run_command(["openspec", *spec.command(values)], cwd=directory)
+            if not success:
+                return [TextContent(type="text", text=spec.message(spec.failed, values, stderr))]
+            try:
+                data = parse_cli_json(stdout)
+            except ValueError as e:
+                return [TextContent(type="text", text=f"❌ Could not parse JSON from the OpenSpec CLI: {e}")]
+            size = text_size(stdout)
+        result_cache.put(cache_key, fingerprint, data, size=size or text_size(dumps(data)))
+    
+    structured = structured_result(data, args.get("fields"))
+    return [TextContent(type="text", text=dumps(structured))], structured
 
 
-async def openspec_change_show(args: dict) -> list[TextContent]:
-    """Show a change proposal."""
-    directory = os.path.expanduser(args.get("directory", "."))
-    change_name = args.get("change_name")
-    format_type = args.get("format")
-    
-    if not check_openspec_installed():
-        return [TextContent(
-            type="text",
-            text="❌ OpenSpec is not installed. Please install it manually: npm install -g @fission-ai/openspec"
-        )]
-    
-    if not os.path.exists(directory):
-        return [TextContent(type="text", text=f"❌ Directory not found: {directory}")]
-    
-    cmd = ["openspec", "change", "show", change_name, "--no-interactive"]
-    if format_type == "json":
-        cmd.append("--json")
-    
-    success, stdout, stderr = run_command(cmd, cwd=directory)
+async def check_openspec_status(args: dict) -> list[TextContent]:
+    """Check OpenSpec installation status."""
+    installation = await detect_openspec()
     
-    if success:
-        result = f"✅ Change proposal: {change_name}\n\n{stdout}"
+    if installation is not None:
+        result = "✅ OpenSpec is installed!\n\n"
+        result += f"📦 Version: {installation.version}\n"
+        result += f"📍 Path: {installation.path}\n\n"
+        result += "You can now use OpenSpec commands through this MCP server."
     else:
-        result = f"❌ Failed to show change:\n\n{stderr}"
+        result = "❌ OpenSpec is not installed.\n\n"
+        result += "Please install OpenSpec manually:\n"
+        result += "```bash\n"
+        result += "npm install -g @fission-ai/openspec\n"
+        result += "```\n\n"
+        result += "📝 Note: Node.js and npm are required. Visit https://nodejs.org/ to install.\n"
     
     return [TextContent(type="text", text=result)]
 
 
-async def openspec_change_validate(args: dict) -> list[TextContent]:
-    """Validate a change proposal."""
-    directory = os.path.expanduser(args.get("directory", "."))
-    change_name = args.get("change_name")
-    
-    if not check_openspec_installed():
-        return [TextContent(
-            type="text",
-            text="❌ OpenSpec is not installed. Please install it manually: npm install -g @fission-ai/openspec"
-        )]
-    
-    if not os.path.exists(directory):
-        return [TextContent(type="text", text=f"❌ Directory not found: {directory}")]
-    
-    cmd = ["openspec", "change", "validate", "--no-interactive"]
-    if change_name:
-        cmd.insert(3, change_name)  # Insert before --no-interactive
-    
-    success, stdout, stderr = run_command(cmd, cwd=directory)
-    
-    if success:
-        result = f"✅ Change validation successful!\n\n{stdout}"
-    else:
-        result = f"❌ Change validation failed:\n\n{stderr}"
-    
-    return [TextContent(type="text", text=result)]
+async def run_validation(
+    directory: str, kind: Optional[str], name: Optional[str], cmd: list[str], args: dict
+) -> tuple[bool, str, str]:
+    """Validate one item, skipping the CLI when it is unchanged since it last validated cleanly."""
+    from .validation import item_hash, validate_one, validation_cache
+    
+    index = await index_registry.get(directory, specs=[name], changes=[name]) if name else None
+    if index is not None and kind is None:
+        # openspec validate <item> accepts either kind; only cache unambiguous names
+        is_spec = index.read_spec(name) is not None
+        is_change = index.read_change(name) is not None
+        kind = "spec" if is_spec and not is_change else "change" if is_change and not is_spec else None
+    if index is None or kind is None:
+        return await run_streaming(cmd, cwd=directory)
+    
+    installation = await detect_openspec()
+    content_hash = item_hash(index, kind, name, installation.version if installation else "")
+    reporter = current_reporter(app)
+    try:
+        result = await validate_one(
+            kind,
+            name,
+            directory,
+            cmd=cmd,
+            content_hash=content_hash,
+            force=bool(args.get("force")),
+            on_output=reporter,
+        )
+    finally:
+        if reporter is not None:
+            await reporter.flush()
+    validation_cache.save()
+    if result.success:
+        return True, f"{result.output}\n", ""
+    return False, "", f"{result.output}\n"
 
 
-async def openspec_spec_show(args: dict) -> list[TextContent]:
-    """Display a specific specification."""
-    directory = os.path.expanduser(args.get("directory", "."))
-    spec_id = args.get("spec_id")
-    format_type = args.get("format")
-    
-    if not check_openspec_installed():
-        return [TextContent(
-            type="text",
-            text="❌ OpenSpec is not installed. Please install it manually: npm install -g @fission-ai/openspec"
-        )]
-    
-    if not os.path.exists(directory):
-        return [TextContent(type="text", text=f"❌ Directory not found: {directory}")]
-    
-    cmd = ["openspec", "spec", "show", spec_id, "--no-interactive"]
-    if format_type == "json":
-        cmd.append("--json")
-    
-    success, stdout, stderr = run_command(cmd, cwd=directory)
-    
-    if success:
-        result = f"✅ Specification: {spec_id}\n\n{stdout}"
-    else:
-        result = f"❌ Failed to show spec:\n\n{stderr}"
+async def validate_workspace(directory: str, kinds: tuple[str, ...], args: dict) -> list[TextContent]:
+    """Validate every spec and/or change of a workspace in parallel."""
+    from .validation import (
+        DEFAULT_WORKERS,
+        format_report,
+        format_result_line,
+        item_hash,
+        list_items,
+        validate_all,
+    )
+    
+    index = await index_registry.get(directory, specs="spec" in kinds, changes="change" in kinds)
+    if index is None:
+        # Unknown layout: let the CLI enumerate the items itself
+        flag = "--all" if len(kinds) > 1 else ("--specs" if kinds == ("spec",) else "--changes")
+        success, stdout, stderr = await run_streaming(
+            ["openspec", "validate", flag, "--no-interactive"], cwd=directory
+        )
+        if success:
+            return [TextContent(type="text", text=f"✅ Validation successful!\n\n{stdout}")]
+        return [TextContent(type="text", text=f"❌ Validation failed:\n\n{stderr or stdout}")]
+    
+    items = list_items(index, kinds)
+    workers = max(1, int(args.get("max_workers") or DEFAULT_WORKERS))
+    started = time.perf_counter()
+    installation = await detect_openspec()
+    version = installation.version if installation is not None else ""
+    hashes = await asyncio.to_thread(
+        lambda: {(kind, name): item_hash(index, kind, name, version) for kind, name in items}
+    )
+    reporter = current_reporter(app)
+    
+    async def report_result(result) -> None:
+        if reporter is not None:
+            await reporter.message(format_result_line(result))
     
-    return [TextContent(type="text", text=result)]
+    try:
+        results = await validate_all(
+            items,
+            directory,
+            max_workers=workers,
+            hashes=hashes,
+            force=bool(args.get("force")),
+            on_result=report_result,
+        )
+    finally:
+        if reporter is not None:
+            await reporter.flush()
+    report = format_report(results, min(workers, len(items)) or 1, time.perf_counter() - started)
+    return [TextContent(type="text", text=report)]
 
 
-async def openspec_spec_list(args: dict) -> list[TextContent]:
-    """List all available specifications."""
-    directory = os.path.expanduser(args.get("directory", "."))
-    
-    if not check_openspec_installed():
-        return [TextContent(
-            type="text",
-            text="❌ OpenSpec is not installed. Please install it manually: npm install -g @fission-ai/openspec"
-        )]
-    
+async def openspec_archive(args: dict) -> list[TextContent]:
+    """Archive one change through the CLI, or a list of them as one checked, ordered pass."""
+    names = list(dict.fromkeys(args.get("change_names") or []))
+    if args.get("change_name") and args["change_name"] not in names:
+        names.insert(0, args["change_name"])
+    if not names:
+        return [TextContent(type="text", text="❌ Provide change_name or change_names")]
+    if len(names) == 1 and not args.get("change_names"):
+        return await run_cli_tool(registry.specs["openspec_archive"], args)
+    return await archive_changes(os.path.expanduser(args.get("directory", ".")), names, args)
+
+
+async def archive_changes(directory: str, names: list[str], args: dict) -> list[TextContent]:
+    """Bulk archive: check existence, conflicts and validity of every change, then archive in order."""
+    from .validation import (
+        DEFAULT_WORKERS,
+        format_report,
+        format_result_line,
+        item_hash,
+        validate_all,
+    )
+    
+    if not await check_openspec_installed():
+        return [TextContent(type="text", text=NOT_INSTALLED)]
     if not os.path.exists(directory):
         return [TextContent(type="text", text=f"❌ Directory not found: {directory}")]
+    index = await index_registry.get(directory, changes=names)
+    if index is None:
+        return [TextContent(type="text", text=f"❌ No OpenSpec workspace found in: {directory}")]
     
-    cmd = ["openspec", "spec", "list"]
-    success, stdout, stderr = run_command(cmd, cwd=directory)
+    unknown = [name for name in names if index.read_change(name) is None]
+    if unknown:
+        return [TextContent(type="text", text=f"❌ Nothing archived. Not active changes: {', '.join(unknown)}")]
     
-    if success:
-        result = f"✅ Available specifications:\n\n{stdout}"
-    else:
-        result = f"❌ Failed to list specs:\n\n{stderr}"
+    conflicts = find_conflicts(ImpactIndex.for_workspace(index), names)
+    if conflicts:
+        return [TextContent(type="text", text=format_conflicts(conflicts))]
     
-    return [TextContent(type="text", text=result)]
+    started = time.perf_counter()
+    reporter = current_reporter(app)
+    try:
+        installation = await detect_openspec()
+        version = installation.version if installation is not None else ""
+        items = [("change", name) for name in names]
+        hashes = await asyncio.to_thread(
+            lambda: {(kind, name): item_hash(index, kind, name, version) for kind, name in items}
+        )
+        
+        async def report_validation(result) -> None:
+            if reporter is not None:
+                await reporter.message(format_result_line(result))
+        
+        workers = max(1, int(args.get("max_workers") or DEFAULT_WORKERS))
+        results = await validate_all(
+            items, directory, max_workers=workers, hashes=hashes, on_result=report_validation
+        )
+        if not all(result.success for result in results):
+            report = format_report(results, min(workers, len(items)), time.perf_counter() - started)
+            return [TextContent(type="text", text=f"❌ Nothing archived: validation failed\n\n{report}")]
+        
+        steps = [ArchiveStep(name, SKIPPED) for name in names]
+        try:
+            for step in steps:
+                step_started = time.perf_counter()
+                success, stdout, stderr = await run_command(
+                    ["openspec", "archive", step.name, "-y"], cwd=directory, on_output=reporter
+                )
+                step.duration = time.perf_counter() - step_started
+                step.status = ARCHIVED if success else FAILED
+                step.output = stdout if success else stderr or stdout
+                if reporter is not None:
+                    await reporter.message(format_step(step))
+                if not success:
+                    break
+        finally:
+            invalidate_cached(directory)
+    finally:
+        if reporter is not None:
+            await reporter.flush()
+    return [TextContent(type="text", text=format_archive_report(steps, time.perf_counter() - started))]
 
 
-async def openspec_spec_validate(args: dict) -> list[TextContent]:
-    """Validate a specification structure."""
+async def openspec_search(args: dict) -> list[TextContent]:
+    """Search specs and changes through the workspace's inverted index."""
     directory = os.path.expanduser(args.get("directory", "."))
-    spec_id = args.get("spec_id")
-    
-    if not check_openspec_installed():
-        return [TextContent(
-            type="text",
-            text="❌ OpenSpec is not installed. Please install it manually: npm install -g @fission-ai/openspec"
-        )]
+    query = args.get("query") or ""
+    scope = args.get("scope", "all")
+    limit = int(args.get("limit") or DEFAULT_LIMIT)
     
     if not os.path.exists(directory):
         return [TextContent(type="text", text=f"❌ Directory not found: {directory}")]
     
-    cmd = ["openspec", "spec", "validate", "--no-interactive"]
-    if spec_id:
-        cmd.insert(3, spec_id)  # Insert before --no-interactive
-    
-    success, stdout, stderr = run_command(cmd, cwd=directory)
+    index = await index_registry.get(directory, specs=scope != "changes", changes=scope != "specs")
+    if index is None:
+        return [TextContent(type="text", text=f"❌ No OpenSpec workspace found in: {directory}")]
     
-    if success:
-        result = f"✅ Spec validation successful!\n\n{stdout}"
-    else:
-        result = f"❌ Spec validation failed:\n\n{stderr}"
-    
-    return [TextContent(type="text", text=result)]
+    hits = SearchIndex.for_workspace(index).search(query, scope=scope, limit=limit)
+    return [TextContent(type="text", text=format_hits(query, hits))]
 
 
-async def openspec_archive(args: dict) -> list[TextContent]:
-    """Archive a completed change and update main specs."""
+async def openspec_impact(args: dict) -> list[TextContent]:
+    """Answer change/spec/requirement impact queries from the workspace's dependency index."""
     directory = os.path.expanduser(args.get("directory", "."))
-    change_name = args.get("change_name")
+    change = args.get("change_name")
+    spec = args.get("spec_id")
+    requirement = args.get("requirement")
     
-    if not check_openspec_installed():
-        return [TextContent(
-            type="text",
-            text="❌ OpenSpec is not installed. Please install it manually: npm install -g @fission-ai/openspec"
-        )]
+    if requirement and not spec:
+        return [TextContent(type="text", text="❌ 'requirement' needs 'spec_id' to say which spec it belongs to")]
     
     if not os.path.exists(directory):
         return [TextContent(type="text", text=f"❌ Directory not found: {directory}")]
     
-    # Use -y to skip confirmation prompts
-    cmd = ["openspec", "archive", change_name, "-y"]
-    success, stdout, stderr = run_command(cmd, cwd=directory)
-    
-    if success:
-        result = f"✅ Change archived successfully: {change_name}\n\n{stdout}"
-    else:
-        result = f"❌ Archive failed:\n\n{stderr}"
+    index = await index_registry.get(directory, changes=True)
+    if index is None:
+        return [TextContent(type="text", text=f"❌ No OpenSpec workspace found in: {directory}")]
     
+    render = impact_json if args.get("format") == "json" else impact_report
+    result = render(ImpactIndex.for_workspace(index), change=change, spec=spec, requirement=requirement)
+    if result is None:
+        return [TextContent(type="text", text=f"❌ No active change named: {change}")]
     return [TextContent(type="text", text=result)]
 
 
-async def openspec_validate(args: dict) -> list[TextContent]:
-    """Validate changes and specs."""
-    directory = os.path.expanduser(args.get("directory", "."))
-    item_name = args.get("item_name")
-    
-    if not check_openspec_installed():
-        return [TextContent(
-            type="text",
-            text="❌ OpenSpec is not installed. Please install it manually: npm install -g @fission-ai/openspec"
-        )]
-    
-    if not os.path.exists(directory):
-        return [TextContent(type="text", text=f"❌ Directory not found: {directory}")]
-    
-    cmd = ["openspec", "validate", "--no-interactive"]
-    if item_name:
-        cmd.insert(2, item_name)  # Insert before --no-interactive
-    
-    success, stdout, stderr = run_command(cmd, cwd=directory)
-    
-    if success:
-        result = f"✅ Validation successful!\n\n{stdout}"
+def batch_tool(operation: Any) -> Optional[str]:
+    """Tool name of a batch operation, or None if it does not name one."""
+    tool = operation.get("tool") if isinstance(operation, dict) else None
+    return tool if isinstance(tool, str) else None
+
+
+def batch_operation_error(operation: Any, known_tools: set[str]) -> Optional[str]:
+    """Why a batch operation cannot run, or None if it can.
+
+    The schema of ``operations`` items is not enforced by the registry
+    validator, so each operation is checked here.
+    """
+    if not isinstance(operation, dict):
+        return f"❌ Batch operation must be an object, got {type(operation).__name__}"
+    tool = batch_tool(operation)
+    if tool not in known_tools:
+        return f"❌ Unknown or unsupported tool in batch: {operation.get('tool')}"
+    arguments = operation.get("arguments")
+    if arguments is not None and not isinstance(arguments, dict):
+        return f"❌ Arguments for {tool} must be an object, got {type(arguments).__name__}"
+    return None
+
+
+async def openspec_batch(args: dict) -> list[TextContent]:
+    """Run several tool calls and return all results in one structured response."""
+    operations = args.get("operations") or []
+    limit = int(args.get("max_concurrency") or BATCH_DEFAULT_CONCURRENCY)
+    semaphore = asyncio.Semaphore(max(1, min(limit, BATCH_MAX_CONCURRENCY)))
+    known_tools = set(registry.specs) - {"openspec_batch"}
+    results: list[Optional[dict]] = [None] * len(operations)
+    
+    async def run_one(position: int, operation: Any) -> None:
+        tool = batch_tool(operation)
+        error = batch_operation_error(operation, known_tools)
+        if error is not None:
+            # A malformed operation fails on its own; the rest of the batch still runs
+            results[position] = {
+                "index": position,
+                "tool": tool,
+                "status": "error",
+                "duration_ms": 0.0,
+                "output": error,
+            }
+            return
+        async with semaphore:
+            started = time.perf_counter()
+            result = await handle_call_tool(tool, dict(operation.get("arguments") or {}))
+            elapsed = time.perf_counter() - started
+        output = "\n".join(c.text for c in result_contents(result) if isinstance(c, TextContent))
+        results[position] = {
+            "index": position,
+            "tool": tool,
+            "status": "error" if output.startswith("❌") else "ok",
+            "duration_ms": round(elapsed * 1000, 3),
+            "output": output,
+        }
+    
+    # Consecutive reads run together; each write is a barrier on both sides
+    started = time.perf_counter()
+    pending: list[asyncio.Task] = []
+    for position, operation in enumerate(operations):
+        if batch_tool(operation) in WRITE_TOOLS:
+            await asyncio.gather(*pending)
+            pending = []
+            await run_one(position, operation)
+        else:
+            pending.append(asyncio.create_task(run_one(position, operation)))
+    await asyncio.gather(*pending)
+    
+    report = {
+        "total": len(results),
+        "succeeded": sum(1 for r in results if r["status"] == "ok"),
+        "failed": sum(1 for r in results if r["status"] == "error"),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        "results": results,
+    }
+    return [TextContent(type="text", text=json.dumps(report, indent=2, ensure_ascii=False))]
+
+
+async def openspec_metrics(args: dict) -> list[TextContent]:
+    """Report the server's built-in metrics."""
+    if args.get("format") == "prometheus":
+        result = metrics.prometheus()
     else:
-        result = f"❌ Validation failed:\n\n{stderr}"
-    
+        result = json.dumps(metrics.snapshot(), indent=2)
+    if args.get("reset"):
+        metrics.reset()
     return [TextContent(type="text", text=result)]
 
 
@@ -692,41 +647,501 @@ async def openspec_help(args: dict) -> list[TextContent]:
     """Get OpenSpec help information."""
     command = args.get("command")
     
-    if not check_openspec_installed():
-        return [TextContent(
-            type="text",
-            text="❌ OpenSpec is not installed. Please install it manually: npm install -g @fission-ai/openspec"
-        )]
+    installation = await detect_openspec()
+    if installation is None:
+        return [TextContent(type="text", text=NOT_INSTALLED)]
+    
+    # Help text only depends on the CLI itself, not on any workspace
+    cache_key, fingerprint, cached = await lookup_cached(
+        "openspec_help", None, args, fingerprint=(installation.path, installation.version)
+    )
+    if cached is not None:
+        return [TextContent(type="text", text=cached)]
     
     cmd = ["openspec", "--help"]
     if command:
         cmd = ["openspec", command, "--help"]
     
-    success, stdout, stderr = run_command(cmd)
+    success, stdout, stderr = await run_command(cmd)
     
     if success:
         result = f"📖 OpenSpec Help:\n\n```\n{stdout}\n```"
+        result_cache.put(cache_key, fingerprint, result)
     else:
         result = f"❌ Failed to get help:\n\n{stderr}"
     
     return [TextContent(type="text", text=result)]
 
 
+registry = ToolRegistry([
+    ToolSpec(
+        name="check_openspec_status",
+        description=(
+            "Check if OpenSpec is installed and get version information. "
+            "⚠️ Only call this once at the beginning or when user explicitly asks."
+        ),
+        access=UNSCHEDULED,
+        handler=check_openspec_status,
+    ),
+    ToolSpec(
+        name="openspec_init",
+        description=(
+            "Initialize OpenSpec in a directory. "
+            "This runs: openspec init . --tools cursor"
+        ),
+        properties=directory_property("Directory to initialize OpenSpec (default: current directory)"),
+        access=WRITE,
+        streams=True,
+        timeout=LONG_TIMEOUT,
+        # Use --tools cursor to configure for cursor non-interactively
+        argv=("init", ".", "--tools", "cursor"),
+        ok=(
+            "✅ OpenSpec initialized in: {directory}\n\n{output}"
+            "\n\n📋 Next steps:\n"
+            "1. Use 'openspec_list' to list changes and specs\n"
+            "2. Use 'openspec_change_show' to view change proposals\n"
+            "3. Use 'openspec_validate' to validate your work\n"
+        ),
+        failed="❌ Initialization failed:\n\n{output}",
+    ),
+    ToolSpec(
+        name="openspec_update",
+        description=(
+            "Update OpenSpec instruction files. "
+            "This runs: openspec update [path]"
+        ),
+        properties=directory_property("Directory to update (default: current directory)"),
+        access=WRITE,
+        streams=True,
+        timeout=LONG_TIMEOUT,
+        argv=("update", "."),
+        ok="✅ OpenSpec instruction files updated!\n\n{output}",
+        failed="❌ Update failed:\n\n{output}",
+    ),
+    ToolSpec(
+        name="openspec_list",
+        description=(
+            "List changes or specs. "
+            "This runs: openspec list [--specs|--changes]"
+        ),
+        properties={
+            **directory_property(),
+            "type": {
+                "type": "string",
+                "enum": ["changes", "specs"],
+                "description": "List changes or specs (default: changes)",
+                "default": "changes",
+            },
+        },
+        argv=("list", {"type": {"specs": "--specs", "changes": "--changes"}}),
+        ok="✅ List of {type}:\n\n{output}",
+        failed="❌ Failed to list {type}:\n\n{output}",
+        native=lambda index, values: render_list(index, values["type"]),
+        reads=lambda values: {"specs": True} if values["type"] == "specs" else {"changes": True},
+        cached=True,
+        paginated=True,
+        timeout=SHORT_TIMEOUT,
+    ),
+    ToolSpec(
+        name="openspec_show",
+        description=(
+            "Show a change or spec. "
+            "This runs: openspec show [item-name]"
+        ),
+        properties={
+            **directory_property(),
+            "item_name": {
+                "type": "string",
+                "description": "Name of the change or spec to show",
+            },
+            "format": {
+                "type": "string",
+                "enum": ["json", "markdown"],
+                "description": "Output format (optional)",
+            },
+        },
+        required=("item_name",),
+        argv=("show", "{item_name}", "--no-interactive", {"format": {"json": "--json"}}),
+        ok="✅ Item: {item_name}\n\n{output}",
+        failed="❌ Failed to show item:\n\n{output}",
+        native=lambda index, values: render_item(index, values["item_name"], values["format"] or None),
+        reads=lambda values: {"specs": [values["item_name"]], "changes": [values["item_name"]]},
+        structured=lambda index, values: item_object(index, values["item_name"]),
+        versioned=True,
+        cached=True,
+        paginated=True,
+        timeout=SHORT_TIMEOUT,
+    ),
+    ToolSpec(
+        name="openspec_change_show",
+        description=(
+            "Show a change proposal in JSON or markdown format. "
+            "This runs: openspec change show [change-name]"
+        ),
+        properties={
+            **directory_property(),
+            "change_name": {
+                "type": "string",
+                "description": "Name of the change proposal to show",
+            },
+            "format": {
+                "type": "string",
+                "enum": ["json", "markdown"],
+                "description": "Output format (optional)",
+            },
+        },
+        required=("change_name",),
+        argv=("change", "show", "{change_name}", "--no-interactive", {"format": {"json": "--json"}}),
+        ok="✅ Change proposal: {change_name}\n\n{output}",
+        failed="❌ Failed to show change:\n\n{output}",
+        native=lambda index, values: render_change(index, values["change_name"], values["format"] or None),
+        reads=lambda values: {"changes": [values["change_name"]]},
+        structured=lambda index, values: change_object(index, values["change_name"]),
+        versioned=True,
+        cached=True,
+        paginated=True,
+        timeout=SHORT_TIMEOUT,
+    ),
+    ToolSpec(
+        name="openspec_change_validate",
+        description=(
+            "Validate a change proposal. "
+            "This runs: openspec change validate [change-name]"
+        ),
+        properties={
+            **directory_property(),
+            "change_name": {
+                "type": "string",
+                "description": "Name of the change proposal to validate (optional)",
+            },
+            **validate_all_properties("active change"),
+        },
+        streams=True,
+        timeout=LONG_TIMEOUT,
+        argv=("change", "validate", "{change_name}", "--no-interactive"),
+        ok="✅ Change validation successful!\n\n{output}",
+        failed="❌ Change validation failed:\n\n{output}",
+        validates=("change",),
+        item_arg="change_name",
+    ),
+    ToolSpec(
+        name="openspec_spec_show",
+        description=(
+            "Display a specific specification. "
+            "This runs: openspec spec show [spec-id]"
+        ),
+        properties={
+            **directory_property(),
+            "spec_id": {
+                "type": "string",
+                "description": "ID of the specification to show",
+            },
+            "format": {
+                "type": "string",
+                "enum": ["json", "markdown"],
+                "description": "Output format (optional)",
+            },
+        },
+        required=("spec_id",),
+        argv=("spec", "show", "{spec_id}", "--no-interactive", {"format": {"json": "--json"}}),
+        ok="✅ Specification: {spec_id}\n\n{output}",
+        failed="❌ Failed to show spec:\n\n{output}",
+        native=lambda index, values: render_spec(index, values["spec_id"], values["format"] or None),
+        reads=lambda values: {"specs": [values["spec_id"]]},
+        structured=lambda index, values: spec_object(index, values["spec_id"]),
+        versioned=True,
+        cached=True,
+        paginated=True,
+        timeout=SHORT_TIMEOUT,
+    ),
+    ToolSpec(
+        name="openspec_spec_list",
+        description=(
+            "List all available specifications. "
+            "This runs: openspec spec list"
+        ),
+        properties=directory_property(),
+        argv=("spec", "list"),
+        ok="✅ Available specifications:\n\n{output}",
+        failed="❌ Failed to list specs:\n\n{output}",
+        native=lambda index, values: render_spec_list(index),
+        reads=lambda values: {"specs": True},
+        cached=True,
+        paginated=True,
+        timeout=SHORT_TIMEOUT,
+    ),
+    ToolSpec(
+        name="openspec_spec_validate",
+        description=(
+            "Validate a specification structure. "
+            "This runs: openspec spec validate [spec-id]"
+        ),
+        properties={
+            **directory_property(),
+            "spec_id": {
+                "type": "string",
+                "description": "ID of the specification to validate (optional)",
+            },
+            **validate_all_properties("spec"),
+        },
+        streams=True,
+        timeout=LONG_TIMEOUT,
+        argv=("spec", "validate", "{spec_id}", "--no-interactive"),
+        ok="✅ Spec validation successful!\n\n{output}",
+        failed="❌ Spec validation failed:\n\n{output}",
+        validates=("spec",),
+        item_arg="spec_id",
+    ),
+    ToolSpec(
+        name="openspec_validate",
+        description=(
+            "Validate changes and specs. "
+            "This runs: openspec validate [item-name]"
+        ),
+        properties={
+            **directory_property(),
+            "item_name": {
+                "type": "string",
+                "description": "Name of the item to validate (optional)",
+            },
+            **validate_all_properties("spec and active change"),
+        },
+        streams=True,
+        timeout=LONG_TIMEOUT,
+        argv=("validate", "{item_name}", "--no-interactive"),
+        ok="✅ Validation successful!\n\n{output}",
+        failed="❌ Validation failed:\n\n{output}",
+        validates=("spec", "change"),
+        item_arg="item_name",
+    ),
+    ToolSpec(
+        name="openspec_archive",
+        description=(
+            "Archive a completed change (or several, with change_names) and update main specs. "
+            "This runs: openspec archive [change-name]"
+        ),
+        properties={
+            **directory_property(),
+            "change_name": {
+                "type": "string",
+                "description": "Name of the change to archive",
+            },
+            "change_names": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": (
+                    "Archive several changes in this order. All are checked first (they must exist, "
+                    "validate, and not modify the same requirement); the pass stops at the first failure"
+                ),
+            },
+            "max_workers": {
+                "type": "integer",
+                "description": "Maximum parallel validations before a bulk archive (default: number of CPU cores)",
+            },
+        },
+        access=WRITE,
+        handler=openspec_archive,
+        streams=True,
+        timeout=LONG_TIMEOUT,
+        # Use -y to skip confirmation prompts
+        argv=("archive", "{change_name}", "-y"),
+        ok="✅ Change archived successfully: {change_name}\n\n{output}",
+        failed="❌ Archive failed:\n\n{output}",
+    ),
+    ToolSpec(
+        name="openspec_search",
+        description=(
+            "Search requirements, scenarios and change proposals by keyword. "
+            "Answers from an in-memory index, no OpenSpec CLI call needed"
+        ),
+        properties={
+            **directory_property(),
+            "query": {
+                "type": "string",
+                "description": "Words to search for",
+            },
+            "scope": {
+                "type": "string",
+                "enum": ["all", "specs", "changes"],
+                "description": "Search main specs, active changes, or both (default: all)",
+                "default": "all",
+            },
+            "limit": {
+                "type": "integer",
+                "description": f"Maximum number of results (default: {DEFAULT_LIMIT})",
+                "default": DEFAULT_LIMIT,
+            },
+        },
+        required=("query",),
+        handler=openspec_search,
+    ),
+    ToolSpec(
+        name="openspec_impact",
+        description=(
+            "Show which active changes touch a spec or requirement, which specs and requirements "
+            "a change modifies, and where changes conflict. Answers from an in-memory index of "
+            "the spec deltas, no OpenSpec CLI call needed"
+        ),
+        properties={
+            **directory_property(),
+            "change_name": {
+                "type": "string",
+                "description": "List the specs and requirements this active change modifies",
+            },
+            "spec_id": {
+                "type": "string",
+                "description": "List the active changes touching this spec",
+            },
+            "requirement": {
+                "type": "string",
+                "description": "With spec_id: list the active changes touching this requirement",
+            },
+            "format": {
+                "type": "string",
+                "enum": ["text", "json"],
+                "description": "Output format (default: text)",
+                "default": "text",
+            },
+        },
+        handler=openspec_impact,
+    ),
+    ToolSpec(
+        name="openspec_batch",
+        description=(
+            "Run several OpenSpec tool calls in one round-trip. "
+            "Reads run concurrently; a write (init, update, archive) waits for the "
+            "operations before it and blocks the ones after it"
+        ),
+        properties={
+            "operations": {
+                "type": "array",
+                "description": "Operations to run, in order",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "tool": {
+                            "type": "string",
+                            "description": "Name of any other OpenSpec tool",
+                        },
+                        "arguments": {
+                            "type": "object",
+                            "description": "Arguments for that tool",
+                        },
+                    },
+                    "required": ["tool"],
+                },
+            },
+            "max_concurrency": {
+                "type": "integer",
+                "description": f"Maximum operations running at once (default: {BATCH_DEFAULT_CONCURRENCY})",
+                "default": BATCH_DEFAULT_CONCURRENCY,
+            },
+        },
+        required=("operations",),
+        access=UNSCHEDULED,
+        handler=openspec_batch,
+    ),
+    ToolSpec(
+        name="openspec_metrics",
+        description=(
+            "Report server metrics: per-tool call and error counts, latency percentiles, "
+            "bytes returned, OpenSpec CLI runs and cache hit rates"
+        ),
+        properties={
+            "format": {
+                "type": "string",
+                "enum": ["json", "prometheus"],
+                "description": "Output format (default: json)",
+                "default": "json",
+            },
+            "reset": {
+                "type": "boolean",
+                "description": "Clear the per-tool counters after reporting them",
+                "default": False,
+            },
+        },
+        access=UNSCHEDULED,
+        handler=openspec_metrics,
+    ),
+    ToolSpec(
+        name="openspec_help",
+        description="Get help information about OpenSpec commands",
+        properties={
+            "command": {
+                "type": "string",
+                "description": "Specific command to get help for (optional)",
+            },
+        },
+        access=UNSCHEDULED,
+        handler=openspec_help,
+        timeout=SHORT_TIMEOUT,
+    ),
+])
+WRITE_TOOLS = registry.write_tools
+
+
+def terminate(signum: int) -> None:
+    """Kill every OpenSpec child, then die of the signal as the server would have without children."""
+    killed = kill_all()
+    logger.info("Received signal %d, killed %d OpenSpec process(es)", signum, killed)
+    signal.signal(signum, signal.SIG_DFL)
+    os.kill(os.getpid(), signum)
+
+
+def server_ready() -> None:
+    startup_timer.mark("ready")
+    startup_timer.log()
+
+
 async def main():
     """Run the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="openspec-mcp-x",
-                server_version="1.0.0",
-                capabilities=app.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    # stdout carries the MCP protocol, so diagnostics go to stderr
+    logging.basicConfig(
+        level=os.environ.get("OPENSPEC_MCP_LOG_LEVEL", "WARNING").upper(),
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    exporter = asyncio.create_task(export_periodically(METRICS_FILE)) if METRICS_FILE else None
+    # Children run in their own process groups and no longer see signals aimed at
+    # the server, so a terminated server has to kill them itself. Over HTTP,
+    # uvicorn turns SIGTERM into a clean shutdown that ends in the cleanup below
+    if sys.platform != "win32" and TRANSPORT != "http":
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGHUP):
+            loop.add_signal_handler(signum, terminate, signum)
+    atexit.register(kill_all)
+    try:
+        if TRANSPORT == "http":
+            from .http_transport import serve_http
+            
+            await serve_http(app, on_ready=server_ready)
+            return
+        async with stdio_server() as (read_stream, write_stream):
+            server_ready()
+            await app.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="openspec-mcp-x",
+                    server_version="1.0.0",
+                    capabilities=app.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        if exporter is not None:
+            exporter.cancel()
+            await asyncio.gather(exporter, return_exceptions=True)
+        index_registry.close()
+        # Imported late: the pool only exists if run_command ever started it
+        from .worker import close_worker_pool
+        
+        await close_worker_pool()
+        killed = kill_all()
+        if killed:
+            logger.info("Killed %d OpenSpec command(s) still running at shutdown", killed)
 
 
 if __name__ == "__main__":
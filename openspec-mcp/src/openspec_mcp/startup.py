@@ -0,0 +1,72 @@
+"""
+Startup timing for the OpenSpec MCP server.
+
+The npx launcher passes the moment it started in ``OPENSPEC_MCP_LAUNCH_TIME``
+(milliseconds since the epoch), so a cold start can be measured end to end:
+launcher probes, interpreter start, imports, and the point the server begins
+serving stdio. Without the launcher, times are measured from when the
+``openspec_mcp`` package started loading.
+
+Set ``OPENSPEC_MCP_STARTUP_REPORT=1`` (or run the launcher with
+``--startup-report``) to print the breakdown to stderr on every start.
+"""
+
+import logging
+import os
+import sys
+import time
+from typing import Optional
+
+from . import LOADED_AT
+
+logger = logging.getLogger(__name__)
+
+# Launch-to-ready budget; slower starts are reported
+STARTUP_TARGET_MS = float(os.environ.get("OPENSPEC_MCP_STARTUP_TARGET_MS", "1500"))
+REPORT_ENABLED = os.environ.get("OPENSPEC_MCP_STARTUP_REPORT") == "1"
+
+
+def _launch_time() -> Optional[float]:
+    try:
+        return float(os.environ["OPENSPEC_MCP_LAUNCH_TIME"]) / 1000
+    except (KeyError, ValueError):
+        return None
+
+
+class StartupTimer:
+    """Wall-clock marks for the phases of one server start."""
+
+    def __init__(self):
+        launched = _launch_time()
+        self.origin = launched if launched is not None and launched <= LOADED_AT else LOADED_AT
+        self.from_launcher = self.origin != LOADED_AT
+        self.marks: list[tuple[str, float]] = []
+        if self.from_launcher:
+            self.marks.append(("interpreter", LOADED_AT))
+
+    def mark(self, phase: str) -> None:
+        self.marks.append((phase, time.time()))
+
+    def report(self) -> dict:
+        """Milliseconds from the origin to each phase, plus the target check."""
+        phases = {phase: round((at - self.origin) * 1000, 1) for phase, at in self.marks}
+        total = phases.get("ready")
+        return {
+            "measured_from": "launcher" if self.from_launcher else "package import",
+            "phases_ms": phases,
+            "target_ms": STARTUP_TARGET_MS,
+            "within_target": None if total is None else total <= STARTUP_TARGET_MS,
+        }
+
+    def log(self) -> None:
+        """Print the breakdown when asked to, and note starts that missed the target."""
+        report = self.report()
+        phases = ", ".join(f"{phase} {ms:.0f}ms" for phase, ms in report["phases_ms"].items())
+        line = f"Startup ({report['measured_from']} = 0): {phases}; target {STARTUP_TARGET_MS:.0f}ms"
+        if REPORT_ENABLED:
+            print(f"⏱️  {line}", file=sys.stderr, flush=True)
+        elif report["within_target"] is False:
+            logger.info("Slow start. %s", line)
+
+
+startup_timer = StartupTimer()
@@ -0,0 +1,84 @@
+"""
+Structured (JSON) results with field projection.
+
+In structured mode the show tools always work on the JSON view of an item:
+the native reader's dicts, or the CLI's ``--json`` output parsed once. The
+parsed object is what gets cached, so every projection of it is served
+without running or parsing anything again.
+
+A projection is a list of dotted paths. ``"requirements.text"`` keeps only the
+text of each requirement; ``"deltas"`` keeps all deltas and nothing else. Paths
+walk through lists, so they apply to every element.
+"""
+
+import json
+from typing import Any, Optional
+
+FIELDS_PROPERTIES = {
+    "structured": {
+        "type": "boolean",
+        "description": "Return the item as parsed JSON (MCP structured content) instead of text",
+        "default": False,
+    },
+    "fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": (
+            "Structured mode: only return these dotted paths, "
+            "e.g. [\"id\", \"requirements.text\"] or [\"deltas\"]"
+        ),
+    },
+}
+
+
+def field_tree(fields: list[str]) -> dict:
+    """Turn dotted paths into a nested dict; None marks a subtree that is kept whole."""
+    tree: dict = {}
+    for path in fields:
+        parts = [part for part in path.split(".") if part]
+        node = tree
+        for part in parts[:-1]:
+            child = node.get(part, {})
+            if child is None:
+                # A shorter path already keeps this whole subtree
+                break
+            node = node.setdefault(part, child)
+        else:
+            if parts:
+                node[parts[-1]] = None
+    return tree
+
+
+def project(data: Any, tree: Optional[dict]) -> Any:
+    """Keep only the parts of data named by a field tree."""
+    if tree is None:
+        return data
+    if isinstance(data, list):
+        return [project(item, tree) for item in data]
+    if not isinstance(data, dict):
+        return data
+    return {key: project(data[key], sub) for key, sub in tree.items() if key in data}
+
+
+def parse_cli_json(output: str) -> Any:
+    """Parse JSON printed by the CLI, skipping any banner lines before it."""
+    starts = [i for i in (output.find("{"), output.find("[")) if i != -1]
+    if not starts:
+        raise ValueError("no JSON in command output")
+    # Decode in place rather than parsing a slice, which would copy the whole output
+    data, end = json.JSONDecoder().raw_decode(output, min(starts))
+    if output[end:].strip():
+        raise ValueError("unexpected text after JSON in command output")
+    return data
+
+
+def structured_result(data: Any, fields: Optional[list[str]]) -> dict:
+    """The structured content for a (projected) item; MCP requires an object."""
+    if fields:
+        data = project(data, field_tree(fields))
+    return data if isinstance(data, dict) else {"items": data}
+
+
+def dumps(data: Any) -> str:
+    """Compact JSON for the text copy of a structured result."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,246 @@
+"""
+Parallel validation of every spec and change in a workspace.
+
+Instead of one long ``openspec validate`` over the whole repo, each item is
+validated by its own CLI invocation, with up to ``max_workers`` running at
+once, and the results are aggregated into a per-item pass/fail report.
+
+Items that validated cleanly are remembered by a content hash of their files
+plus the CLI version, persisted across restarts, and skipped until they change.
+A change's hash also covers the main specs its deltas apply to, since editing
+or removing a requirement there can make the change invalid.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from .cache import normalize_directory
+from .reader import _subdirectories
+from .runner import OutputCallback, run_command
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.environ.get("OPENSPEC_MCP_VALIDATE_WORKERS", "0")) or (os.cpu_count() or 4)
+
+
+@dataclass
+class ValidationResult:
+    """Outcome of validating one spec or change."""
+
+    kind: str  # "spec" or "change"
+    name: str
+    success: bool
+    output: str
+    duration: float
+    cached: bool = False
+
+
+def validate_command(kind: str, name: str) -> list[str]:
+    """CLI invocation that validates a single item."""
+    return ["openspec", "validate", name, "--type", kind, "--no-interactive"]
+
+
+def list_items(index, kinds: tuple[str, ...]) -> list[tuple[str, str]]:
+    """List (kind, name) pairs for every spec and/or active change in a workspace index."""
+    items: list[tuple[str, str]] = []
+    if "spec" in kinds:
+        items.extend(("spec", spec_id) for spec_id in index.spec_ids())
+    if "change" in kinds:
+        items.extend(("change", name) for name in index.change_names())
+    return items
+
+
+def _cache_path() -> str:
+    if os.environ.get("OPENSPEC_MCP_VALIDATION_CACHE"):
+        return os.environ["OPENSPEC_MCP_VALIDATION_CACHE"]
+    base = (
+        os.environ.get("XDG_CACHE_HOME")
+        or os.environ.get("LOCALAPPDATA")
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    return os.path.join(base, "openspec-mcp-x", "validation-cache.json")
+
+
+def item_hash(index, kind: str, name: str, cli_version: str) -> Optional[str]:
+    """Hash an item's files together with the CLI version; None if the item cannot be read.
+
+    A change also hashes the main spec of every spec it has deltas for, or
+    notes that it is missing, so edits there invalidate the change's result.
+    """
+    digest = hashlib.sha256(cli_version.encode("utf-8"))
+    targets: list[str] = []
+    if kind == "spec":
+        files = [("spec.md", index.spec_path(name))]
+    else:
+        root = index.change_path(name)
+        files = []
+        for current, dirs, names in os.walk(root):
+            dirs.sort()
+            files.extend(
+                (os.path.relpath(os.path.join(current, n), root), os.path.join(current, n))
+                for n in sorted(names)
+            )
+        targets = _subdirectories(os.path.join(root, "specs"))
+    if not files:
+        return None
+    for relpath, path in files:
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        digest.update(b"\0" + relpath.replace(os.sep, "/").encode("utf-8") + b"\0")
+        digest.update(content)
+    for spec_id in targets:
+        digest.update(b"\0target:" + spec_id.encode("utf-8") + b"\0")
+        try:
+            with open(index.spec_path(spec_id), "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b"\0missing")
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """Content hashes of items that last validated cleanly, persisted as JSON."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or _cache_path()
+        self.hits = 0
+        self.misses = 0
+        self._entries: Optional[dict[str, dict[str, str]]] = None
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict[str, str]]:
+        if self._entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                self._entries = data if isinstance(data, dict) else {}
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def is_valid(self, directory: str, kind: str, name: str, content_hash: Optional[str]) -> bool:
+        if content_hash is None:
+            self.misses += 1
+            return False
+        valid = self._load().get(directory, {}).get(f"{kind}:{name}") == content_hash
+        if valid:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return valid
+
+    def record(self, directory: str, kind: str, name: str, content_hash: Optional[str], success: bool) -> None:
+        workspace = self._load().setdefault(directory, {})
+        key = f"{kind}:{name}"
+        if success and content_hash is not None:
+            if workspace.get(key) != content_hash:
+                workspace[key] = content_hash
+                self._dirty = True
+        elif workspace.pop(key, None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache atomically if anything changed."""
+        if not self._dirty or self._entries is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning("Could not persist validation cache to %s: %s", self.path, e)
+
+
+validation_cache = ValidationCache()
+
+
+async def validate_one(
+    kind: str,
+    name: str,
+    directory: str,
+    cmd: Optional[list[str]] = None,
+    content_hash: Optional[str] = None,
+    force: bool = False,
+    on_output: Optional[OutputCallback] = None,
+) -> ValidationResult:
+    """Validate one item, skipping the CLI when its content hash last validated cleanly."""
+    workspace = normalize_directory(directory)
+    if not force and validation_cache.is_valid(workspace, kind, name, content_hash):
+        return ValidationResult(kind, name, True, "Unchanged since last successful validation", 0.0, cached=True)
+
+    started = time.perf_counter()
+    success, stdout, stderr = await run_command(
+        cmd or validate_command(kind, name), cwd=directory, on_output=on_output
+    )
+    output = (stdout if success else stderr or stdout).strip()
+    validation_cache.record(workspace, kind, name, content_hash, success)
+    return ValidationResult(kind, name, success, output, time.perf_counter() - started)
+
+
+async def validate_all(
+    items: list[tuple[str, str]],
+    directory: str,
+    max_workers: Optional[int] = None,
+    hashes: Optional[dict[tuple[str, str], Optional[str]]] = None,
+    force: bool = False,
+    on_result: Optional[Callable[[ValidationResult], Awaitable[None]]] = None,
+) -> list[ValidationResult]:
+    """Validate items concurrently with at most max_workers CLI processes at once.
+
+    ``on_result`` is awaited as soon as each item finishes, in completion order.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_workers or DEFAULT_WORKERS))
+    hashes = hashes or {}
+
+    async def run(kind: str, name: str) -> ValidationResult:
+        async with semaphore:
+            result = await validate_one(
+                kind, name, directory, content_hash=hashes.get((kind, name)), force=force
+            )
+        if on_result is not None:
+            await on_result(result)
+        return result
+
+    try:
+        return await asyncio.gather(*(run(kind, name) for kind, name in items))
+    finally:
+        validation_cache.save()
+
+
+def format_result_line(result: ValidationResult) -> str:
+    icon = "✅" if result.success else "❌"
+    timing = "unchanged" if result.cached else f"{result.duration:.2f}s"
+    return f"{icon} {result.kind} {result.name} ({timing})"
+
+
+def format_report(results: list[ValidationResult], workers: int, elapsed: float) -> str:
+    """Aggregate per-item results, failures first."""
+    passed = [r for r in results if r.success]
+    failed = [r for r in results if not r.success]
+    cached = sum(1 for r in results if r.cached)
+    icon = "✅" if not failed else "❌"
+    lines = [
+        f"{icon} Validated {len(results)} item{'s' if len(results) != 1 else ''}: "
+        f"{len(passed)} passed ({cached} unchanged), {len(failed)} failed "
+        f"({workers} worker{'s' if workers != 1 else ''}, {elapsed:.2f}s)",
+        "",
+    ]
+    for result in failed:
+        lines.append(format_result_line(result))
+        lines.extend(f"   {line}" for line in result.output.splitlines())
+    for result in passed:
+        lines.append(format_result_line(result))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,298 @@
+"""
+Persistent OpenSpec sidecar workers.
+
+Every ``openspec`` invocation normally pays a full Node.js cold start. With
+``OPENSPEC_MCP_WORKER=1`` the server instead keeps a small pool of long-lived
+worker processes that load the OpenSpec CLI once and execute commands sent
+over stdin/stdout as JSON lines:
+
+    -> {"id": 1, "op": "run", "argv": ["list", "--specs"], "cwd": "/repo"}
+    <- {"id": 1, "code": 0, "stdout": "...", "stderr": "", "rss": 81264640}
+    -> {"id": 2, "op": "ping"}
+    <- {"id": 2, "ok": true, "rss": 81264640}
+
+A worker announces itself with ``{"ready": true}`` once started. Workers are
+health-checked while idle and restarted when they crash or misbehave; after
+repeated failures the pool backs off and ``run_command`` falls back to
+spawning the CLI directly.
+
+A worker's memory only grows (Node never unloads the module records each
+command adds), so workers are retired after ``OPENSPEC_MCP_WORKER_MAX_REQUESTS``
+commands, or once the resident size they report (``rss``, in bytes) passes
+``OPENSPEC_MCP_WORKER_MAX_RSS_MB``. A fresh worker takes their place on the
+next call.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shlex
+import shutil
+import sys
+import time
+from typing import Optional
+
+from .runner import PROCESS_GROUP_OPTIONS, kill_process_group, track_child, untrack_child
+
+logger = logging.getLogger(__name__)
+
+WORKER_ENABLED = os.environ.get("OPENSPEC_MCP_WORKER", "0") == "1"
+POOL_SIZE = int(os.environ.get("OPENSPEC_MCP_WORKER_POOL", "2"))
+STARTUP_TIMEOUT = 30.0
+PING_TIMEOUT = 5.0
+HEALTH_INTERVAL = 30.0
+MAX_FAILURES = 3
+COOLDOWN = 60.0
+# Commands a worker runs before it is replaced
+MAX_REQUESTS = int(os.environ.get("OPENSPEC_MCP_WORKER_MAX_REQUESTS", "200"))
+# Resident size above which a worker is replaced
+MAX_RSS_BYTES = int(float(os.environ.get("OPENSPEC_MCP_WORKER_MAX_RSS_MB", "512")) * 1024 * 1024)
+# Largest single protocol line (one JSON-encoded response)
+LINE_LIMIT = 64 * 1024 * 1024
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), "openspec_worker.mjs")
+
+
+class WorkerError(Exception):
+    """The worker died or broke the protocol."""
+
+
+def default_worker_command() -> list[str]:
+    """Command line for the bundled Node.js worker, or OPENSPEC_MCP_WORKER_CMD when set."""
+    override = os.environ.get("OPENSPEC_MCP_WORKER_CMD")
+    if override:
+        return shlex.split(override, posix=sys.platform != "win32")
+    return ["node", WORKER_SCRIPT]
+
+
+class _Worker:
+    """One sidecar process handling one request at a time."""
+
+    def __init__(self, cmd: list[str]):
+        self.cmd = cmd
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.runs = 0
+        self.rss = 0
+        self._next_id = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self) -> None:
+        env = dict(os.environ)
+        binary = shutil.which("openspec")
+        if binary:
+            env["OPENSPEC_BIN"] = os.path.realpath(binary)
+        self.process = await asyncio.create_subprocess_exec(
+            *self.cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=env,
+            limit=LINE_LIMIT,
+            **PROCESS_GROUP_OPTIONS,
+        )
+        track_child(self.process)
+        self.runs = self.rss = 0
+        message = await self._read(STARTUP_TIMEOUT)
+        if not message.get("ready"):
+            raise WorkerError(f"Worker did not report ready: {message}")
+
+    async def request(self, payload: dict, timeout: Optional[float]) -> dict:
+        if not self.alive:
+            raise WorkerError("Worker is not running")
+        self._next_id += 1
+        payload = {"id": self._next_id, **payload}
+        self.process.stdin.write(json.dumps(payload).encode("utf-8") + b"\n")
+        try:
+            await self.process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise WorkerError(str(e)) from e
+        message = await self._read(timeout)
+        if message.get("id") != payload["id"]:
+            raise WorkerError(f"Out-of-order response from worker: {message}")
+        self.rss = message.get("rss") or self.rss
+        return message
+
+    def worn_out(self, max_requests: int, max_rss: int) -> Optional[str]:
+        """Why the worker should be replaced, or None while it may keep running."""
+        if max_requests and self.runs >= max_requests:
+            return f"after {self.runs} commands"
+        if max_rss and self.rss > max_rss:
+            return f"at {self.rss / (1024 * 1024):.0f} MB resident"
+        return None
+
+    async def _read(self, timeout: Optional[float]) -> dict:
+        line = await asyncio.wait_for(self.process.stdout.readline(), timeout=timeout)
+        if not line:
+            raise WorkerError("Worker exited")
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            raise WorkerError(f"Malformed worker response: {line[:200]!r}") from e
+
+    async def stop(self) -> None:
+        process, self.process = self.process, None
+        if process is None:
+            return
+        untrack_child(process)
+        if process.returncode is not None:
+            return
+        # A command the worker was running may have started children of its own
+        kill_process_group(process)
+        await process.wait()
+
+
+class WorkerPool:
+    """A fixed number of sidecar workers shared by all tool calls."""
+
+    def __init__(
+        self,
+        cmd: list[str],
+        size: int = POOL_SIZE,
+        max_requests: int = MAX_REQUESTS,
+        max_rss: int = MAX_RSS_BYTES,
+    ):
+        self.cmd = cmd
+        self.size = max(1, size)
+        self.max_requests = max_requests
+        self.max_rss = max_rss
+        self.requests = 0
+        self.restarts = 0
+        self.retired = 0
+        self.fallbacks = 0
+        self._idle: asyncio.Queue[_Worker] = asyncio.Queue()
+        for _ in range(self.size):
+            self._idle.put_nowait(_Worker(cmd))
+        self._failures = 0
+        self._disabled_until = 0.0
+        self._health_task: Optional[asyncio.Task] = None
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._disabled_until
+
+    async def run(
+        self, argv: list[str], cwd: Optional[str], timeout: Optional[float]
+    ) -> Optional[tuple[bool, str, str]]:
+        """Run an openspec command in a worker; None means the caller should spawn it instead."""
+        if not self.available:
+            self.fallbacks += 1
+            return None
+        self._ensure_health_check()
+
+        worker = await self._idle.get()
+        try:
+            if not worker.alive:
+                await self._restart(worker)
+            response = await worker.request(
+                {"op": "run", "argv": argv, "cwd": os.path.abspath(cwd or ".")}, timeout
+            )
+        except asyncio.TimeoutError:
+            # The command itself hung; a fresh worker takes its place on the next call
+            await worker.stop()
+            from .runner import _format_timeout
+
+            return False, "", f"Command timed out after {_format_timeout(timeout)}"
+        except asyncio.CancelledError:
+            await worker.stop()
+            raise
+        except (WorkerError, OSError) as e:
+            await worker.stop()
+            self._record_failure(e)
+            self.fallbacks += 1
+            return None
+        else:
+            worker.runs += 1
+            await self._retire_if_worn_out(worker)
+        finally:
+            self._idle.put_nowait(worker)
+
+        self._failures = 0
+        self.requests += 1
+        return (
+            response.get("code") == 0,
+            response.get("stdout", ""),
+            response.get("stderr", ""),
+        )
+
+    async def check_health(self) -> None:
+        """Ping idle workers and restart any that do not answer."""
+        for _ in range(self._idle.qsize()):
+            try:
+                worker = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                if worker.alive:
+                    response = await worker.request({"op": "ping"}, PING_TIMEOUT)
+                    if not response.get("ok"):
+                        raise WorkerError(f"Unhealthy worker: {response}")
+                    await self._retire_if_worn_out(worker)
+            except (WorkerError, OSError, asyncio.TimeoutError) as e:
+                logger.info("Restarting unhealthy OpenSpec worker: %s", e)
+                await worker.stop()
+            finally:
+                self._idle.put_nowait(worker)
+
+    async def close(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        while not self._idle.empty():
+            await self._idle.get_nowait().stop()
+
+    async def _restart(self, worker: _Worker) -> None:
+        await worker.stop()
+        try:
+            await worker.start()
+        except (asyncio.TimeoutError, OSError) as e:
+            await worker.stop()
+            raise WorkerError(f"Worker failed to start: {e}") from e
+        self.restarts += 1
+
+    async def _retire_if_worn_out(self, worker: _Worker) -> None:
+        reason = worker.worn_out(self.max_requests, self.max_rss)
+        if reason is not None:
+            logger.info("Retiring OpenSpec worker %s", reason)
+            await worker.stop()
+            self.retired += 1
+
+    def _record_failure(self, error: Exception) -> None:
+        self._failures += 1
+        logger.warning("OpenSpec worker failed (%d in a row): %s", self._failures, error)
+        if self._failures >= MAX_FAILURES:
+            logger.warning("Disabling OpenSpec workers for %.0fs, spawning the CLI instead", COOLDOWN)
+            self._disabled_until = time.monotonic() + COOLDOWN
+            self._failures = 0
+
+    def _ensure_health_check(self) -> None:
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(HEALTH_INTERVAL)
+            await self.check_health()
+
+
+_pool: Optional[WorkerPool] = None
+
+
+def get_worker_pool() -> Optional[WorkerPool]:
+    """Return the shared worker pool, or None when worker mode is off."""
+    global _pool
+    if not WORKER_ENABLED:
+        return None
+    if _pool is None:
+        _pool = WorkerPool(default_worker_command(), POOL_SIZE)
+    return _pool
+
+
+async def close_worker_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
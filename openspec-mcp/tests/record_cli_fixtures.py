@@ -0,0 +1,58 @@
+"""
+Re-record the OpenSpec CLI output that the native reader is compared against.
+
+Run from the repository with the OpenSpec CLI on PATH:
+
+    python tests/record_cli_fixtures.py
+
+Each recording runs the exact argv the server would run for a tool call
+against ``fixtures/workspace`` and stores its stdout under ``fixtures/cli``.
+"""
+
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+WORKSPACE = os.path.join(HERE, "fixtures", "workspace")
+RECORDED = os.path.join(HERE, "fixtures", "cli")
+
+# (recording file, tool, arguments)
+RECORDINGS = [
+    ("list-changes.txt", "openspec_list", {"type": "changes"}),
+    ("list-specs.txt", "openspec_list", {"type": "specs"}),
+    ("spec-list.txt", "openspec_spec_list", {}),
+    ("spec-show-auth.md", "openspec_spec_show", {"spec_id": "auth"}),
+    ("spec-show-auth.json", "openspec_spec_show", {"spec_id": "auth", "format": "json"}),
+    ("spec-show-billing.json", "openspec_spec_show", {"spec_id": "billing", "format": "json"}),
+    ("change-show-add-two-factor.md", "openspec_change_show", {"change_name": "add-two-factor"}),
+    ("change-show-add-two-factor.json", "openspec_change_show", {"change_name": "add-two-factor", "format": "json"}),
+    ("change-show-rename-invoices.json", "openspec_change_show", {"change_name": "rename-invoices", "format": "json"}),
+    ("show-billing.json", "openspec_show", {"item_name": "billing", "format": "json"}),
+]
+
+
+def cli_argv(tool: str, arguments: dict) -> list[str]:
+    from openspec_mcp.server import registry
+
+    spec = registry.specs[tool]
+    return ["openspec", *spec.command(spec.values(arguments, directory=WORKSPACE))]
+
+
+def main() -> int:
+    sys.path.insert(0, os.path.join(HERE, os.pardir, "src"))
+    os.makedirs(RECORDED, exist_ok=True)
+    for filename, tool, arguments in RECORDINGS:
+        argv = cli_argv(tool, arguments)
+        result = subprocess.run(argv, cwd=WORKSPACE, capture_output=True, text=True, encoding="utf-8")
+        if result.returncode != 0:
+            print(f"❌ {' '.join(argv)}: {result.stderr.strip()}", file=sys.stderr)
+            return 1
+        with open(os.path.join(RECORDED, filename), "w", encoding="utf-8", newline="\n") as f:
+            f.write(result.stdout)
+        print(f"✅ {filename}: {' '.join(argv)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Stand-in for the OpenSpec CLI, for tests that go through run_command.
+
+Every invocation appends its argv, as one JSON line, to ``STUB_OPENSPEC_LOG``.
+
+- ``--version``: prints ``STUB_OPENSPEC_VERSION`` (default 0.0.0-test)
+- ``validate <name> ...`` (or ``change|spec validate <name>``): fails for names
+  listed in ``STUB_OPENSPEC_INVALID``
+- ``archive <name> -y``: fails for names listed in ``STUB_OPENSPEC_FAIL``
+- anything else: prints its arguments
+
+``STUB_OPENSPEC_DELAY`` makes every command sleep that many seconds first.
+Nothing on disk is modified.
+"""
+
+import json
+import os
+import sys
+import time
+
+
+def names(variable: str) -> set[str]:
+    return {name for name in os.environ.get(variable, "").split(",") if name}
+
+
+def main(argv: list[str]) -> int:
+    log = os.environ.get("STUB_OPENSPEC_LOG")
+    if log:
+        with open(log, "a", encoding="utf-8") as f:
+            f.write(json.dumps(argv) + "\n")
+    time.sleep(float(os.environ.get("STUB_OPENSPEC_DELAY", "0")))
+
+    if argv[:1] == ["--version"]:
+        print(os.environ.get("STUB_OPENSPEC_VERSION", "0.0.0-test"))
+        return 0
+    if argv[:1] in (["change"], ["spec"]):
+        argv = argv[1:]
+    command, name = (argv + ["", ""])[:2]
+    if command == "validate":
+        if name in names("STUB_OPENSPEC_INVALID"):
+            sys.stderr.write(f"✗ {name} has issues\n")
+            return 1
+        print(f"✓ {name} is valid")
+        return 0
+    if command == "archive":
+        if name in names("STUB_OPENSPEC_FAIL"):
+            sys.stderr.write(f"Could not archive {name}: specs would conflict\n")
+            return 1
+        print(f"Archived {name}")
+        return 0
+    print(" ".join(argv))
+    return 0
+
+
+def install(bin_dir) -> None:
+    """Put an ``openspec`` launcher for this script into bin_dir."""
+    os.makedirs(bin_dir, exist_ok=True)
+    script = os.path.abspath(__file__)
+    if os.name == "nt":
+        with open(os.path.join(bin_dir, "openspec.cmd"), "w", encoding="utf-8") as f:
+            f.write(f'@"{sys.executable}" "{script}" %*\r\n')
+        return
+    shim = os.path.join(bin_dir, "openspec")
+    with open(shim, "w", encoding="utf-8") as f:
+        f.write(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n')
+    os.chmod(shim, 0o755)
+
+
+def calls(log) -> list[list[str]]:
+    """Argv of every invocation recorded in the log so far."""
+    try:
+        with open(log, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+    except FileNotFoundError:
+        return []
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
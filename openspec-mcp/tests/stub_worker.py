@@ -0,0 +1,52 @@
+"""
+Stand-in for the Node.js OpenSpec worker, speaking the same JSON-lines protocol.
+
+The first argv item of a run request picks the behaviour:
+
+- ``echo <words...>``: exit code 0, the words on stdout
+- ``fail``: exit code 1, a message on stderr
+- ``crash``: the worker process exits without answering
+- ``hang``: never answers
+- ``pid``: the worker's process id on stdout
+
+``STUB_WORKER_RSS`` sets the resident size the worker reports, and
+``STUB_WORKER_BROKEN=1`` makes it exit before announcing itself ready.
+"""
+
+import json
+import os
+import sys
+import time
+
+
+def send(message: dict) -> None:
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+def main() -> int:
+    if os.environ.get("STUB_WORKER_BROKEN") == "1":
+        return 1
+    rss = int(os.environ.get("STUB_WORKER_RSS", "1000000"))
+    send({"ready": True})
+    for line in sys.stdin:
+        request = json.loads(line)
+        if request["op"] == "ping":
+            send({"id": request["id"], "ok": True, "rss": rss})
+            continue
+        command, *words = request["argv"] or [""]
+        if command == "crash":
+            return 1
+        if command == "hang":
+            time.sleep(3600)
+        if command == "fail":
+            send({"id": request["id"], "code": 1, "stdout": "", "stderr": "failed\n", "rss": rss})
+        elif command == "pid":
+            send({"id": request["id"], "code": 0, "stdout": str(os.getpid()), "stderr": "", "rss": rss})
+        else:
+            send({"id": request["id"], "code": 0, "stdout": " ".join(words), "stderr": "", "rss": rss})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
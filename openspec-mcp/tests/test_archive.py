@@ -0,0 +1,109 @@
+"""Bulk archive: conflict refusal, validation gate and the ordered archive report."""
+
+import asyncio
+import os
+import shutil
+
+import pytest
+import stub_openspec
+from record_cli_fixtures import WORKSPACE
+
+from openspec_mcp import server
+from openspec_mcp.detection import detection_cache
+from openspec_mcp.validation import validation_cache
+
+EXTEND_SESSIONS = """## MODIFIED Requirements
+
+### Requirement: Session Expiry
+The system SHALL expire sessions after 60 minutes without activity.
+
+#### Scenario: Idle session
+- **WHEN** a session has been idle for 60 minutes
+- **THEN** the next request requires signing in again
+"""
+
+ADD_AUDIT_LOG = """## ADDED Requirements
+
+### Requirement: Audit Trail
+The system SHALL record every sign-in.
+
+#### Scenario: Sign-in recorded
+- **WHEN** a user signs in
+- **THEN** an audit entry is written
+"""
+
+
+def add_change(workspace, name: str, spec: str, delta: str) -> None:
+    change = workspace / "openspec" / "changes" / name
+    (change / "specs" / spec).mkdir(parents=True)
+    (change / "proposal.md").write_text(f"# Change: {name}\n\n## Why\nTests.\n", encoding="utf-8")
+    (change / "specs" / spec / "spec.md").write_text(delta, encoding="utf-8")
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    workspace = tmp_path / "workspace"
+    shutil.copytree(WORKSPACE, workspace)
+    add_change(workspace, "extend-sessions", "auth", EXTEND_SESSIONS)
+    add_change(workspace, "add-audit-log", "audit", ADD_AUDIT_LOG)
+
+    stub_openspec.install(tmp_path / "bin")
+    monkeypatch.setenv("PATH", f"{tmp_path / 'bin'}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setenv("STUB_OPENSPEC_LOG", str(tmp_path / "calls.jsonl"))
+    monkeypatch.setattr(validation_cache, "path", str(tmp_path / "validation-cache.json"))
+    monkeypatch.setattr(validation_cache, "_entries", None)
+    detection_cache.invalidate()
+    yield workspace
+    detection_cache.invalidate()
+
+
+def archive(workspace, *names: str) -> str:
+    args = {"directory": str(workspace), "change_names": list(names)}
+    result = asyncio.run(server.handle_call_tool("openspec_archive", args))
+    return result[0].text
+
+
+def cli_calls(workspace, command: str) -> list[list[str]]:
+    return [argv for argv in stub_openspec.calls(workspace.parent / "calls.jsonl") if argv[:1] == [command]]
+
+
+def test_conflicting_changes_are_refused(workspace):
+    text = archive(workspace, "add-two-factor", "extend-sessions")
+    assert text.startswith("❌ Nothing archived: 1 requirement modified by more than one change in the batch")
+    assert "  - auth: Session Expiry <- add-two-factor, extend-sessions" in text
+    assert cli_calls(workspace, "validate") == []
+    assert cli_calls(workspace, "archive") == []
+
+
+def test_unknown_change_is_refused(workspace):
+    text = archive(workspace, "add-two-factor", "no-such-change")
+    assert text == "❌ Nothing archived. Not active changes: no-such-change"
+    assert cli_calls(workspace, "archive") == []
+
+
+def test_invalid_change_stops_the_batch_before_archiving(workspace, monkeypatch):
+    monkeypatch.setenv("STUB_OPENSPEC_INVALID", "rename-invoices")
+    text = archive(workspace, "add-two-factor", "rename-invoices")
+    assert text.startswith("❌ Nothing archived: validation failed")
+    assert "rename-invoices has issues" in text
+    assert len(cli_calls(workspace, "validate")) == 2
+    assert cli_calls(workspace, "archive") == []
+
+
+def test_report_lists_archived_failed_and_skipped_in_order(workspace, monkeypatch):
+    monkeypatch.setenv("STUB_OPENSPEC_FAIL", "rename-invoices")
+    text = archive(workspace, "add-two-factor", "rename-invoices", "add-audit-log")
+    lines = text.splitlines()
+    assert lines[0].startswith("❌ Archive stopped at rename-invoices: 1 of 3 changes archived")
+    assert lines[2].startswith("✅ add-two-factor: archived (")
+    assert lines[3].startswith("❌ rename-invoices: failed (")
+    assert lines[4] == "   Could not archive rename-invoices: specs would conflict"
+    assert lines[5] == "⏭️  add-audit-log: skipped"
+    # Archived one after another in the order given; nothing after the failure
+    assert [argv[1] for argv in cli_calls(workspace, "archive")] == ["add-two-factor", "rename-invoices"]
+
+
+def test_report_when_every_change_is_archived(workspace):
+    text = archive(workspace, "rename-invoices", "add-audit-log")
+    assert text.startswith("✅ Archived 2 changes (")
+    assert [argv[1] for argv in cli_calls(workspace, "archive")] == ["rename-invoices", "add-audit-log"]
@@ -0,0 +1,93 @@
+"""openspec_batch: results in order, bounded concurrency, writes as barriers, per-item failures."""
+
+import asyncio
+import json
+
+from mcp.types import TextContent
+from record_cli_fixtures import WORKSPACE
+
+from openspec_mcp import server
+
+
+def run_batch(operations, **args):
+    async def scenario():
+        result = await server.openspec_batch({"operations": operations, **args})
+        return json.loads(result[0].text)
+
+    return asyncio.run(scenario())
+
+
+class FakeTools:
+    """Stands in for handle_call_tool and records when each call starts and ends."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.events = []
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, tool, arguments):
+        label = arguments.get("label", tool)
+        self.events.append(("start", label))
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(self.delays.get(label, 0.01))
+        self.running -= 1
+        self.events.append(("end", label))
+        return [TextContent(type="text", text=f"done {label}")]
+
+    def position(self, event, label):
+        return self.events.index((event, label))
+
+
+def read(label):
+    return {"tool": "openspec_list", "arguments": {"label": label}}
+
+
+def test_results_keep_operation_order(monkeypatch):
+    fake = FakeTools(delays={"slow": 0.05, "fast": 0.0})
+    monkeypatch.setattr(server, "handle_call_tool", fake)
+    report = run_batch([read("slow"), read("fast")])
+    assert [r["output"] for r in report["results"]] == ["done slow", "done fast"]
+    assert [r["index"] for r in report["results"]] == [0, 1]
+    # The fast read did not wait for the slow one
+    assert fake.position("end", "fast") < fake.position("end", "slow")
+
+
+def test_concurrency_is_bounded(monkeypatch):
+    fake = FakeTools()
+    monkeypatch.setattr(server, "handle_call_tool", fake)
+    report = run_batch([read(str(i)) for i in range(10)], max_concurrency=3)
+    assert report["succeeded"] == 10
+    assert fake.peak == 3
+
+
+def test_write_is_a_barrier(monkeypatch):
+    fake = FakeTools()
+    monkeypatch.setattr(server, "handle_call_tool", fake)
+    write = {"tool": "openspec_update", "arguments": {"label": "write"}}
+    run_batch([read("before-1"), read("before-2"), write, read("after")])
+    assert fake.position("start", "write") > fake.position("end", "before-1")
+    assert fake.position("start", "write") > fake.position("end", "before-2")
+    assert fake.position("start", "after") > fake.position("end", "write")
+
+
+def test_malformed_operations_fail_on_their_own():
+    operations = [
+        {"tool": "openspec_spec_list", "arguments": {"directory": WORKSPACE}},
+        {"tool": "openspec_spec_list", "arguments": "not an object"},
+        {"tool": "openspec_spec_list", "arguments": ["a", "list"]},
+        {"tool": ["openspec_spec_list"]},
+        {"tool": "openspec_batch"},
+        "openspec_spec_list",
+        {"tool": "openspec_spec_show", "arguments": {"directory": WORKSPACE, "spec_id": "auth"}},
+    ]
+    report = run_batch(operations)
+    assert [r["status"] for r in report["results"]] == ["ok", "error", "error", "error", "error", "error", "ok"]
+    assert report["succeeded"] == 2 and report["failed"] == 5
+    outputs = [r["output"] for r in report["results"]]
+    assert outputs[1] == "❌ Arguments for openspec_spec_list must be an object, got str"
+    assert outputs[2] == "❌ Arguments for openspec_spec_list must be an object, got list"
+    assert outputs[3].startswith("❌ Unknown or unsupported tool in batch")
+    assert outputs[5] == "❌ Batch operation must be an object, got str"
+    assert "auth" in outputs[0] and "Requirement" in outputs[6]
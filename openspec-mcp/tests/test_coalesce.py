@@ -0,0 +1,112 @@
+"""Identical concurrent read calls share one execution, its CLI run and its streamed output."""
+
+import asyncio
+import os
+import shutil
+
+import pytest
+import stub_openspec
+from record_cli_fixtures import WORKSPACE
+
+from openspec_mcp import server
+from openspec_mcp.coalesce import SingleFlight
+from openspec_mcp.detection import detection_cache
+from openspec_mcp.progress import current_reporter
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    workspace = tmp_path / "workspace"
+    shutil.copytree(WORKSPACE, workspace)
+    stub_openspec.install(tmp_path / "bin")
+    monkeypatch.setenv("PATH", f"{tmp_path / 'bin'}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setenv("STUB_OPENSPEC_LOG", str(tmp_path / "calls.jsonl"))
+    # Every read goes to the (stub) CLI instead of the native reader
+    monkeypatch.setattr("openspec_mcp.index.NATIVE_READER_ENABLED", False)
+    detection_cache.invalidate()
+    yield workspace
+    detection_cache.invalidate()
+
+
+def spec_lists(workspace) -> int:
+    return sum(1 for argv in stub_openspec.calls(workspace.parent / "calls.jsonl") if argv[:2] == ["spec", "list"])
+
+
+def test_concurrent_identical_calls_make_one_cli_run(workspace, monkeypatch):
+    monkeypatch.setenv("STUB_OPENSPEC_DELAY", "0.3")
+    args = {"directory": str(workspace)}
+
+    async def scenario():
+        await server.detect_openspec()
+        return await asyncio.gather(*(server.handle_call_tool("openspec_spec_list", args) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len({result[0].text for result in results}) == 1
+    assert spec_lists(workspace) == 1
+
+
+def test_cancelling_one_caller_keeps_the_shared_run(workspace, monkeypatch):
+    monkeypatch.setenv("STUB_OPENSPEC_DELAY", "0.3")
+    args = {"directory": str(workspace)}
+
+    async def scenario():
+        await server.detect_openspec()
+        leader = asyncio.create_task(server.handle_call_tool("openspec_spec_list", args))
+        await asyncio.sleep(0.05)
+        follower = asyncio.create_task(server.handle_call_tool("openspec_spec_list", args))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        result = await follower
+        return leader.cancelled(), result[0].text
+
+    cancelled, text = asyncio.run(scenario())
+    assert cancelled
+    assert text.startswith("✅")
+    assert spec_lists(workspace) == 1
+
+
+class RecordingReporter:
+    def __init__(self):
+        self.lines = []
+        self.flushes = 0
+
+    async def __call__(self, stream, line):
+        self.lines.append(line)
+
+    async def flush(self):
+        self.flushes += 1
+
+
+def test_streamed_output_reaches_every_waiting_caller():
+    flights = SingleFlight()
+    first, second, cancelled = RecordingReporter(), RecordingReporter(), RecordingReporter()
+    sent, joined = asyncio.Event(), asyncio.Event()
+
+    async def execution():
+        reporter = current_reporter(None)
+        await reporter("stdout", "before")
+        sent.set()
+        await joined.wait()
+        await reporter("stdout", "after")
+        await reporter.flush()
+        return "result"
+
+    async def scenario():
+        leader = asyncio.create_task(flights.run("key", execution, reporter=first))
+        await sent.wait()
+        quitter = asyncio.create_task(flights.run("key", execution, reporter=cancelled))
+        follower = asyncio.create_task(flights.run("key", execution, reporter=second))
+        await asyncio.sleep(0)
+        quitter.cancel()
+        await asyncio.gather(quitter, return_exceptions=True)
+        joined.set()
+        return await asyncio.gather(leader, follower)
+
+    results = asyncio.run(scenario())
+    assert results == [("result", None), ("result", 0)]
+    assert first.lines == ["before", "after"]
+    # Joined after the first line was sent, so it only sees what came later
+    assert second.lines == ["after"]
+    assert second.flushes == 1
+    # A caller that gave up hears nothing more, and the others still got their result
+    assert cancelled.lines == []
@@ -0,0 +1,102 @@
+"""ETags and 'since' deltas over added, removed and modified sections."""
+
+import asyncio
+import json
+import shutil
+
+import pytest
+from record_cli_fixtures import WORKSPACE
+
+from openspec_mcp import server
+from openspec_mcp.delta import split_sections, versioned_response
+
+BEFORE = """# Auth Specification
+
+## Requirements
+
+### Requirement: Password Login
+The system SHALL accept passwords.
+
+### Requirement: Session Expiry
+The system SHALL expire sessions after 30 minutes.
+
+### Requirement: Remember Me
+The system SHALL remember devices.
+"""
+
+AFTER = """# Auth Specification
+
+## Requirements
+
+### Requirement: Password Login
+The system SHALL accept passwords.
+
+### Requirement: Session Expiry
+The system SHALL expire sessions after 15 minutes.
+
+### Requirement: One-Time Codes
+The system SHALL ask for a code.
+"""
+
+
+def etag_of(response: str) -> str:
+    return response.rsplit("🔖 ETag: ", 1)[1]
+
+
+def test_sections_split_at_headings_outside_fences():
+    sections = split_sections("intro\n# Title\ntext\n```\n# not a heading\n```\n### Requirement: A\nbody\n### Requirement: A\nagain\n")
+    assert list(sections) == ["", "# Title", "### Requirement: A", "### Requirement: A (2)"]
+    assert "# not a heading" in sections["# Title"]
+
+
+def test_since_returns_added_removed_and_modified_sections():
+    tag = etag_of(versioned_response(BEFORE, None, None))
+    delta = versioned_response(AFTER, None, tag)
+    assert delta.startswith(f"🔄 Changed since ETag {tag}: 1 modified, 1 added, 1 removed of 5 sections")
+    assert "✏️  Modified:\n### Requirement: Session Expiry\nThe system SHALL expire sessions after 15 minutes." in delta
+    assert "➕ Added:\n### Requirement: One-Time Codes" in delta
+    assert "➖ Removed: ### Requirement: Remember Me" in delta
+    assert "Password Login" not in delta
+    # The delta carries the new version's ETag, which the next call can build on
+    assert versioned_response(AFTER, None, etag_of(delta)) == f"✅ Unchanged since ETag {etag_of(delta)}"
+
+
+def test_if_none_match_and_unknown_etags():
+    tag = etag_of(versioned_response(BEFORE, None, None))
+    assert versioned_response(BEFORE, tag, None) == f"✅ Unchanged since ETag {tag}"
+    # if_none_match sends the whole item once it changed
+    assert versioned_response(AFTER, tag, None).startswith(AFTER)
+    assert versioned_response(AFTER, None, "0123456789abcdef").startswith(
+        "⚠️  ETag 0123456789abcdef is unknown or expired, full content follows"
+    )
+
+
+def test_json_views_split_by_requirement_objects():
+    before = {"id": "auth", "requirements": [{"text": "Sign in"}, {"text": "Expire after 30 minutes"}]}
+    after = {"id": "auth", "requirements": [{"text": "Sign in"}, {"text": "Expire after 15 minutes"}]}
+    sections = split_sections("✅ Specification: auth\n\n" + json.dumps(before, indent=2))
+    assert list(sections) == ["", "id", "requirements: Sign in", "requirements: Expire after 30 minutes"]
+
+    tag = etag_of(versioned_response(json.dumps(before, indent=2), None, None))
+    delta = versioned_response(json.dumps(after, indent=2), None, tag)
+    assert delta.startswith(f"🔄 Changed since ETag {tag}: 0 modified, 1 added, 1 removed of 3 sections")
+    assert '"text": "Expire after 15 minutes"' in delta
+    assert "➖ Removed: requirements: Expire after 30 minutes" in delta
+    assert "Sign in" not in delta
+
+
+@pytest.mark.parametrize("format", ["markdown", "json"])
+def test_show_tool_since_after_an_edit(tmp_path, format):
+    shutil.copytree(WORKSPACE, tmp_path, dirs_exist_ok=True)
+    spec = tmp_path / "openspec/specs/auth/spec.md"
+    args = {"directory": str(tmp_path), "spec_id": "auth", "format": format}
+
+    async def scenario():
+        first = await server.handle_call_tool("openspec_spec_show", args)
+        spec.write_text(spec.read_text(encoding="utf-8").replace("30 minutes", "15 minutes"), encoding="utf-8")
+        second = await server.handle_call_tool("openspec_spec_show", {**args, "since": etag_of(first[0].text)})
+        return second[0].text
+
+    delta = asyncio.run(scenario())
+    assert "15 minutes" in delta
+    assert "authenticate users by email and password" not in delta
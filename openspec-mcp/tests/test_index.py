@@ -0,0 +1,108 @@
+"""Reads served from the workspace index must reflect the disk, not the watcher's last pass."""
+
+import asyncio
+import shutil
+
+import pytest
+from record_cli_fixtures import WORKSPACE
+
+from openspec_mcp import server
+from openspec_mcp.index import WorkspaceIndex, index_registry
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    shutil.copytree(WORKSPACE, tmp_path, dirs_exist_ok=True)
+    return tmp_path
+
+
+@pytest.fixture
+def index(workspace):
+    index = WorkspaceIndex(str(workspace))
+    index.refresh()
+    yield index
+    index.close()
+
+
+def append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_check_rereads_an_edited_spec(workspace, index):
+    generation = index.generation
+    append(workspace / "openspec/specs/auth/spec.md", "\n### Requirement: Lockout\nThe system SHALL lock accounts.\n")
+    assert index.check(specs=["auth"])
+    assert index.generation > generation
+    assert [r.name for r in index.read_spec("auth").requirements][-1] == "Lockout"
+    assert not index.check(specs=["auth"])
+
+
+def test_check_sees_added_and_removed_items(workspace, index):
+    change = workspace / "openspec/changes/add-sso"
+    change.mkdir()
+    (change / "proposal.md").write_text("# Change: Add SSO\n", encoding="utf-8")
+    shutil.rmtree(workspace / "openspec/specs/billing")
+
+    assert index.check(specs=True, changes=True)
+    assert index.read_change("add-sso").title == "Add SSO"
+    assert index.read_spec("billing") is None
+    assert index.spec_ids() == ["auth"]
+
+
+def test_check_of_one_item_leaves_others_alone(workspace, index):
+    append(workspace / "openspec/specs/billing/spec.md", "\nMore text.\n")
+    billing = index.read_spec("billing")
+    assert not index.check(specs=["auth"], changes=["add-two-factor"])
+    assert index.read_spec("billing") is billing
+
+
+def test_check_ignores_unsafe_names(index):
+    assert not index.check(specs=["..", "a/b"], changes=["archive"])
+
+
+def test_since_right_after_an_edit_returns_the_change(workspace):
+    async def scenario():
+        args = {"directory": str(workspace), "spec_id": "auth"}
+        first = await server.handle_call_tool("openspec_spec_show", args)
+        tag = first[0].text.rsplit("ETag: ", 1)[1]
+        append(workspace / "openspec/specs/auth/spec.md", "\n### Requirement: Lockout\nThe system SHALL lock accounts.\n")
+        second = await server.handle_call_tool("openspec_spec_show", {**args, "since": tag})
+        return second[0].text
+
+    text = asyncio.run(scenario())
+    assert text.startswith("🔄 Changed since ETag")
+    assert "Requirement: Lockout" in text
+
+
+def test_read_after_the_index_was_evicted_and_rebuilt(workspace):
+    async def scenario():
+        args = {"directory": str(workspace), "spec_id": "auth"}
+        await server.handle_call_tool("openspec_spec_show", args)
+        # Same path as LRU or idle eviction
+        index_registry.close()
+        append(workspace / "openspec/specs/auth/spec.md", "\n### Requirement: Lockout\nThe system SHALL lock accounts.\n")
+        result = await server.handle_call_tool("openspec_spec_show", args)
+        return result[0].text
+
+    assert "Requirement: Lockout" in asyncio.run(scenario())
+
+
+def test_full_check_is_reused_while_listings_are_unchanged(workspace, index):
+    append(workspace / "openspec/specs/auth/spec.md", "\nMore text.\n")
+    auth = index.read_spec("auth")
+    # refresh() just stat'ed every spec, so a listing read right after it trusts that pass
+    assert not index.check(specs=True)
+    assert index.read_spec("auth") is auth
+    # A read naming the item still sees the edit
+    assert index.check(specs=["auth"])
+
+
+def test_full_check_repeats_after_interval_or_notification(workspace, index, monkeypatch):
+    append(workspace / "openspec/specs/auth/spec.md", "\nMore text.\n")
+    index.notify_changed()
+    assert index.check(specs=True)
+
+    append(workspace / "openspec/specs/billing/spec.md", "\nMore text.\n")
+    monkeypatch.setattr("openspec_mcp.index.FULL_CHECK_INTERVAL", 0.0)
+    assert index.check(specs=True)
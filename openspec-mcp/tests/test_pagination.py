@@ -0,0 +1,128 @@
+"""Cursor pagination: pages cut at line boundaries, continued from the retained result, expiring."""
+
+import asyncio
+import re
+import shutil
+
+import pytest
+from record_cli_fixtures import WORKSPACE
+
+from openspec_mcp import pagination, server
+from openspec_mcp.pagination import (
+    MAX_RESPONSE_CHARS,
+    MIN_PAGE_SIZE,
+    CursorError,
+    ResultPages,
+    page_size_for,
+)
+
+TRAILER_RE = re.compile(
+    r"\n\n📄 Characters (\d+)–(\d+) of (\d+)"
+    r"(?:\. More available: call again with cursor=\"([^\"]+)\"| \(last page\))$"
+)
+
+
+def split_page(page: str) -> tuple[str, int, int, str]:
+    """(body, start offset, end offset, next cursor or "") of a rendered page."""
+    match = TRAILER_RE.search(page)
+    assert match is not None, page[-200:]
+    return page[: match.start()], int(match.group(1)), int(match.group(2)), match.group(4) or ""
+
+
+def without_etag(text: str) -> str:
+    return text.rsplit("🔖 ETag: ", 1)[0]
+
+
+def numbered_lines(count: int) -> str:
+    return "".join(f"line {i:05d} of the result\n" for i in range(count))
+
+
+def test_page_size_is_clamped():
+    assert page_size_for(None) == MAX_RESPONSE_CHARS
+    assert page_size_for(10) == MIN_PAGE_SIZE
+    assert page_size_for(MAX_RESPONSE_CHARS * 10) == MAX_RESPONSE_CHARS
+
+
+def test_small_results_are_not_paged():
+    pages = ResultPages()
+    assert pages.first_page("short", 1000) == "short"
+
+
+def test_cursors_continue_through_the_whole_result():
+    pages = ResultPages()
+    text = numbered_lines(500)
+    body, start, end, cursor = split_page(pages.first_page(text, 1000))
+    bodies = [body]
+    assert start == 0
+    while cursor:
+        body, start, end_next, cursor = split_page(pages.page(cursor, 1000))
+        # Each page starts where the last one ended, and pages break after a newline
+        assert start == end
+        assert bodies[-1].endswith("\n")
+        bodies.append(body)
+        end = end_next
+    assert "".join(bodies) == text
+    assert end == len(text)
+
+
+def test_unknown_malformed_and_past_the_end_cursors():
+    pages = ResultPages()
+    text = numbered_lines(200)
+    _, _, _, cursor = split_page(pages.first_page(text, 1000))
+    token = cursor.rpartition(":")[0]
+    with pytest.raises(CursorError, match="Unknown or expired"):
+        pages.page("nope:10", 1000)
+    with pytest.raises(CursorError, match="Unknown or expired"):
+        pages.page(f"{token}:ten", 1000)
+    with pytest.raises(CursorError, match="past the end"):
+        pages.page(f"{token}:{len(text)}", 1000)
+
+
+def test_cursors_expire(monkeypatch):
+    pages = ResultPages()
+    now = [1000.0]
+    monkeypatch.setattr(pagination.time, "monotonic", lambda: now[0])
+    _, _, _, cursor = split_page(pages.first_page(numbered_lines(200), 1000))
+    now[0] += pagination.RETAIN_SECONDS - 1
+    pages.page(cursor, 1000)
+    now[0] += pagination.RETAIN_SECONDS
+    with pytest.raises(CursorError, match="Unknown or expired"):
+        pages.page(cursor, 1000)
+
+
+def test_oldest_results_are_dropped_past_the_retention_limit(monkeypatch):
+    monkeypatch.setattr(pagination, "MAX_RETAINED", 2)
+    pages = ResultPages()
+    cursors = [split_page(pages.first_page(numbered_lines(100 + i), 1000))[3] for i in range(3)]
+    with pytest.raises(CursorError):
+        pages.page(cursors[0], 1000)
+    pages.page(cursors[1], 1000)
+    pages.page(cursors[2], 1000)
+
+
+def test_show_tool_pages_and_continues_with_a_cursor(tmp_path):
+    shutil.copytree(WORKSPACE, tmp_path, dirs_exist_ok=True)
+    spec = tmp_path / "openspec/specs/auth/spec.md"
+    with open(spec, "a", encoding="utf-8") as f:
+        for i in range(60):
+            f.write(f"\n### Requirement: Rule {i}\nThe system SHALL follow rule {i}.\n\n#### Scenario: Rule {i}\n- **WHEN** it applies\n- **THEN** it holds\n")
+    args = {"directory": str(tmp_path), "spec_id": "auth", "page_size": 1000}
+
+    async def scenario():
+        full = await server.handle_call_tool("openspec_spec_show", {"directory": str(tmp_path), "spec_id": "auth"})
+        first = await server.handle_call_tool("openspec_spec_show", args)
+        pages = [first[0].text]
+        cursor = split_page(without_etag(pages[0]).rstrip("\n"))[3]
+        while cursor:
+            page = await server.handle_call_tool("openspec_spec_show", {**args, "cursor": cursor})
+            pages.append(page[0].text)
+            cursor = split_page(pages[-1])[3]
+        return full[0].text, pages
+
+    full, pages = asyncio.run(scenario())
+    assert len(pages) > 3
+    # The first page carries the ETag of the whole result; later pages come from the retained text
+    first_body = split_page(without_etag(pages[0]).rstrip("\n"))[0]
+    rest = "".join(split_page(page)[0] for page in pages[1:])
+    # with_etag puts a blank line between the result and its ETag
+    assert first_body + rest + "\n" == without_etag(full)
@@ -0,0 +1,46 @@
+"""Streamed output honours the log level of the session that asked for it."""
+
+import asyncio
+from types import SimpleNamespace
+
+from openspec_mcp.progress import ProgressReporter, client_log_level, set_client_log_level
+
+
+class FakeSession:
+    def __init__(self):
+        self.logged = []
+
+    async def send_log_message(self, level, data, logger, related_request_id):
+        self.logged.append((level, data))
+
+
+def reporter(session):
+    return ProgressReporter(SimpleNamespace(session=session, request_id=1, meta=None), interval=60)
+
+
+def stream(session):
+    async def run():
+        progress = reporter(session)
+        await progress("stdout", "building")
+        await progress("stderr", "careful")
+        await progress.flush()
+
+    asyncio.run(run())
+    return session.logged
+
+
+def test_level_defaults_to_info():
+    session = FakeSession()
+    assert client_log_level(session) == "info"
+    assert stream(session) == [("info", "building"), ("warning", "careful")]
+
+
+def test_level_is_kept_per_session():
+    quiet, chatty = FakeSession(), FakeSession()
+    set_client_log_level(quiet, "error")
+    assert stream(quiet) == []
+    assert stream(chatty) == [("info", "building"), ("warning", "careful")]
+    set_client_log_level(chatty, "warning")
+    chatty.logged.clear()
+    assert stream(chatty) == [("warning", "careful")]
+    assert client_log_level(quiet) == "error"
@@ -0,0 +1,78 @@
+"""The native reader must print what the OpenSpec CLI prints (see record_cli_fixtures.py)."""
+
+import json
+import os
+
+import pytest
+from record_cli_fixtures import RECORDED, RECORDINGS, WORKSPACE
+
+from openspec_mcp.index import WorkspaceIndex
+from openspec_mcp.reader import OpenSpecReader, change_object, item_object, spec_object
+from openspec_mcp.server import registry
+
+
+def recorded(filename: str) -> str:
+    with open(os.path.join(RECORDED, filename), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(params=["reader", "index"])
+def source(request):
+    if request.param == "reader":
+        yield OpenSpecReader(WORKSPACE)
+        return
+    index = WorkspaceIndex(WORKSPACE)
+    index.refresh()
+    yield index
+    index.close()
+
+
+@pytest.mark.parametrize("filename, tool, arguments", RECORDINGS, ids=[r[0] for r in RECORDINGS])
+def test_native_view_matches_cli(source, filename, tool, arguments):
+    spec = registry.specs[tool]
+    native = spec.native(source, spec.values(arguments, directory=WORKSPACE))
+    expected = recorded(filename)
+    if filename.endswith(".json"):
+        assert json.loads(native) == json.loads(expected)
+    else:
+        assert native == expected
+
+
+@pytest.mark.parametrize(
+    "filename, view",
+    [
+        ("spec-show-auth.json", lambda source: spec_object(source, "auth")),
+        ("spec-show-billing.json", lambda source: spec_object(source, "billing")),
+        ("change-show-add-two-factor.json", lambda source: change_object(source, "add-two-factor")),
+        ("change-show-rename-invoices.json", lambda source: change_object(source, "rename-invoices")),
+        ("show-billing.json", lambda source: item_object(source, "billing")),
+    ],
+)
+def test_structured_view_matches_cli(source, filename, view):
+    assert view(source) == json.loads(recorded(filename))
+
+
+def test_delta_headers_are_read_in_file_order(source):
+    change = source.read_change("add-two-factor")
+    assert [(d.spec, d.operation) for d in change.deltas] == [
+        ("auth", "ADDED"),
+        ("auth", "MODIFIED"),
+        ("auth", "RENAMED"),
+        ("billing", "REMOVED"),
+        ("billing", "ADDED"),
+    ]
+
+
+def test_renamed_section_with_several_pairs(source):
+    change = source.read_change("rename-invoices")
+    renames = [d.rename for d in change.deltas if d.operation == "RENAMED"]
+    assert renames == [
+        {"from": "Monthly Invoices", "to": "Monthly Bills"},
+        {"from": "Currency", "to": "Billing Currency"},
+    ]
+
+
+def test_unknown_and_archived_items_fall_back_to_the_cli(source):
+    assert spec_object(source, "missing") is None
+    assert change_object(source, "2025-01-15-initial-auth") is None
+    assert change_object(source, "../specs") is None
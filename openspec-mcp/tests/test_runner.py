@@ -0,0 +1,53 @@
+"""Output capture: spooling past SPOOL_BYTES and streaming lines to on_output."""
+
+import asyncio
+import sys
+
+from openspec_mcp import runner
+from openspec_mcp.runner import LINE_BYTES, SPOOL_BYTES, run_command
+
+
+def python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def test_output_past_the_spool_limit_is_spooled_and_decoded(monkeypatch):
+    spooled = []
+    temporary_file = runner.tempfile.TemporaryFile
+
+    def tracked_temporary_file(*args, **kwargs):
+        spooled.append(True)
+        return temporary_file(*args, **kwargs)
+
+    monkeypatch.setattr(runner.tempfile, "TemporaryFile", tracked_temporary_file)
+    # Multi-byte characters, so chunk and spool boundaries fall inside them
+    line = "é€😀 spooled output\n"
+    count = SPOOL_BYTES // len(line.encode()) * 3
+    code = f"import sys; sys.stdout.buffer.write({line!r}.encode() * {count}); sys.stderr.write('done')"
+
+    ok, stdout, stderr = asyncio.run(run_command(python(code)))
+    assert ok
+    assert spooled == [True]
+    assert stdout == line * count
+    assert stderr == "done"
+
+
+def test_streamed_lines_are_split_and_long_lines_cut():
+    received = []
+
+    async def on_output(stream, line):
+        received.append((stream, line))
+
+    code = (
+        "import sys; sys.stdout.write('first\\r\\nsecond\\n'); sys.stdout.flush(); "
+        f"sys.stdout.write('x' * {LINE_BYTES * 2 + 10}); sys.stdout.flush(); "
+        "sys.stderr.write('warned\\n')"
+    )
+    ok, stdout, _ = asyncio.run(run_command(python(code), on_output=on_output))
+    assert ok
+    lines = [line for stream, line in received if stream == "stdout"]
+    assert lines[:2] == ["first", "second"]
+    # A line without a newline is handed over in LINE_BYTES pieces, nothing lost
+    assert [len(line) for line in lines[2:]] == [LINE_BYTES, LINE_BYTES, 10]
+    assert ("stderr", "warned") in received
+    assert stdout.endswith("x" * (LINE_BYTES * 2 + 10))
@@ -0,0 +1,126 @@
+"""Per-workspace read/write scheduling and the queue-wait statistics it reports."""
+
+import asyncio
+
+from record_cli_fixtures import WORKSPACE
+
+from openspec_mcp.index import IndexRegistry
+from openspec_mcp.metrics import metrics
+from openspec_mcp.scheduler import WorkspaceScheduler, scheduler
+
+
+class Timeline:
+    """Runs holders of a workspace lock and records the order they hold it in."""
+
+    def __init__(self, scheduler: WorkspaceScheduler):
+        self.scheduler = scheduler
+        self.events = []
+        self.holding = set()
+        self.overlaps = []
+
+    async def hold(self, label: str, write: bool, release: asyncio.Event) -> None:
+        access = self.scheduler.writing if write else self.scheduler.reading
+        async with access("/tmp/workspace"):
+            self.overlaps.append((label, set(self.holding)))
+            self.holding.add(label)
+            self.events.append(("start", label))
+            await release.wait()
+            self.holding.discard(label)
+            self.events.append(("end", label))
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_readers_run_in_parallel():
+    async def scenario():
+        timeline = Timeline(WorkspaceScheduler())
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(timeline.hold(f"read-{i}", False, release)) for i in range(3)]
+        await settle()
+        holding = set(timeline.holding)
+        release.set()
+        await asyncio.gather(*tasks)
+        return holding
+
+    assert asyncio.run(scenario()) == {"read-0", "read-1", "read-2"}
+
+
+def test_writers_run_alone():
+    async def scenario():
+        timeline = Timeline(WorkspaceScheduler())
+        release = asyncio.Event()
+        tasks = [
+            asyncio.create_task(timeline.hold("write-1", True, release)),
+            asyncio.create_task(timeline.hold("read", False, release)),
+            asyncio.create_task(timeline.hold("write-2", True, release)),
+        ]
+        await settle()
+        holding = set(timeline.holding)
+        release.set()
+        await asyncio.gather(*tasks)
+        return holding, timeline.overlaps
+
+    holding, overlaps = asyncio.run(scenario())
+    assert holding == {"write-1"}
+    assert all(not others for _, others in overlaps)
+
+
+def test_waiting_writer_blocks_new_readers():
+    async def scenario():
+        timeline = Timeline(WorkspaceScheduler())
+        first, write, late = asyncio.Event(), asyncio.Event(), asyncio.Event()
+        reader = asyncio.create_task(timeline.hold("first-read", False, first))
+        await settle()
+        writer = asyncio.create_task(timeline.hold("write", True, write))
+        await settle()
+        late_reader = asyncio.create_task(timeline.hold("late-read", False, late))
+        await settle()
+        # The late reader queues behind the waiting writer instead of joining the first reader
+        holding = set(timeline.holding)
+        first.set()
+        await settle()
+        write.set()
+        late.set()
+        await asyncio.gather(reader, writer, late_reader)
+        return holding, timeline.events
+
+    holding, events = asyncio.run(scenario())
+    assert holding == {"first-read"}
+    assert events.index(("end", "write")) < events.index(("start", "late-read"))
+
+
+def test_wait_statistics_are_reported_and_forgotten_with_the_index():
+    async def scenario():
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold_write(release))
+        await settle()
+        waiter = asyncio.create_task(hold_write(asyncio.Event(), released=True))
+        await asyncio.sleep(0.02)
+        release.set()
+        await asyncio.gather(holder, waiter)
+
+    async def hold_write(release, released=False):
+        async with scheduler.writing(WORKSPACE):
+            if not released:
+                await release.wait()
+
+    scheduler.reset_stats()
+    asyncio.run(scenario())
+
+    stats = metrics.snapshot()["workspaces"][WORKSPACE]
+    assert stats["acquisitions"] == 2
+    assert stats["contended"] == 1
+    assert stats["max_wait_ms"] >= 15
+    assert stats["total_wait_ms"] >= stats["max_wait_ms"]
+    text = metrics.prometheus()
+    assert f'openspec_mcp_workspace_lock_acquisitions_total{{workspace="{WORKSPACE}"}} 2' in text
+    assert f'openspec_mcp_workspace_lock_contended_total{{workspace="{WORKSPACE}"}} 1' in text
+    assert "openspec_mcp_workspace_lock_wait_seconds_max" in text
+
+    registry = IndexRegistry(max_workspaces=1)
+    asyncio.run(registry.get(WORKSPACE))
+    registry.close()
+    assert WORKSPACE not in metrics.snapshot()["workspaces"]
@@ -0,0 +1,69 @@
+"""Structured results: field projection, parsing CLI JSON, and the show tools in structured mode."""
+
+import asyncio
+import json
+
+import pytest
+from record_cli_fixtures import WORKSPACE
+
+from openspec_mcp import server
+from openspec_mcp.structured import field_tree, parse_cli_json, project, structured_result
+
+SPEC = {
+    "id": "auth",
+    "title": "Authentication",
+    "requirements": [
+        {"text": "Sign in", "scenarios": [{"rawText": "a"}, {"rawText": "b"}]},
+        {"text": "Expire sessions", "scenarios": [{"rawText": "c"}]},
+    ],
+}
+
+
+def test_field_tree_merges_paths_and_keeps_whole_subtrees():
+    assert field_tree(["id", "requirements.text"]) == {"id": None, "requirements": {"text": None}}
+    # A shorter path keeps the subtree whole, in either order
+    assert field_tree(["requirements", "requirements.text"]) == {"requirements": None}
+    assert field_tree(["requirements.text", "requirements"]) == {"requirements": None}
+    assert field_tree(["", "a..b"]) == {"a": {"b": None}}
+
+
+def test_projection_walks_through_lists():
+    tree = field_tree(["id", "requirements.text", "requirements.scenarios.rawText"])
+    assert project(SPEC, tree) == {
+        "id": "auth",
+        "requirements": [
+            {"text": "Sign in", "scenarios": [{"rawText": "a"}, {"rawText": "b"}]},
+            {"text": "Expire sessions", "scenarios": [{"rawText": "c"}]},
+        ],
+    }
+    assert project(SPEC, field_tree(["requirements.text"])) == {
+        "requirements": [{"text": "Sign in"}, {"text": "Expire sessions"}]
+    }
+    # Unknown fields are left out rather than failing
+    assert project(SPEC, field_tree(["missing", "requirements.missing"])) == {"requirements": [{}, {}]}
+
+
+def test_structured_result_is_always_an_object():
+    assert structured_result(SPEC, None) is SPEC
+    assert structured_result([1, 2], None) == {"items": [1, 2]}
+    assert structured_result(SPEC["requirements"], ["text"]) == {"items": [{"text": "Sign in"}, {"text": "Expire sessions"}]}
+
+
+def test_parse_cli_json_skips_banners_and_rejects_trailing_text():
+    assert parse_cli_json('Loading OpenSpec...\n{"id": "auth"}\n') == {"id": "auth"}
+    assert parse_cli_json("[1, 2]") == [1, 2]
+    with pytest.raises(ValueError):
+        parse_cli_json("no json here")
+    with pytest.raises(ValueError):
+        parse_cli_json('{"id": "auth"}\nDone.')
+
+
+def test_show_tool_returns_projected_structured_content():
+    args = {"directory": WORKSPACE, "spec_id": "auth", "fields": ["id", "requirements.text"]}
+    contents, structured = asyncio.run(server.handle_call_tool("openspec_spec_show", args))
+    assert structured["id"] == "auth"
+    assert [set(r) for r in structured["requirements"]] == [{"text"}, {"text"}]
+    assert json.loads(contents[0].text) == structured
+
+    whole = asyncio.run(server.handle_call_tool("openspec_spec_show", {"directory": WORKSPACE, "spec_id": "auth", "structured": True}))[1]
+    assert project(whole, field_tree(["id", "requirements.text"])) == structured
@@ -0,0 +1,85 @@
+"""Validation results are reused for unchanged items and invalidated by edits they depend on."""
+
+import asyncio
+import os
+import shutil
+
+import pytest
+import stub_openspec
+from record_cli_fixtures import WORKSPACE
+
+from openspec_mcp import server
+from openspec_mcp.detection import detection_cache
+from openspec_mcp.index import WorkspaceIndex
+from openspec_mcp.validation import item_hash, validation_cache
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    workspace = tmp_path / "workspace"
+    shutil.copytree(WORKSPACE, workspace)
+    stub_openspec.install(tmp_path / "bin")
+    monkeypatch.setenv("PATH", f"{tmp_path / 'bin'}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setenv("STUB_OPENSPEC_LOG", str(tmp_path / "calls.jsonl"))
+    monkeypatch.setattr(validation_cache, "path", str(tmp_path / "validation-cache.json"))
+    monkeypatch.setattr(validation_cache, "_entries", None)
+    detection_cache.invalidate()
+    yield workspace
+    detection_cache.invalidate()
+
+
+def validations(workspace) -> int:
+    return sum(1 for argv in stub_openspec.calls(workspace.parent / "calls.jsonl") if "validate" in argv[:2])
+
+
+def validate_change(workspace, name: str) -> str:
+    args = {"directory": str(workspace), "change_name": name}
+    result = asyncio.run(server.handle_call_tool("openspec_change_validate", args))
+    return result[0].text
+
+
+def append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def change_hash(workspace, name: str) -> str:
+    index = WorkspaceIndex(str(workspace))
+    index.refresh()
+    return item_hash(index, "change", name, "1.0.0")
+
+
+def test_unchanged_change_reuses_its_result(workspace):
+    validate_change(workspace, "add-two-factor")
+    validate_change(workspace, "add-two-factor")
+    assert validations(workspace) == 1
+
+
+def test_editing_the_change_invalidates_its_result(workspace):
+    validate_change(workspace, "add-two-factor")
+    append(workspace / "openspec/changes/add-two-factor/proposal.md", "\nOne more reason.\n")
+    validate_change(workspace, "add-two-factor")
+    assert validations(workspace) == 2
+
+
+def test_editing_a_target_spec_invalidates_the_change(workspace):
+    validate_change(workspace, "add-two-factor")
+    # add-two-factor modifies "Session Expiry" in auth; dropping it there can break the change
+    spec = workspace / "openspec/specs/auth/spec.md"
+    spec.write_text(spec.read_text(encoding="utf-8").replace("Session Expiry", "Session Timeout"), encoding="utf-8")
+    validate_change(workspace, "add-two-factor")
+    assert validations(workspace) == 2
+    # rename-invoices only touches billing, so its result stays valid
+    validate_change(workspace, "rename-invoices")
+    append(spec, "\nMore text.\n")
+    validate_change(workspace, "rename-invoices")
+    assert validations(workspace) == 3
+
+
+def test_hash_covers_target_specs_and_their_absence(workspace):
+    before = change_hash(workspace, "rename-invoices")
+    append(workspace / "openspec/specs/auth/spec.md", "\nMore text.\n")
+    assert change_hash(workspace, "rename-invoices") == before
+    shutil.rmtree(workspace / "openspec/specs/billing")
+    removed = change_hash(workspace, "rename-invoices")
+    assert removed is not None and removed != before
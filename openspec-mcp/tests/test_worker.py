@@ -0,0 +1,141 @@
+"""Worker pool behaviour against a stand-in worker (see stub_worker.py)."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+from openspec_mcp import worker
+from openspec_mcp.worker import MAX_FAILURES, WorkerPool, default_worker_command
+
+STUB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub_worker.py")
+
+
+@pytest.fixture(autouse=True)
+def stub_worker(monkeypatch):
+    monkeypatch.setenv("OPENSPEC_MCP_WORKER_CMD", f'"{sys.executable}" "{STUB}"')
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def with_pool(scenario, **options):
+    pool = WorkerPool(default_worker_command(), size=1, **options)
+    try:
+        return await scenario(pool)
+    finally:
+        await pool.close()
+
+
+def alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def test_worker_command_override():
+    assert default_worker_command() == [sys.executable, STUB]
+
+
+def test_ready_handshake_and_run():
+    async def scenario(pool):
+        return await pool.run(["echo", "hello", "world"], None, 5), await pool.run(["fail"], None, 5), pool
+
+    ok, failed, pool = run(with_pool(scenario))
+    assert ok == (True, "hello world", "")
+    assert failed == (False, "", "failed\n")
+    assert (pool.requests, pool.restarts, pool.fallbacks) == (2, 1, 0)
+
+
+def test_crash_falls_back_then_restarts():
+    async def scenario(pool):
+        first_pid = (await pool.run(["pid"], None, 5))[1]
+        crashed = await pool.run(["crash"], None, 5)
+        second_pid = (await pool.run(["pid"], None, 5))[1]
+        return first_pid, crashed, second_pid, pool
+
+    first_pid, crashed, second_pid, pool = run(with_pool(scenario))
+    assert crashed is None
+    assert first_pid != second_pid
+    assert pool.restarts == 2 and pool.fallbacks == 1
+
+
+def test_timeout_replaces_the_worker():
+    async def scenario(pool):
+        pid = int((await pool.run(["pid"], None, 5))[1])
+        timed_out = await pool.run(["hang"], None, 0.5)
+        return pid, timed_out, await pool.run(["echo", "again"], None, 5)
+
+    pid, timed_out, after = run(with_pool(scenario))
+    assert timed_out[0] is False and "timed out" in timed_out[2]
+    assert not alive(pid)
+    assert after == (True, "again", "")
+
+
+def test_repeated_failures_disable_the_pool(monkeypatch):
+    monkeypatch.setenv("STUB_WORKER_BROKEN", "1")
+
+    async def scenario(pool):
+        results = [await pool.run(["echo"], None, 5) for _ in range(MAX_FAILURES)]
+        starts = pool.restarts
+        disabled = (pool.available, await pool.run(["echo"], None, 5))
+        return results, starts, disabled, pool
+
+    results, starts, disabled, pool = run(with_pool(scenario))
+    assert results == [None] * MAX_FAILURES
+    assert disabled == (False, None)
+    assert pool.fallbacks == MAX_FAILURES + 1
+    assert starts == 0
+
+
+def test_close_stops_every_worker():
+    async def scenario():
+        pool = WorkerPool(default_worker_command(), size=2)
+        pids = await asyncio.gather(*(pool.run(["pid"], None, 5) for _ in range(2)))
+        await pool.close()
+        return [int(p[1]) for p in pids]
+
+    pids = run(scenario())
+    assert len(set(pids)) == 2
+    assert not any(alive(pid) for pid in pids)
+
+
+def test_worker_is_retired_after_max_requests():
+    async def scenario(pool):
+        return [(await pool.run(["pid"], None, 5))[1] for _ in range(5)], pool
+
+    pids, pool = run(with_pool(scenario, max_requests=2))
+    assert pids[0] == pids[1] != pids[2] == pids[3] != pids[4]
+    assert pool.retired == 2
+
+
+def test_worker_is_retired_above_the_memory_limit(monkeypatch):
+    monkeypatch.setenv("STUB_WORKER_RSS", str(600 * 1024 * 1024))
+
+    async def scenario(pool):
+        return [(await pool.run(["pid"], None, 5))[1] for _ in range(2)], pool
+
+    pids, pool = run(with_pool(scenario, max_rss=512 * 1024 * 1024))
+    assert pids[0] != pids[1]
+    assert pool.retired == 2
+
+
+def test_health_check_retires_a_bloated_idle_worker():
+    async def scenario(pool):
+        pid = int((await pool.run(["pid"], None, 5))[1])
+        pool.max_rss = 1
+        await pool.check_health()
+        return pid, pool
+
+    pid, pool = run(with_pool(scenario))
+    assert not alive(pid)
+    assert pool.retired == 1
+
+
+def test_pool_is_only_built_in_worker_mode(monkeypatch):
+    monkeypatch.setattr(worker, "WORKER_ENABLED", False)
+    assert worker.get_worker_pool() is None